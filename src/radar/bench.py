@@ -0,0 +1,179 @@
+import tempfile
+import time
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def _synthetic_vectors(n: int, dim: int, clusters: int = 64, seed: int = 0) -> np.ndarray:
+    """Clustered unit vectors, a rough stand-in for topic-heavy signal embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n)
+    x = centers[labels] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def bench_ann(
+    n: int = 100_000,
+    dim: int = 384,
+    queries: int = 200,
+    k: int = 10,
+    nprobes: Sequence[int] = (1, 2, 4, 8, 16, 32),
+    root: Optional[str] = None,
+) -> List[dict]:
+    """Recall@k and per-query latency of the IVF index against exact search.
+
+    Uses the vector store under `root` when given, otherwise a synthetic store
+    of `n` x `dim` vectors in a temp directory.
+    """
+    from radar.core.ann import IVFIndex
+    from radar.core.vector_store import VectorStore
+
+    tmp = None
+    if root is None:
+        tmp = tempfile.TemporaryDirectory()
+        root = tmp.name
+        store = VectorStore(root)
+        x = _synthetic_vectors(n, dim)
+        for start in range(0, n, 10_000):
+            store.append(
+                [f"v{i}" for i in range(start, min(n, start + 10_000))],
+                x[start : start + 10_000],
+            )
+    else:
+        store = VectorStore(root)
+
+    try:
+        matrix, _, _ = store.snapshot()
+        if matrix is None:
+            return []
+        rng = np.random.default_rng(1)
+        sample = rng.choice(matrix.shape[0], size=min(queries, matrix.shape[0]), replace=False)
+        qs = np.asarray(matrix[sample]) + 0.05 * rng.normal(size=(len(sample), matrix.shape[1]))
+
+        index = IVFIndex(root, store=store)
+        t0 = time.perf_counter()
+        nlist = index.train()
+        train_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        truth = [{sid for sid, _ in store.search(q, k)} for q in qs]
+        exact_ms = (time.perf_counter() - t0) * 1000 / len(qs)
+
+        rows = [
+            {"nprobe": "exact", "recall": 1.0, "ms_per_query": exact_ms, "nlist": nlist}
+        ]
+        for nprobe in nprobes:
+            if nprobe > nlist:
+                break
+            t0 = time.perf_counter()
+            found = [{sid for sid, _ in index.search(q, k, nprobe=nprobe)} for q in qs]
+            ms = (time.perf_counter() - t0) * 1000 / len(qs)
+            recall = float(np.mean([len(f & t) / len(t) for f, t in zip(found, truth)]))
+            rows.append(
+                {"nprobe": nprobe, "recall": recall, "ms_per_query": ms, "nlist": nlist}
+            )
+        rows[0]["train_s"] = train_s
+        return rows
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+
+_FILLER = (
+    "the regional command reported that forces moved along the northern corridor "
+    "while officials said supply lines held and observers noted"
+).split()
+_UNITS = ["troops", "killed", "drones", "cameras", "arrests", "acres", "gallons", "beds",
+          "%", "km radius", "MHz bandwidth"]
+
+
+def synthetic_report(chars: int = 1_000_000, seed: int = 0) -> str:
+    """Prose with a realistic sprinkling of counts, prices, percentages and years."""
+    rng = np.random.default_rng(seed)
+    parts: List[str] = []
+    size = 0
+    while size < chars:
+        words = rng.choice(_FILLER, size=int(rng.integers(6, 21)))
+        sentence = " ".join(words.tolist())
+        r = rng.random()
+        if r < 0.3:
+            sentence += f" {int(rng.integers(1, 5000)):,} {rng.choice(_UNITS)}"
+        elif r < 0.45:
+            sentence += f" ${int(rng.integers(1, 1000))}.{int(rng.integers(0, 100)):02d}"
+        elif r < 0.5:
+            sentence += f" ${int(rng.integers(1, 1000))}M"
+        elif r < 0.6:
+            sentence += f" in {int(rng.integers(1990, 2026))}"
+        parts.append(sentence + ". ")
+        size += len(parts[-1])
+    return "".join(parts)
+
+
+def bench_extract(chars: int = 1_000_000, docs: int = 3) -> List[dict]:
+    """Throughput of `extract_stats` on synthetic reports of `chars` characters."""
+    from radar.core.extract import extract_stats
+
+    rows = []
+    for seed in range(docs):
+        text = synthetic_report(chars, seed=seed)
+        t0 = time.perf_counter()
+        stats = extract_stats(text)
+        seconds = time.perf_counter() - t0
+        rows.append(
+            {
+                "doc": seed,
+                "chars": len(text),
+                "stats": len(stats),
+                "seconds": seconds,
+                "mb_per_s": len(text) / 1e6 / seconds,
+            }
+        )
+    return rows
+
+
+def bench_ingest(
+    n: int = 500, chars: int = 20_000, batch_sizes: Sequence[int] = (1, 16, 64)
+) -> List[dict]:
+    """Signals/sec through `persist.save_signals` into a fresh temp database,
+    one run per batch size (1 = the per-signal path)."""
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlmodel import SQLModel
+
+    from radar.db import persist
+    from radar.db.models import Signal
+
+    async def run(batch: int, path: str) -> dict:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        # Distinct seeds keep near-duplicate detection from collapsing the corpus.
+        signals = [
+            Signal(title=f"Bench report {i}", content=synthetic_report(chars, seed=i), source="bench")
+            for i in range(n)
+        ]
+        stats = 0
+        t0 = time.perf_counter()
+        for start in range(0, n, batch):
+            async with sessions() as session:
+                result = await persist.save_signals(session, signals[start : start + batch])
+            stats += result.stats
+        seconds = time.perf_counter() - t0
+        await engine.dispose()
+        return {
+            "batch": batch,
+            "signals": n,
+            "stats": stats,
+            "seconds": seconds,
+            "signals_per_s": n / seconds,
+        }
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for batch in batch_sizes:
+            rows.append(asyncio.run(run(batch, f"{tmp}/bench-{batch}.db")))
+    return rows
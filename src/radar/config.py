@@ -11,17 +11,100 @@ class Settings(BaseSettings):
     VOICE_SCRIPT: str = "/home/chuck/Scripts/generate_voice.py"
 
     # Internal tool paths
-    TOOL_EMBED: str = "src/radar/tools/radar_embed"
     TOOL_EXTRACT: str = "src/radar/tools/radar_extract"
     TOOL_SUMMARIZE: str = "src/radar/tools/radar_summarize"
-    TOOL_FETCH: str = "src/radar/tools/radar_fetch"
 
     # Tactical settings
     HOME_COORDS: tuple[float, float] = (41.9168, -77.1042)
     SECTOR_RADIUS_MILES: int = 150
 
+    # Local search indexes (BM25 segments, vectors, caches)
+    INDEX_DIR: str = ".radar_index"
+    BM25_COMPACT_THRESHOLD: int = 500
+    ANN_NLIST: int = 0  # 0 = sqrt(number of vectors)
+    ANN_NPROBE: int = 8
+    ANN_MIN_TRAIN: int = 2048
+    HYBRID_DEPTH: int = 50  # candidates taken from each ranker before fusion
+    RRF_K: int = 60
+    PASSAGE_CHARS: int = 800
+    ASK_PASSAGES: int = 8  # passages sent to the summarizer per question
+
+    # radar ask answer cache (invalidated whenever new signals are ingested)
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_TTL: int = 86400  # seconds
+    ANSWER_CACHE_MAX: int = 500  # entries kept, least recently used evicted first
+
+    # Near-duplicate detection at ingest (MinHash/LSH)
+    DEDUP_THRESHOLD: float = 0.9  # estimated Jaccard similarity of word 3-grams
+    DEDUP_ACTION: str = "link"  # skip | link | merge | off
+
+    # Content-addressed chunk store for Signal.content
+    CHUNK_STORE_ENABLED: bool = True
+    CHUNK_MIN_CHARS: int = 2048  # shorter bodies stay inline in the signal row
+    CHUNK_CACHE_SIZE: int = 4096  # decoded chunks kept in memory
+    CONTENT_COMPRESSION: str = "zlib"  # zlib | zstd (needs `zstandard`) | none
+    CONTENT_COMPRESSION_LEVEL: int = 6
+
+    # radar reprocess (re-extract Statistic rows from stored signals)
+    REPROCESS_WORKERS: int = 0  # 0 = one process per core
+    REPROCESS_BATCH: int = 512  # signals per transaction
+
+    # radar ingest --batch pipeline
+    INGEST_BATCH: int = 64  # signals per commit
+    INGEST_WORKERS: int = 0  # extraction processes, 0 = one per core
+    INGEST_QUEUE: int = 256  # parsed signals buffered ahead of extraction
+
+    # Shared headless Chromium (DeepResearchAgent, BrowserIngestAgent)
+    BROWSER_MAX_CONTEXTS: int = 5  # concurrent isolated contexts
+    BROWSER_PAGES_PER_CONTEXT: int = 20  # pages before a context is recycled
+    RESEARCH_CONCURRENCY: int = 5  # result pages loading at once per topic
+    RESEARCH_DEADLINE: float = 45.0  # seconds per topic; unfinished sources are dropped
+
+    # Adaptive daily sweep scheduling (per-topic revisit intervals)
+    SWEEP_PRIORITIES: str = "interests_and_sigint_topics.csv"  # Topic,Frequency columns
+    SWEEP_TIME_BUDGET: float = 0  # wall-clock seconds per sweep, 0 = unlimited
+    SWEEP_MIN_INTERVAL_HOURS: float = 11.0
+    SWEEP_MAX_INTERVAL_HOURS: float = 720.0
+
+    # Durable sweep job queue (radar sync --resume)
+    SWEEP_LEASE_SECONDS: int = 900  # a leased task is reclaimable after this long
+    SWEEP_MAX_ATTEMPTS: int = 3
+    SWEEP_RETRY_BACKOFF: float = 30.0  # seconds before the first retry, doubled per attempt
+    SWEEP_RETRY_WAIT: float = 300.0  # longest a run waits on a backoff before leaving it to --resume
+
+    # Daily sweep URL frontier (shared fetches, search cache, seen sources)
+    SEARCH_CACHE_TTL: int = 86400  # seconds a topic's search results are reused
+    SEEN_URL_DAYS: float = 7.0  # unchanged sources ingested this recently are skipped
+    SEEN_URL_CAPACITY: int = 20000  # sources per Bloom filter generation (1% false positives)
+
+    # Page fetching: plain HTTP first, browser only for JS-rendered pages
+    FETCH_HTTP_FIRST: bool = True
+    FETCH_MIN_QUALITY: float = 0.3  # extraction score below which the browser is tried
+    FETCH_TIMEOUT: float = 15.0
+    FETCH_MAX_BYTES: int = 50 * 1024 * 1024  # larger downloads are abandoned
+
+    # PDF-to-text (pdftotext) for fetched documents
+    PDF_WORKERS: int = 0  # concurrent conversions, 0 = one per core
+    PDF_MAX_PAGES: int = 500
+    PDF_MAX_BYTES: int = 100 * 1024 * 1024
+    PDF_TIMEOUT: float = 120.0  # seconds per conversion
+
+    # HTML-to-text extraction (trafilatura) on a worker process pool
+    HTML_WORKERS: int = 0  # 0 = one process per core
+    HTML_FAST_MIN_QUALITY: float = 0.5  # fast-mode score below which the full extractor runs
+    HTML_CACHE_SIZE: int = 1024  # extracted pages memoized by HTML hash
+
+    # On-disk HTTP cache (ETag / Last-Modified revalidation) for every fetch path
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # least recently used evicted first
+
     # Model settings
     EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND: str = "sentence-transformers"  # or "hashing"
+    HASHING_DIM: int = 3072
+    HASHING_MODE: str = "signed"  # or "radar_embed" for the C tool's vectors
+    EMBEDDINGS_ENABLED: bool = True
+    EMBED_BATCH_SIZE: int = 64
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -0,0 +1,228 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from radar.config import settings
+from radar.core.vector_store import (
+    VectorStore,
+    get_vector_store,
+    normalize_rows,
+    top_k_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def spherical_kmeans(
+    x: np.ndarray, k: int, iters: int = 12, seed: int = 0, chunk: int = 16384
+) -> np.ndarray:
+    """Cosine k-means over L2-normalized rows; returns normalized (k, dim) centroids."""
+    rng = np.random.default_rng(seed)
+    n = x.shape[0]
+    centroids = np.array(x[rng.choice(n, size=k, replace=False)], dtype=np.float32)
+    for _ in range(iters):
+        sums = np.zeros_like(centroids)
+        counts = np.zeros(k, dtype=np.int64)
+        for start in range(0, n, chunk):
+            block = np.asarray(x[start : start + chunk])
+            labels = np.argmax(block @ centroids.T, axis=1)
+            np.add.at(sums, labels, block)
+            counts += np.bincount(labels, minlength=k)
+        empty = counts == 0
+        if empty.any():  # re-seed dead clusters from random points
+            sums[empty] = x[rng.choice(n, size=int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+def assign_rows(x: np.ndarray, centroids: np.ndarray, chunk: int = 16384) -> np.ndarray:
+    """Nearest-centroid list id for every row, computed in chunks."""
+    out = np.empty(x.shape[0], dtype=np.int32)
+    for start in range(0, x.shape[0], chunk):
+        out[start : start + chunk] = np.argmax(
+            np.asarray(x[start : start + chunk]) @ centroids.T, axis=1
+        )
+    return out
+
+
+class IVFIndex:
+    """Inverted-file ANN index over the rows of a `VectorStore`.
+
+    Layout under `.radar_index/ivf/`:
+      centroids.npy   (nlist, dim) normalized coarse centroids
+      assign.i32      list id per vector-store row, appended at ingest time
+      meta.json       {"store_id": ..., "nlist": ...}
+
+    The index never copies vectors; it only records which list each store row
+    belongs to. Rows the index has not assigned yet (new since training, or
+    after a crash between the two appends) are always scanned exactly, so
+    results stay correct while the index lags. `nprobe` trades recall for
+    latency: each query scores `nprobe` lists plus the unassigned tail.
+    """
+
+    def __init__(self, root: Optional[str] = None, store: Optional[VectorStore] = None):
+        self.root = os.path.join(root or settings.INDEX_DIR, "ivf")
+        self.store = store or get_vector_store(root)
+        self.centroids_path = os.path.join(self.root, "centroids.npy")
+        self.assign_path = os.path.join(self.root, "assign.i32")
+        self.meta_path = os.path.join(self.root, "meta.json")
+        self._lock = threading.Lock()
+        self._training = threading.Lock()
+        self._centroids: Optional[np.ndarray] = None
+        self._order: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._assigned = 0
+        self._loaded_key: Optional[Tuple] = None
+
+    # --- persistence -------------------------------------------------------------
+
+    def _meta(self) -> dict:
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _valid(self) -> bool:
+        """The index only applies to the exact vector store it was trained on."""
+        meta = self._meta()
+        return bool(meta) and meta.get("store_id") == self.store.meta().get("store_id")
+
+    def _load(self) -> None:
+        try:
+            key = (
+                os.path.getmtime(self.meta_path),
+                os.path.getsize(self.assign_path),
+                self.store.meta().get("store_id"),
+            )
+        except FileNotFoundError:
+            key = None
+        if key == self._loaded_key:
+            return
+        self._loaded_key = key
+        self._centroids, self._order, self._offsets, self._assigned = None, None, None, 0
+        if key is None or not self._valid():
+            return
+        centroids = np.load(self.centroids_path)
+        assign = np.fromfile(self.assign_path, dtype=np.int32)
+        # Group row numbers by list (CSR-style) so probing a list is a slice.
+        self._order = np.argsort(assign, kind="stable")
+        self._offsets = np.searchsorted(
+            assign[self._order], np.arange(len(centroids) + 1)
+        )
+        self._centroids = centroids
+        self._assigned = len(assign)
+
+    @property
+    def trained(self) -> bool:
+        with self._lock:
+            self._load()
+            return self._centroids is not None
+
+    # --- building ----------------------------------------------------------------
+
+    def train(self, nlist: Optional[int] = None, sample: int = 256) -> int:
+        """(Re)train centroids on the current store and assign every row. Returns nlist."""
+        with self._training:
+            matrix, _, _ = self.store.snapshot()
+            if matrix is None or matrix.shape[0] < 2:
+                return 0
+            n = matrix.shape[0]
+            nlist = nlist or settings.ANN_NLIST or max(1, int(np.sqrt(n)))
+            nlist = min(nlist, n)
+            rng = np.random.default_rng(0)
+            idx = np.sort(rng.choice(n, size=min(n, nlist * sample), replace=False))
+            centroids = spherical_kmeans(np.asarray(matrix[idx]), nlist)
+            assign = assign_rows(matrix, centroids)
+
+            os.makedirs(self.root, exist_ok=True)
+            with self._lock:
+                np.save(self.centroids_path, centroids)
+                assign.tofile(self.assign_path)
+                with open(self.meta_path, "w") as f:
+                    json.dump(
+                        {
+                            "store_id": self.store.meta().get("store_id"),
+                            "nlist": nlist,
+                            "trained_rows": n,
+                        },
+                        f,
+                    )
+                self._loaded_key = None
+            logger.info(f"IVF index trained: {n} vectors in {nlist} lists")
+            return nlist
+
+    def add_new_rows(self) -> int:
+        """Assign store rows appended since the last call (the ingest-path insert)."""
+        with self._lock:
+            self._load()
+            if self._centroids is None:
+                return 0
+            matrix, _, _ = self.store.snapshot()
+            if matrix is None or matrix.shape[0] <= self._assigned:
+                return 0
+            new = assign_rows(matrix[self._assigned :], self._centroids)
+            with open(self.assign_path, "ab") as f:
+                f.write(new.tobytes())
+            self._loaded_key = None
+            return len(new)
+
+    def maybe_train(self) -> bool:
+        """Train once there is enough data, and retrain after the store has doubled
+        since the last training (lists drift as the corpus grows).
+
+        Runs in the caller's thread: k-means is minutes of CPU on a large store
+        and a daemon thread would die with a short-lived `radar ingest`, so only
+        `radar sync` and `radar reindex --ann` train. Until then, queries scan
+        unassigned rows exactly.
+        """
+        matrix, _, _ = self.store.snapshot()
+        n = 0 if matrix is None else matrix.shape[0]
+        if self.trained:
+            due = n >= 2 * self._meta().get("trained_rows", n)
+        else:
+            due = n >= settings.ANN_MIN_TRAIN
+        if not due or self._training.locked():
+            return False
+        return self.train() > 0
+
+    # --- queries -----------------------------------------------------------------
+
+    def search(
+        self, query: np.ndarray, k: int = 5, nprobe: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Approximate top-k cosine neighbours as `(signal_id, similarity)` pairs."""
+        matrix, ids, latest = self.store.snapshot()
+        if matrix is None:
+            return []
+        q = normalize_rows(query)[0]
+        with self._lock:
+            self._load()
+            centroids, order, offsets = self._centroids, self._order, self._offsets
+            assigned = min(self._assigned, matrix.shape[0])
+
+        parts = [np.arange(assigned, matrix.shape[0])]
+        if centroids is not None:
+            nprobe = min(nprobe or settings.ANN_NPROBE, len(centroids))
+            probes = np.argpartition(-(centroids @ q), nprobe - 1)[:nprobe]
+            parts += [order[offsets[p] : offsets[p + 1]] for p in probes]
+        else:
+            parts = [np.arange(matrix.shape[0])]
+        rows = np.sort(np.concatenate(parts))  # sorted for sequential memmap reads
+        rows = rows[rows < matrix.shape[0]]
+        scores = np.asarray(matrix[rows]) @ q
+        return top_k_rows(rows, scores, ids, latest, k)
+
+
+_indexes: Dict[str, IVFIndex] = {}
+
+
+def get_ann_index(root: Optional[str] = None) -> IVFIndex:
+    key = root or settings.INDEX_DIR
+    if key not in _indexes:
+        _indexes[key] = IVFIndex(key)
+    return _indexes[key]
@@ -0,0 +1,323 @@
+import fcntl
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from radar.config import settings
+from radar.core.search import reciprocal_rank_fusion
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+@lru_cache(maxsize=1)
+def _stopwords() -> frozenset:
+    from bm25s.stopwords import STOPWORDS_EN
+
+    return frozenset(STOPWORDS_EN)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens minus English stopwords (shared by indexing and queries)."""
+    stop = _stopwords()
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in stop and len(t) > 1]
+
+
+class BM25Index:
+    """Persistent BM25 index under `.radar_index/bm25/`.
+
+    Layout:
+      CURRENT        name of the active base segment directory
+      base-<n>/      bm25s matrices (loaded with mmap) + docs.jsonl (ids and tokens)
+      delta.jsonl    append-only log of documents ingested since the last compaction
+
+    New signals are appended to the delta log and scored with a small in-memory
+    index; `compact()` folds the delta into a fresh base segment from stored
+    tokens, so raw text is never re-tokenized. The two segments have separate
+    corpus statistics, so their rankings are fused by rank, not raw score.
+
+    Compaction and rebuilds hold `compact.lock` and delta appends `delta.lock`
+    (both `flock`), so several radar processes can share one index.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.join(root or settings.INDEX_DIR, "bm25")
+        self.delta_path = os.path.join(self.root, "delta.jsonl")
+        self._lock = threading.Lock()
+        self._base = None
+        self._base_ids: List[str] = []
+        self._base_name: Optional[str] = None
+        self._delta_docs: Dict[str, List[str]] = {}
+        self._delta_size = -1
+        self._delta_index = None
+        self._delta_ids: List[str] = []
+
+    # --- paths -----------------------------------------------------------------
+
+    def _current_name(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.root, "CURRENT")) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _set_current(self, name: str) -> None:
+        tmp = os.path.join(self.root, "CURRENT.tmp")
+        with open(tmp, "w") as f:
+            f.write(name)
+        os.replace(tmp, os.path.join(self.root, "CURRENT"))
+
+    @contextmanager
+    def _file_lock(self, name: str, blocking: bool = True):
+        """Exclusive `flock` on `root/name`; yields False if non-blocking and taken."""
+        os.makedirs(self.root, exist_ok=True)
+        fd = os.open(os.path.join(self.root, name), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    # --- loading ---------------------------------------------------------------
+
+    def _load_base(self) -> None:
+        """(Re)load the base segment if another process or a compaction replaced it."""
+        import bm25s
+
+        name = self._current_name()
+        if name == self._base_name:
+            return
+        self._base, self._base_ids, self._base_name = None, [], name
+        if not name:
+            return
+        path = os.path.join(self.root, name)
+        try:
+            with open(os.path.join(path, "ids.json")) as f:
+                self._base_ids = json.load(f)
+            if self._base_ids:
+                self._base = bm25s.BM25.load(path, mmap=True)
+        except (FileNotFoundError, ValueError) as e:
+            logger.error(f"BM25 base segment {path} unreadable: {e}")
+            self._base, self._base_ids = None, []
+
+    def _load_delta(self) -> None:
+        """Re-read the delta log when it has grown (appends may come from other processes)."""
+        try:
+            size = os.path.getsize(self.delta_path)
+        except FileNotFoundError:
+            size = 0
+        if size == self._delta_size:
+            return
+        docs: Dict[str, List[str]] = {}
+        if size:
+            with open(self.delta_path) as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # torn write from a crashed appender
+                    docs[rec["id"]] = rec["tokens"]
+        self._delta_docs, self._delta_size = docs, size
+        self._delta_index, self._delta_ids = None, []
+
+    # --- writes ----------------------------------------------------------------
+
+    def add(self, signal_id: str, text: str) -> None:
+        """Append one document to the delta log."""
+        line = json.dumps({"id": signal_id, "tokens": tokenize(text)})
+        with self._lock, self._file_lock("delta.lock"):
+            with open(self.delta_path, "a") as f:
+                f.write(line + "\n")
+
+    def remove(self, signal_id: str) -> None:
+        """Drop a document: an empty delta entry supersedes it and matches nothing."""
+        self.add(signal_id, "")
+
+    def delta_count(self) -> int:
+        with self._lock:
+            self._load_delta()
+            return len(self._delta_docs)
+
+    def rebuild(self, docs: Iterable[Tuple[str, str]]) -> int:
+        """Replace the whole index with `(signal_id, text)` pairs."""
+        return self.rebuild_tokens((sid, tokenize(text)) for sid, text in docs)
+
+    def rebuild_tokens(self, docs: Iterable[Tuple[str, List[str]]]) -> int:
+        """Replace the whole index with `(signal_id, tokens)` pairs; `radar reindex`
+        tokenizes batch by batch as it streams the corpus."""
+        tokenized = list(docs)
+        with self._file_lock("compact.lock"):
+            with self._lock, self._file_lock("delta.lock"):
+                self._write_base(tokenized)
+                if os.path.exists(self.delta_path):
+                    os.remove(self.delta_path)
+                self._delta_size = -1
+            return len(tokenized)
+
+    def compact(self) -> int:
+        """Fold the delta log into a new base segment; 0 if another compaction is running."""
+        with self._file_lock("compact.lock", blocking=False) as locked:
+            if not locked:
+                return 0
+            with self._lock:
+                self._load_base()
+                try:
+                    with open(self.delta_path) as f:
+                        delta_lines = f.readlines()
+                except FileNotFoundError:
+                    return 0
+                base_name = self._base_name
+
+            if not delta_lines:
+                return 0
+
+            merged: Dict[str, List[str]] = {}
+            if base_name:
+                with open(os.path.join(self.root, base_name, "docs.jsonl")) as f:
+                    for line in f:
+                        rec = json.loads(line)
+                        merged[rec["id"]] = rec["tokens"]
+            for line in delta_lines:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                merged[rec["id"]] = rec["tokens"]
+
+            merged = {sid: tokens for sid, tokens in merged.items() if tokens}
+            # Indexing runs outside the lock; readers keep using the old segment
+            # until CURRENT flips, and ids present in both are resolved to the delta.
+            self._write_base(list(merged.items()))
+            with self._lock, self._file_lock("delta.lock"):
+                # Keep anything appended (by any process) while we were indexing.
+                with open(self.delta_path) as f:
+                    remaining = f.readlines()[len(delta_lines) :]
+                tmp = self.delta_path + ".tmp"
+                with open(tmp, "w") as f:
+                    f.writelines(remaining)
+                os.replace(tmp, self.delta_path)
+                self._delta_size = -1
+            logger.info(f"BM25 compaction folded {len(delta_lines)} documents")
+            return len(delta_lines)
+
+    def maybe_compact(self) -> bool:
+        """Compact (in the caller's thread) once the delta log passes the threshold.
+
+        A short-lived CLI process would kill a background compaction on exit,
+        so this runs to completion; callers on an event loop use `to_thread`.
+        """
+        if self.delta_count() < settings.BM25_COMPACT_THRESHOLD:
+            return False
+        return self.compact() > 0
+
+    def _write_base(self, docs: List[Tuple[str, List[str]]]) -> None:
+        import bm25s
+
+        os.makedirs(self.root, exist_ok=True)
+        previous = self._current_name()
+        generation = int(previous.split("-")[1]) + 1 if previous else 1
+        name = f"base-{generation}"
+        path = os.path.join(self.root, name)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+        if docs:
+            retriever = bm25s.BM25()
+            retriever.index([tokens for _, tokens in docs], show_progress=False)
+            retriever.save(path)
+        with open(os.path.join(path, "ids.json"), "w") as f:
+            json.dump([sid for sid, _ in docs], f)
+        with open(os.path.join(path, "docs.jsonl"), "w") as f:
+            for sid, tokens in docs:
+                f.write(json.dumps({"id": sid, "tokens": tokens}) + "\n")
+
+        self._set_current(name)
+        if previous and previous != name:
+            shutil.rmtree(os.path.join(self.root, previous), ignore_errors=True)
+        self._base_name = None  # force reload on next search
+
+    # --- reads -----------------------------------------------------------------
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Return `(signal_id, score)` pairs, best first, from base and delta segments."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            self._load_base()
+            self._load_delta()
+            # Over-fetch: every delta doc may hide a base hit it supersedes
+            # (an edit or a `remove` tombstone).
+            base = [
+                (sid, score)
+                for sid, score in self._search_base(tokens, k + len(self._delta_docs))
+                if sid not in self._delta_docs  # delta holds the newer version
+            ][:k]
+            delta = self._search_delta(tokens, k)
+        if not base or not delta:
+            return (base or delta)[:k]
+        return reciprocal_rank_fusion([base, delta], k=settings.RRF_K)[:k]
+
+    def _search_base(self, tokens: List[str], k: int) -> List[Tuple[str, float]]:
+        if self._base is None or not self._base_ids:
+            return []
+        known = [t for t in tokens if t in self._base.vocab_dict]
+        if not known:
+            return []
+        docs, scores = self._base.retrieve(
+            [known], k=min(k, len(self._base_ids)), show_progress=False
+        )
+        return [
+            (self._base_ids[int(d)], float(s))
+            for d, s in zip(docs[0], scores[0])
+            if s > 0
+        ]
+
+    def _search_delta(self, tokens: List[str], k: int) -> List[Tuple[str, float]]:
+        import bm25s
+
+        if not self._delta_docs:
+            return []
+        if self._delta_index is None:
+            self._delta_ids = list(self._delta_docs)
+            self._delta_index = bm25s.BM25()
+            self._delta_index.index(
+                [self._delta_docs[sid] or [""] for sid in self._delta_ids],
+                show_progress=False,
+            )
+        known = [t for t in tokens if t in self._delta_index.vocab_dict]
+        if not known:
+            return []
+        docs, scores = self._delta_index.retrieve(
+            [known], k=min(k, len(self._delta_ids)), show_progress=False
+        )
+        return [
+            (self._delta_ids[int(d)], float(s))
+            for d, s in zip(docs[0], scores[0])
+            if s > 0
+        ]
+
+
+_indexes: Dict[str, BM25Index] = {}
+
+
+def get_bm25_index(root: Optional[str] = None) -> BM25Index:
+    """Process-wide index instance so the mmap'd base segment is opened once."""
+    key = root or settings.INDEX_DIR
+    if key not in _indexes:
+        _indexes[key] = BM25Index(key)
+    return _indexes[key]
@@ -0,0 +1,169 @@
+"""Long-lived headless Chromium shared by the browser-driven agents.
+
+Launching Chromium costs far more than loading a page, so one browser is
+started on first use and kept for the whole run (`radar sync` closes it at
+the end). Each task leases its own `BrowserContext`, so cookies and storage
+never leak between concurrent tasks. A lease swaps its context for a fresh
+one after `BROWSER_PAGES_PER_CONTEXT` pages to bound renderer memory, and a
+browser that crashed or disconnected is relaunched on the next lease.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from radar.config import settings
+
+logger = logging.getLogger(__name__)
+
+Launcher = Callable[[], Awaitable[Any]]
+
+
+class BrowserLease:
+    """A task's private browser context.
+
+    Pages may be open concurrently. When the page budget is spent the context
+    is retired rather than closed under its open pages; it is closed once the
+    last of them is released.
+    """
+
+    def __init__(self, pool: "BrowserPool"):
+        self.pool = pool
+        self.context = None
+        self.pages_opened = 0
+        self._open: Dict[Any, int] = {}  # context -> pages not yet released
+        self._owner: Dict[int, Any] = {}  # id(page) -> context
+
+    async def new_page(self):
+        """Open a page, recycling the context or relaunching the browser as needed."""
+        if self.context is not None and self.pages_opened >= settings.BROWSER_PAGES_PER_CONTEXT:
+            await self._retire()
+        try:
+            return await self._open_page()
+        except Exception as e:
+            if self.pool.is_connected():
+                raise
+            logger.warning(f"Headless browser lost ({e}); retrying on a new one")
+            await self._retire()
+            return await self._open_page()
+
+    async def release(self, page) -> None:
+        """Close a page from `new_page`; closes its context if that was retired."""
+        try:
+            await page.close()
+        except Exception:
+            pass  # the page dies with a crashed browser
+        context = self._owner.pop(id(page), None)
+        if context is None:
+            return
+        self._open[context] -= 1
+        if context is not self.context and not self._open[context]:
+            del self._open[context]
+            await _close_context(context)
+
+    async def _open_page(self):
+        if self.context is None:
+            self.context = await self.pool._new_context()
+            self.pages_opened = 0
+            self._open[self.context] = 0
+        page = await self.context.new_page()
+        self.pages_opened += 1
+        self._open[self.context] += 1
+        self._owner[id(page)] = self.context
+        return page
+
+    async def _retire(self) -> None:
+        context, self.context = self.context, None
+        if context is not None and not self._open.get(context):
+            self._open.pop(context, None)
+            await _close_context(context)
+
+    async def close(self) -> None:
+        self.context = None
+        contexts, self._open = list(self._open), {}
+        self._owner.clear()
+        for context in contexts:
+            await _close_context(context)
+
+
+async def _close_context(context) -> None:
+    try:
+        await context.close()
+    except Exception:
+        pass  # the browser may already be gone
+
+
+class BrowserPool:
+    def __init__(self, max_contexts: Optional[int] = None, launcher: Optional[Launcher] = None):
+        self._limit = asyncio.Semaphore(max_contexts or settings.BROWSER_MAX_CONTEXTS)
+        self._launcher = launcher
+        self._playwright = None
+        self._browser = None
+        self._lock = asyncio.Lock()
+        self.launches = 0
+
+    async def _launch(self):
+        if self._launcher is not None:
+            return await self._launcher()
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=True)
+
+    def is_connected(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _ensure_browser(self):
+        async with self._lock:
+            if not self.is_connected():
+                if self._browser is not None:
+                    logger.warning("Headless browser disconnected; relaunching")
+                self._browser = await self._launch()
+                self.launches += 1
+            return self._browser
+
+    async def _new_context(self):
+        browser = await self._ensure_browser()
+        return await browser.new_context()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[BrowserLease]:
+        """Exclusive context for one task; at most `max_contexts` are open at once."""
+        async with self._limit:
+            lease = BrowserLease(self)
+            try:
+                yield lease
+            finally:
+                await lease.close()
+
+    async def close(self) -> None:
+        async with self._lock:
+            browser, self._browser = self._browser, None
+            playwright, self._playwright = self._playwright, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if playwright is not None:
+            await playwright.stop()
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide pool; the browser itself starts on the first lease."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+async def close_browser_pool() -> None:
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
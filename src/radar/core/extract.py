@@ -0,0 +1,252 @@
+"""Numerical stat extraction (`IntelligenceAgent.extract_stats`).
+
+All patterns are compiled once at import. Instead of one `finditer` pass per
+pattern, a single trigger scan visits only the positions where some pattern
+can start (the first digit of a digit run, `-<digit>`, `$`, or a fuel
+keyword) and tries the handlers for that kind of position there. Each
+handler keeps its own cursor, so the matches it accepts are exactly the ones
+its own `finditer` would have produced, overlaps between patterns included.
+Results are emitted grouped by handler, in the original pattern order.
+
+Subjects are cut at the last `,.;:` before a match, found by bisecting
+delimiter offsets computed once per text.
+"""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Pattern, Sequence, Tuple
+
+_I = re.IGNORECASE
+
+_LEADING_RE = re.compile(
+    r"^(the|a|an|of|to|for|is|are|was|were|has|been|which|that|this|these)\s+", _I
+)
+_TRAILING_RE = re.compile(
+    r"\s+(rose|fell|dropped|increased|decreased|at|of|to|is|with|by|around|nearly|about)$",
+    _I,
+)
+_DELIM_RE = re.compile(r"[,.;:]")
+# Every handler pattern starts with a digit (a match never starts inside a
+# digit run that the same pattern could start earlier), `-`, `$`, or `gas`/`fuel`.
+_TRIGGER_RE = re.compile(r"(?<!\d)\d|-(?=\d)|\$|(?i:gas|fuel)")
+
+SUBJECT_WINDOW = 80
+CONTEXT_WINDOW = 80
+
+
+def _plain(m: "re.Match") -> float:
+    return float(m.group(1))
+
+
+def _grouped(m: "re.Match") -> float:
+    return float(m.group(1).replace(",", ""))
+
+
+def _scaled(m: "re.Match") -> float:
+    value, scale = float(m.group(1)), m.group(2).upper()
+    if scale.startswith("B") or scale == "BILLION":
+        value *= 1_000_000_000
+    elif scale.startswith("M") or scale == "MILLION":
+        value *= 1_000_000
+    elif scale.startswith("K"):
+        value *= 1_000
+    return value
+
+
+@dataclass(frozen=True)
+class Handler:
+    """One pattern and how a match becomes a stat."""
+
+    pattern: Pattern
+    label: str
+    unit: Optional[str]  # None: take the unit from the match's second group
+    value: Callable[["re.Match"], float]
+    subject: bool = True  # prefer the preceding noun phrase over `label`
+    lenient: bool = True  # drop matches whose value does not parse
+    dedup_usd: bool = False  # skip USD values already extracted
+    starts: str = "digit"  # trigger kind a match begins at: digit, "-", "$" or word
+
+
+def _h(pattern: str, label: str, unit: Optional[str], value=_grouped, flags=_I, **kw) -> Handler:
+    return Handler(re.compile(pattern, flags), label, unit, value, **kw)
+
+
+# Output order: stats are grouped by handler, in this order.
+HANDLERS: List[Handler] = [
+    # SIGINT
+    _h(r"(-\d+\.?\d*)\s*dBm", "Noise Floor/RSSI", "dBm", _plain, lenient=False, starts="-"),
+    _h(
+        r"(\d+\.?\d*)\s*(kHz|MHz|GHz)\s*(?:bandwidth|BW|channel spacing)",
+        "Signal BW",
+        None,
+        _plain,
+        lenient=False,
+    ),
+    _h(r"(\d+)-bit\s*(?:AES|DES|encryption|key)", "Encryption Depth", "bit", _plain, lenient=False),
+    # Tactical
+    _h(r"(\d+,?\d*)\s*(?:troops|personnel|soldiers|combatants)", "Troop Count", "Units"),
+    _h(r"(\d+,?\d*)\s*(?:casualties|killed|wounded|fatalities)", "Casualty Count", "Units"),
+    _h(r"(\d+,?\d*)\s*(?:drones|UAVs|quadcopters|fixed-wing)", "Drone Density", "Units"),
+    _h(r"(\d+,?\d*)\s*(?:cameras|LPRs|ALPRs|surveillance nodes)", "Sensor Density", "Units"),
+    _h(r"(\d+,?\d*)\s*(?:arrests|detained|apprehensions)", "Enforcement Count", "Units"),
+    _h(
+        r"(\d+\.?\d*)\s*(?:mi|km|miles|kilometers)\s*(?:radius|distance|range)",
+        "Tactical Range",
+        "Dist",
+    ),
+    # Financial
+    _h(r"\$(\d+\.?\d*)\s*([MBK]|Million|Billion)", "Strategic Value", "USD", _scaled, starts="$"),
+    _h(
+        r"(?:Gas|Fuel|Gasoline):\s*\$([0-9,]+\.?\d*)",
+        "Gas Price",
+        "USD",
+        subject=False,
+        lenient=False,
+        starts="word",
+    ),
+    _h(r"\$([0-9,]+\.?\d*)", "Price/Value", "USD", flags=0, dedup_usd=True, starts="$"),
+    # Generic units
+    _h(r"(\d+\.?\d*)%", "Percentage", "%", _plain, flags=0),
+    _h(r"(\d+,?\d*)\s*(?:acres|acre)", "Land Area", "Acres"),
+    _h(r"(\d+,?\d*)\s*(?:gallons|gal)", "Fuel Volume", "Gallons"),
+    _h(r"(\d+,?\d*)\s*(?:t/s|tokens/sec)", "Performance", "t/s"),
+    _h(r"(\d+,?\d*)\s*(?:beds|bed count)", "Medical Capacity", "Beds"),
+]
+
+# Handlers that can start at each kind of trigger position.
+_BY_TRIGGER: Dict[str, List[int]] = {"digit": [], "-": [], "$": [], "word": []}
+for _i, _handler in enumerate(HANDLERS):
+    _BY_TRIGGER[_handler.starts].append(_i)
+
+
+class _Text:
+    """Per-document lookups shared by all handlers."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.delims = [m.start() for m in _DELIM_RE.finditer(text)]
+        self._subjects: Dict[int, Optional[str]] = {}
+
+    def subject(self, pos: int) -> Optional[str]:
+        """Noun phrase right before `pos`, title-cased, or None if too short."""
+        if pos in self._subjects:
+            return self._subjects[pos]
+        start = max(0, pos - SUBJECT_WINDOW)
+        i = bisect_left(self.delims, pos) - 1
+        if i >= 0 and self.delims[i] >= start:
+            start = self.delims[i] + 1
+        chunk = self.text[start:pos].replace("\n", " ").strip()
+        chunk = _LEADING_RE.sub("", chunk)
+        chunk = _TRAILING_RE.sub("", chunk)
+        words = chunk.split()
+        if len(words) > 5:
+            chunk = " ".join(words[-5:])
+        result = chunk.title() if len(chunk) > 3 else None
+        self._subjects[pos] = result
+        return result
+
+    def context(self, start: int, end: int) -> str:
+        lo = max(0, start - CONTEXT_WINDOW)
+        hi = min(len(self.text), end + CONTEXT_WINDOW)
+        return self.text[lo:hi].replace("\n", " ").strip()
+
+
+def _stat(doc: _Text, handler: Handler, m: "re.Match", value: float) -> dict:
+    subject = doc.subject(m.start()) if handler.subject else None
+    return {
+        "label": subject if subject else handler.label,
+        "value": value,
+        "unit": handler.unit if handler.unit is not None else m.group(2),
+        "description": doc.context(m.start(), m.end()),
+    }
+
+
+def extract_stats(text: str) -> List[dict]:
+    """Numeric stats (label, value, unit, description) found in `text`."""
+    doc = _Text(text)
+    found: List[List["re.Match"]] = [[] for _ in HANDLERS]
+    cursors = [0] * len(HANDLERS)
+    for trig in _TRIGGER_RE.finditer(text):
+        pos = trig.start()
+        ch = text[pos]
+        if ch == "$" or ch == "-":
+            candidates = _BY_TRIGGER[ch]
+        elif ch.isalpha():
+            candidates = _BY_TRIGGER["word"]
+        else:
+            candidates = _BY_TRIGGER["digit"]
+        for i in candidates:
+            if pos < cursors[i]:
+                continue
+            m = HANDLERS[i].pattern.match(text, pos)
+            if m:
+                found[i].append(m)
+                cursors[i] = m.end()
+
+    stats: List[dict] = []
+    usd = set()
+    for handler, matches in zip(HANDLERS, found):
+        for m in matches:
+            if handler.lenient:
+                try:
+                    value = handler.value(m)
+                except ValueError:
+                    continue
+            else:
+                value = handler.value(m)
+            if handler.dedup_usd and value in usd:
+                continue
+            stat = _stat(doc, handler, m, value)
+            if stat["unit"] == "USD":
+                usd.add(value)
+            stats.append(stat)
+    return stats
+
+
+# Statistic.category from the signal title and the stat label; first rule wins.
+# Each rule: (category, keywords, also match against the label).
+CATEGORY_RULES = [
+    ("FINANCE", ("price", "cost", "economic", "finance", "route intel", "gas"), False),
+    ("TECH_METRICS", ("benchmark", "performance", "fps", "t/s"), False),
+    (
+        "LOGISTICS/OSINT",
+        ("capacity", "count", "stats", "troops", "casualties", "density", "enforcement"),
+        True,
+    ),
+    (
+        "SIGINT/COMSEC",
+        (
+            "sdr",
+            "radio",
+            "p25",
+            "frequency",
+            "bandwidth",
+            "encryption",
+            "noise floor",
+            "rssi",
+            "sigint",
+        ),
+        True,
+    ),
+    ("CYBER_INTEL", ("phishing", "malware", "vuln", "cve", "zero-day", "exploit"), False),
+]
+
+
+def categorize(title: str, label: str) -> str:
+    t_lower, l_lower = title.lower(), label.lower()
+    for category, keywords, use_label in CATEGORY_RULES:
+        if any(k in t_lower or (use_label and k in l_lower) for k in keywords):
+            return category
+    return "GENERAL"
+
+
+def extract_batch(items: Sequence[Tuple[str, str, str]]) -> List[Tuple[str, List[dict]]]:
+    """Categorized stats for `(signal id, title, content)` items; runs in worker processes."""
+    out = []
+    for sid, title, content in items:
+        stats = extract_stats(content or "")
+        for s in stats:
+            s["category"] = categorize(title, s["label"])
+        out.append((sid, stats))
+    return out
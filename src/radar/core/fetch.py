@@ -0,0 +1,251 @@
+"""HTTP-first page fetching with a headless-browser fallback.
+
+Most result pages are static HTML, so a page is first fetched with a pooled
+`httpx.AsyncClient` and run through trafilatura. Only when that extraction
+is empty, thin, or the markup is an obvious JavaScript shell is the page
+rendered in Chromium. The outcome is remembered per host (in
+`INDEX_DIR/fetch_hosts.json`), so hosts that need a browser skip the wasted
+HTTP attempt on later sweeps, with an occasional HTTP re-probe in case they
+stop needing it.
+
+Every HTTP fetch goes through the on-disk cache in `radar.core.http_cache`:
+unchanged pages are revalidated with a conditional request and their
+extracted text is reused by body hash.
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from radar.config import settings
+from radar.core.http_cache import (
+    CachedResponse,
+    HTTPCache,
+    close_http_cache,
+    get_http_cache,
+    read_limited,
+)
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0 Safari/537.36"
+)
+GOOD_CHARS = 1500  # extracted text length that counts as a full article
+REPROBE_EVERY = 10  # browser-mode hosts get an HTTP try every Nth fetch
+
+# Markup of client-side rendered apps whose HTML carries no content.
+_JS_MARKERS = (
+    "enable javascript",
+    "requires javascript",
+    "javascript is disabled",
+    'id="__next"',
+    'id="root"></div>',
+    'id="app"></div>',
+    "window.__nuxt__",
+    "data-reactroot",
+    "ng-version=",
+)
+
+
+def extraction_quality(html: str, text: str) -> float:
+    """0..1 estimate of how completely `text` captures the page in `html`."""
+    if not text or not text.strip():
+        return 0.0
+    score = min(1.0, len(text) / GOOD_CHARS)
+    head = html[:200_000].lower()
+    if score < 1.0 and any(marker in head for marker in _JS_MARKERS):
+        score *= 0.3
+    return score
+
+
+class HostMemory:
+    """Per-host record of whether HTTP extraction was good enough."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or os.path.join(settings.INDEX_DIR, "fetch_hosts.json"))
+        self.hosts: Dict[str, dict] = {}
+        self._dirty = 0
+        try:
+            self.hosts = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            pass
+
+    def skip_http(self, host: str) -> bool:
+        """True when `host` is known to need the browser (counts toward re-probing)."""
+        entry = self.hosts.get(host)
+        if not entry or entry.get("mode") != "browser":
+            return False
+        entry["skips"] = entry.get("skips", 0) + 1
+        return entry["skips"] % REPROBE_EVERY != 0
+
+    def record(self, host: str, mode: str) -> None:
+        entry = self.hosts.setdefault(host, {})
+        if entry.get("mode") != mode:
+            entry["skips"] = 0
+        entry["mode"] = mode
+        entry[mode] = entry.get(mode, 0) + 1
+        entry["updated"] = time.time()
+        self._dirty += 1
+        if self._dirty >= 20:
+            self.save()
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.hosts, indent=1, sort_keys=True))
+        os.replace(tmp, self.path)
+        self._dirty = 0
+
+
+_client: Optional[httpx.AsyncClient] = None
+_memory: Optional[HostMemory] = None
+
+
+def get_host_memory() -> HostMemory:
+    global _memory
+    if _memory is None:
+        _memory = HostMemory()
+    return _memory
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Process-wide pooled client (keep-alive, HTTP connection reuse per host).
+
+    HTTP/2 is negotiated where the server offers it, if the optional `h2`
+    package is installed.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=settings.FETCH_TIMEOUT,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            http2=_http2_available(),
+        )
+    return _client
+
+
+async def cached_get(
+    url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[HTTPCache] = None,
+    limit: Optional[int] = None,
+    **kwargs,
+) -> CachedResponse:
+    """Stream `url` with the shared client, through the HTTP cache when enabled.
+
+    Bodies larger than `limit` (default `FETCH_MAX_BYTES`) are abandoned with
+    `ResponseTooLarge` as soon as that is known.
+    """
+    client = client or get_http_client()
+    cache = cache if cache is not None else get_http_cache()
+    limit = limit or settings.FETCH_MAX_BYTES
+    if cache is not None:
+        return await cache.get(client, url, limit=limit, **kwargs)
+    async with client.stream("GET", url, **kwargs) as response:
+        content = await read_limited(response, limit)
+    return CachedResponse(
+        url=url,
+        status_code=response.status_code,
+        content=content,
+        content_type=response.headers.get("content-type", ""),
+        encoding=response.encoding,
+        outcome="uncacheable",
+    )
+
+
+async def close_fetcher() -> None:
+    """Persist the host memory and close the shared HTTP client and cache."""
+    global _client, _memory
+    client, _client = _client, None
+    memory, _memory = _memory, None
+    if memory is not None:
+        memory.save()
+    if client is not None:
+        await client.aclose()
+    close_http_cache()
+
+
+class AdaptiveFetcher:
+    """Fetch readable page text, escalating from HTTP to the browser only when needed.
+
+    `clean_html(html)` is awaited to turn fetched markup into text.
+    """
+
+    def __init__(
+        self,
+        clean_html: Callable[[str], Awaitable[str]],
+        client: Optional[httpx.AsyncClient] = None,
+        memory: Optional[HostMemory] = None,
+        cache: Optional[HTTPCache] = None,
+    ):
+        self.clean_html = clean_html
+        self.client = client
+        self.memory = memory or get_host_memory()
+        self.cache = cache if cache is not None else get_http_cache()
+        self.counts = {"http": 0, "browser": 0}
+
+    async def fetch_http(self, url: str) -> Tuple[str, float]:
+        """(text, quality) of the statically served page; ("", 0) when unusable."""
+        try:
+            response = await cached_get(url, client=self.client, cache=self.cache)
+        except httpx.HTTPError as e:
+            logger.debug(f"HTTP fetch failed for {url}: {e}")
+            return "", 0.0
+        if response.status_code >= 400 or "html" not in response.content_type:
+            return "", 0.0
+        html = response.text
+        text = None
+        if self.cache is not None and response.body_hash:
+            text = await asyncio.to_thread(self.cache.derived, response.body_hash, "clean_html")
+        if text is None:
+            text = await self.clean_html(html)
+            if self.cache is not None and response.body_hash:
+                await asyncio.to_thread(
+                    self.cache.store_derived, response.body_hash, "clean_html", text
+                )
+        return text, extraction_quality(html, text)
+
+    async def fetch(self, url: str, render) -> str:
+        """Page text for `url`; `render(url)` is awaited for the browser tier and
+        returns `(html, text)`."""
+        host = urlparse(url).hostname or ""
+        http_text, http_quality = "", 0.0
+        if settings.FETCH_HTTP_FIRST and not self.memory.skip_http(host):
+            http_text, http_quality = await self.fetch_http(url)
+            if http_quality >= settings.FETCH_MIN_QUALITY:
+                self.memory.record(host, "http")
+                self.counts["http"] += 1
+                return http_text
+
+        try:
+            html, text = await render(url)
+        except Exception:
+            if http_text:
+                return http_text
+            raise
+        self.counts["browser"] += 1
+        if extraction_quality(html, text) > http_quality:
+            self.memory.record(host, "browser")
+        elif http_text:
+            # The browser did no better; the page is just thin.
+            self.memory.record(host, "http")
+            return http_text
+        return text
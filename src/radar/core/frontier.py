@@ -0,0 +1,227 @@
+"""Per-sweep URL frontier for `DeepResearchAgent`.
+
+Overlapping sweep topics keep turning up the same result URLs. The frontier
+makes one sweep fetch every URL at most once and hands the text to each
+topic that asked for it, and it carries two pieces of state across sweeps
+(both in INDEX_DIR):
+
+  search_cache.json   search results per topic, reused for SEARCH_CACHE_TTL
+  seen_urls.bloom     Bloom filter of (url, text hash) pairs ingested within
+                      roughly the last SEEN_URL_DAYS days
+
+A source whose exact text was already ingested by an earlier sweep is left
+out of the topic, since it would only produce a duplicate signal. Sources
+count as ingested when the caller `commit`s the topic, and new marks go into
+the filter only at `close`, so within one sweep a URL still fans out to
+every topic.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from radar.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on BLAKE2b)."""
+
+    _HEADER = struct.Struct("<4sdII")  # magic, created, bits, hashes
+    _MAGIC = b"RBF1"
+
+    def __init__(self, capacity: int = 20000, error_rate: float = 0.01):
+        bits = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.bits = bits
+        self.hashes = max(1, round(bits / capacity * math.log(2)))
+        self.array = bytearray((bits + 7) // 8)
+        self.created = time.time()
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.array[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def to_bytes(self) -> bytes:
+        header = self._HEADER.pack(self._MAGIC, self.created, self.bits, self.hashes)
+        return header + bytes(self.array)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        magic, created, bits, hashes = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC:
+            raise ValueError("not a Bloom filter file")
+        bloom = cls.__new__(cls)
+        bloom.bits, bloom.hashes, bloom.created = bits, hashes, created
+        bloom.array = bytearray(data[cls._HEADER.size :])
+        if len(bloom.array) != (bits + 7) // 8:
+            raise ValueError("truncated Bloom filter file")
+        return bloom
+
+
+class SeenURLs:
+    """Two-generation Bloom filter of recently ingested sources.
+
+    Marks go into the current generation; once it is half a window old it
+    becomes the previous one and a fresh filter starts, so a mark is
+    remembered for between half and a whole `SEEN_URL_DAYS` window.
+    """
+
+    def __init__(self, path: Optional[str] = None, days: Optional[float] = None):
+        self.path = Path(path or os.path.join(settings.INDEX_DIR, "seen_urls.bloom"))
+        self.window = (days if days is not None else settings.SEEN_URL_DAYS) * 86400
+        self.generations: List[BloomFilter] = []
+        try:
+            data = self.path.read_bytes()
+            size = BloomFilter._HEADER.size
+            offset = 0
+            while offset < len(data):
+                _, _, bits, _ = BloomFilter._HEADER.unpack_from(data, offset)
+                end = offset + size + (bits + 7) // 8
+                self.generations.append(BloomFilter.from_bytes(data[offset:end]))
+                offset = end
+        except (OSError, ValueError, struct.error):
+            self.generations = []
+        self._rotate()
+
+    def _rotate(self) -> None:
+        now = time.time()
+        self.generations = [g for g in self.generations if now - g.created < self.window]
+        if not self.generations or now - self.generations[0].created >= self.window / 2:
+            self.generations.insert(0, BloomFilter(settings.SEEN_URL_CAPACITY))
+        del self.generations[2:]
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in g for g in self.generations)
+
+    def add(self, key: str) -> None:
+        self.generations[0].add(key)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_bytes(b"".join(g.to_bytes() for g in self.generations))
+        os.replace(tmp, self.path)
+
+
+class SearchCache:
+    """Search result URLs per query, persisted as JSON and reused until stale."""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        self.path = Path(path or os.path.join(settings.INDEX_DIR, "search_cache.json"))
+        self.ttl = ttl if ttl is not None else settings.SEARCH_CACHE_TTL
+        self.entries: Dict[str, dict] = {}
+        self._dirty = False
+        try:
+            self.entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            pass
+
+    def get(self, query: str) -> Optional[List[str]]:
+        entry = self.entries.get(query)
+        if entry and time.time() - entry["at"] < self.ttl:
+            return list(entry["urls"])
+        return None
+
+    def put(self, query: str, urls: List[str]) -> None:
+        self.entries[query] = {"urls": urls, "at": time.time()}
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        now = time.time()
+        self.entries = {q: e for q, e in self.entries.items() if now - e["at"] < self.ttl}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.entries, indent=1, sort_keys=True))
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def _source_key(url: str, text: str) -> str:
+    return f"{url}\n{hashlib.sha256(text.encode('utf-8', errors='ignore')).hexdigest()}"
+
+
+class URLFrontier:
+    def __init__(
+        self,
+        searches: Optional[SearchCache] = None,
+        seen: Optional[SeenURLs] = None,
+    ):
+        self.searches = searches or SearchCache()
+        self.seen = seen or SeenURLs()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._pending: Dict[str, Set[str]] = {}  # topic -> source keys awaiting commit
+        self._committed: Set[str] = set()
+        self.counts = {"searches": 0, "cached_searches": 0, "fetched": 0, "shared": 0, "seen": 0}
+
+    async def search(self, query: str, search: Callable[[str], List[str]]) -> List[str]:
+        """Result URLs for `query`; `search(query)` (blocking) runs only on a cache miss."""
+        urls = self.searches.get(query)
+        if urls is not None:
+            self.counts["cached_searches"] += 1
+            return urls
+        urls = await asyncio.to_thread(search, query)
+        self.counts["searches"] += 1
+        self.searches.put(query, urls)
+        return urls
+
+    async def fetch(
+        self, url: str, fetch: Callable[[str], Awaitable[Optional[str]]]
+    ) -> Optional[str]:
+        """Text of `url`, fetched once per sweep however many topics ask for it.
+
+        A fetch abandoned by one topic (its deadline passed) keeps running for
+        the others that share it.
+        """
+        task = self._tasks.get(url)
+        if task is None:
+            task = asyncio.ensure_future(fetch(url))
+            self._tasks[url] = task
+            self.counts["fetched"] += 1
+        else:
+            self.counts["shared"] += 1
+        return await asyncio.shield(task)
+
+    def accept(self, topic: str, url: str, text: str) -> bool:
+        """False when this exact text of `url` was ingested by an earlier sweep;
+        otherwise the source is held for `commit(topic)`."""
+        key = _source_key(url, text)
+        if key in self.seen:
+            self.counts["seen"] += 1
+            return False
+        self._pending.setdefault(topic, set()).add(key)
+        return True
+
+    def commit(self, topic: str) -> None:
+        """Record the accepted sources of `topic` as ingested."""
+        self._committed |= self._pending.pop(topic, set())
+
+    def close(self) -> None:
+        """Persist the search cache and the sources ingested this sweep."""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+        self._tasks.clear()
+        for key in self._committed:
+            self.seen.add(key)
+        self._committed.clear()
+        self.seen.save()
+        self.searches.save()
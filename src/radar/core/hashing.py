@@ -0,0 +1,140 @@
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(rb"[A-Za-z0-9]+")
+_MASK64 = (1 << 64) - 1
+_MAX_TOKEN_LEN = 255  # radar_embed truncates tokens at MAX_TOKEN_LEN - 1 bytes
+
+
+def tokenize_bytes(text: str) -> List[bytes]:
+    """radar_embed tokenization: runs of ASCII alphanumerics, lowercased, capped at 255 bytes."""
+    return [
+        t.lower()[:_MAX_TOKEN_LEN]
+        for t in _TOKEN_RE.findall(text.encode("utf-8", errors="ignore"))
+    ]
+
+
+def djb2(token: bytes) -> int:
+    """The 64-bit djb2 hash radar_embed applies to every token."""
+    h = 5381
+    for c in token:
+        h = (h * 33 + c) & _MASK64
+    return h
+
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    """radar_embed's murmur3-style finalizer over uint64 lanes."""
+    h = (h ^ (h >> np.uint64(16))) * np.uint64(0x85EBCA6B)
+    h = (h ^ (h >> np.uint64(13))) * np.uint64(0xC2B2AE35)
+    return h ^ (h >> np.uint64(16))
+
+
+class HashingVectorizer:
+    """Batched, in-process replacement for the `radar_embed` subprocess.
+
+    `mode="signed"` (default) is the classic hashing trick: each token lands in
+    one bucket with a +/-1 sign, so a batch costs O(total tokens) and can be
+    returned as a scipy CSR matrix.
+
+    `mode="radar_embed"` reproduces the C tool's output: every distinct token
+    contributes a deterministic pseudo-random weight to all dimensions. The
+    weights are computed once per distinct token in the batch and applied with
+    a single (docs x tokens) @ (tokens x dims) product, in float32 like the C
+    code (including its unsigned wrap-around in `h % 2000 - 1000`).
+    """
+
+    def __init__(self, n_features: int = 3072, mode: str = "signed", block: int = 1024):
+        if mode not in ("signed", "radar_embed"):
+            raise ValueError(f"Unknown hashing mode: {mode}")
+        self.n_features = n_features
+        self.mode = mode
+        self.block = block
+        self._hash_cache: Dict[bytes, int] = {}
+
+    @property
+    def name(self) -> str:
+        return f"hashing-{self.mode}-{self.n_features}"
+
+    def _hash(self, token: bytes) -> int:
+        h = self._hash_cache.get(token)
+        if h is None:
+            h = djb2(token)
+            if len(self._hash_cache) < 1_000_000:
+                self._hash_cache[token] = h
+        return h
+
+    def _counts(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Token occurrence triplets (doc, token-column, count) plus per-column hashes."""
+        vocab: Dict[bytes, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        for i, text in enumerate(texts):
+            for tok in tokenize_bytes(text):
+                j = vocab.get(tok)
+                if j is None:
+                    j = vocab[tok] = len(vocab)
+                rows.append(i)
+                cols.append(j)
+        hashes = np.fromiter(
+            (self._hash(t) for t in vocab), dtype=np.uint64, count=len(vocab)
+        )
+        return (
+            np.asarray(rows, dtype=np.int64),
+            np.asarray(cols, dtype=np.int64),
+            np.ones(len(rows), dtype=np.float32),
+            hashes,
+        )
+
+    def transform(self, texts: List[str], sparse: bool = False):
+        """Vectorize a batch; returns float32 (n_docs, n_features), L2-normalized per row."""
+        rows, cols, data, hashes = self._counts(texts)
+        if self.mode == "radar_embed":
+            if sparse:
+                raise ValueError("radar_embed mode produces dense vectors only.")
+            return self._transform_projection(len(texts), rows, cols, hashes)
+        return self._transform_signed(len(texts), rows, cols, data, hashes, sparse)
+
+    def _transform_signed(self, n_docs, rows, cols, data, hashes, sparse):
+        from scipy.sparse import csr_matrix
+
+        mixed = _mix(hashes)
+        buckets = (mixed % np.uint64(self.n_features)).astype(np.int64)
+        signs = np.where(mixed >> np.uint64(63), -1.0, 1.0).astype(np.float32)
+        matrix = csr_matrix(
+            (data * signs[cols], (rows, buckets[cols])),
+            shape=(n_docs, self.n_features),
+            dtype=np.float32,
+        )
+        matrix.sum_duplicates()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        matrix = csr_matrix(matrix.multiply(1.0 / norms[:, None]), dtype=np.float32)
+        return matrix if sparse else matrix.toarray()
+
+    def _transform_projection(self, n_docs, rows, cols, hashes):
+        from scipy.sparse import csr_matrix
+
+        counts = csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(n_docs, len(hashes)),
+            dtype=np.float32,
+        )
+        # (uint32)(dim * 2654435761u): the multiply happens in 32-bit unsigned int.
+        dims = (np.arange(self.n_features, dtype=np.uint64) * np.uint64(2654435761)) & np.uint64(
+            0xFFFFFFFF
+        )
+        out = np.zeros((n_docs, self.n_features), dtype=np.float32)
+        for start in range(0, len(hashes), self.block):
+            seeds = hashes[start : start + self.block]
+            h = _mix(seeds[:, None] ^ dims[None, :])
+            weights = ((h % np.uint64(2000)) - np.uint64(1000)).astype(np.float32)
+            weights /= np.float32(1000.0)
+            out += counts[:, start : start + self.block] @ weights
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            norms = np.sqrt(np.sum(out * out, axis=1, dtype=np.float32))
+            nonzero = norms > 0
+            out[nonzero] /= norms[nonzero, None]
+        return out
@@ -0,0 +1,125 @@
+"""HTML-to-text extraction on a worker process pool.
+
+trafilatura is pure-Python and CPU-bound, so running it on the event loop
+(or in a thread, under the GIL) stalls every other topic of a sweep. Pages
+are handed to a spawn-context process pool instead, and each worker tries
+trafilatura's fast mode first, paying for the full extraction with its
+fallback extractors only when the fast text scores poorly. Results are
+memoized in-process by the SHA-256 of the HTML, so a page seen by several
+topics (or re-rendered unchanged) is extracted once.
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import trafilatura
+
+from radar.config import settings
+from radar.core.fetch import extraction_quality
+
+logger = logging.getLogger(__name__)
+
+
+def _trafilatura(html: str, fast: bool) -> str:
+    try:
+        result = trafilatura.extract(
+            html, include_comments=False, include_tables=True, fast=fast
+        )
+        return result or ""
+    except Exception:
+        return ""
+
+
+def html_to_text(html: str, min_quality: Optional[float] = None) -> str:
+    """Readable text of `html`: fast extraction, full extraction if that scores
+    below `min_quality` (default `HTML_FAST_MIN_QUALITY`)."""
+    if min_quality is None:
+        min_quality = settings.HTML_FAST_MIN_QUALITY
+    fast = _trafilatura(html, fast=True)
+    if extraction_quality(html, fast) >= min_quality:
+        return fast
+    return _trafilatura(html, fast=False) or fast
+
+
+class HTMLExtractor:
+    """`await extractor(html)` -> text, computed on the pool and memoized by content hash."""
+
+    def __init__(self, workers: int = 0, cache_size: int = 0):
+        self.workers = workers or settings.HTML_WORKERS or os.cpu_count() or 1
+        self.cache_size = cache_size or settings.HTML_CACHE_SIZE
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._inflight: dict = {}
+        self.counts = {"extracted": 0, "cached": 0}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def __call__(self, html: str) -> str:
+        if not html:
+            return ""
+        key = hashlib.sha256(html.encode("utf-8", errors="surrogatepass")).digest()
+        text = self._cache.get(key)
+        if text is not None:
+            self._cache.move_to_end(key)
+            self.counts["cached"] += 1
+            return text
+        pending = self._inflight.get(key)
+        if pending is not None:  # the same page is already being extracted
+            self.counts["cached"] += 1
+            return await asyncio.shield(pending)
+        future = asyncio.ensure_future(self._extract(html))
+        self._inflight[key] = future
+        try:
+            text = await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+        self.counts["extracted"] += 1
+        self._cache[key] = text
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text
+
+    async def _extract(self, html: str) -> str:
+        loop = asyncio.get_running_loop()
+        min_quality = settings.HTML_FAST_MIN_QUALITY
+        try:
+            return await loop.run_in_executor(self._executor(), html_to_text, html, min_quality)
+        except BrokenProcessPool:
+            logger.warning("HTML extraction pool died; restarting it")
+            self._pool = None
+            return await loop.run_in_executor(self._executor(), html_to_text, html, min_quality)
+
+    def close(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+_extractor: Optional[HTMLExtractor] = None
+
+
+def get_html_extractor() -> HTMLExtractor:
+    """Process-wide extractor; worker processes start on the first page."""
+    global _extractor
+    if _extractor is None:
+        _extractor = HTMLExtractor()
+    return _extractor
+
+
+def close_html_extractor() -> None:
+    global _extractor
+    extractor, _extractor = _extractor, None
+    if extractor is not None:
+        extractor.close()
@@ -0,0 +1,491 @@
+"""On-disk HTTP cache with conditional revalidation, shared by every fetch path.
+
+Layout under `INDEX_DIR/http_cache/`:
+  index.sqlite   one row per URL (validators, body hash, freshness, last use),
+                 text derived from bodies, and hit/miss counters
+  bodies/xx/<sha256>   response bodies, content-addressed
+
+A lookup with a stored entry is either served without any request (while
+`Cache-Control: max-age` says it is fresh) or revalidated with
+`If-None-Match` / `If-Modified-Since`; a 304 is answered from disk. Text
+extracted from a body (trafilatura, pdftotext) is stored against the body
+hash, so an unchanged page is never re-extracted either. The least recently
+used entries are evicted once the bodies exceed `HTTP_CACHE_MAX_BYTES`,
+checked after every `EVICT_FRACTION` of it stored rather than on each store.
+
+The index and the body files are only touched from worker threads
+(`asyncio.to_thread`), never on the event loop that runs the fetches.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+
+from radar.config import settings
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ("fresh", "revalidated", "unchanged", "changed", "miss", "uncacheable")
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)")
+EVICT_FRACTION = 0.05  # of max_bytes stored between eviction checks
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    content_type TEXT,
+    encoding TEXT,
+    expires REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS derived (
+    body_hash TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (body_hash, kind)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class CachedResponse:
+    """The parts of a response the fetch paths use, whether from disk or network."""
+
+    url: str
+    status_code: int
+    content: bytes
+    content_type: str = ""
+    encoding: Optional[str] = None
+    body_hash: str = ""
+    outcome: str = "miss"  # one of OUTCOMES
+    path: Optional[str] = None  # the cached body file, for `spool=True` reads
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    @property
+    def from_cache(self) -> bool:
+        """True when no body was downloaded."""
+        return self.outcome in ("fresh", "revalidated")
+
+    def json(self):
+        import json
+
+        return json.loads(self.content)
+
+
+class ResponseTooLarge(httpx.HTTPError):
+    """The body exceeded the caller's size limit; the download was abandoned."""
+
+
+def check_declared_size(response: httpx.Response, limit: Optional[int]) -> None:
+    """Refuse a body whose Content-Length is already over `limit`."""
+    declared = response.headers.get("content-length", "")
+    if limit and declared.isdigit() and int(declared) > limit:
+        raise ResponseTooLarge(f"{response.url}: {declared} bytes exceeds {limit}")
+
+
+async def iter_limited(
+    response: httpx.Response, limit: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """Body chunks of a streamed response, giving up once it passes `limit` bytes."""
+    check_declared_size(response, limit)
+    size = 0
+    async for chunk in response.aiter_bytes():
+        size += len(chunk)
+        if limit and size > limit:
+            raise ResponseTooLarge(f"{response.url}: body exceeds {limit} bytes")
+        yield chunk
+
+
+async def read_limited(response: httpx.Response, limit: Optional[int] = None) -> bytes:
+    """Read a streamed response body, giving up once it passes `limit` bytes."""
+    return b"".join([chunk async for chunk in iter_limited(response, limit)])
+
+
+@dataclass
+class _Body:
+    """A downloaded body, held in memory or spooled to a file in the cache."""
+
+    content: bytes = b""
+    tmp: Optional[str] = None
+    digest: str = ""
+    size: int = 0
+
+
+def body_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _cache_control(headers: httpx.Headers) -> str:
+    return headers.get("cache-control", "").lower()
+
+
+def _freshness(headers: httpx.Headers) -> float:
+    """Seconds the response may be served without revalidation."""
+    control = _cache_control(headers)
+    if "no-cache" in control or "must-revalidate" in control:
+        return 0.0
+    match = _MAX_AGE_RE.search(control)
+    return float(match.group(1)) if match else 0.0
+
+
+class HTTPCache:
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.root = root or os.path.join(settings.INDEX_DIR, "http_cache")
+        self.max_bytes = max_bytes or settings.HTTP_CACHE_MAX_BYTES
+        os.makedirs(os.path.join(self.root, "bodies"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(self.root, "index.sqlite"), check_same_thread=False
+        )
+        self._db.executescript(_SCHEMA)
+        self._unchecked = self.max_bytes  # bytes stored since the last eviction check
+
+    # -- requests -----------------------------------------------------------
+
+    async def get(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        limit: Optional[int] = None,
+        spool: bool = False,
+        **kwargs,
+    ) -> CachedResponse:
+        """GET `url` through the cache; bodies over `limit` bytes raise `ResponseTooLarge`.
+
+        With `spool=True` a cacheable body is streamed straight to its cache
+        file and never held in memory: the response carries `path` and an
+        empty `content`.
+        """
+        entry = await asyncio.to_thread(self._entry, url)
+        if entry is not None and entry["expires"] > time.time():
+            return await asyncio.to_thread(self._serve, url, entry, "fresh", load=not spool)
+        headers = self._conditional(entry)
+        async with client.stream("GET", url, headers=headers, **kwargs) as response:
+            if spool and response.status_code == 200:
+                body = await self._spool(response, limit)
+            else:
+                content = await read_limited(response, limit)
+                body = _Body(content, digest=body_hash(content), size=len(content))
+        result = await asyncio.to_thread(self._complete, url, entry, response, body, spool)
+        if result.outcome != "uncacheable":
+            self._unchecked += body.size
+            if self._unchecked >= self.max_bytes * EVICT_FRACTION:
+                self._unchecked = 0
+                await asyncio.to_thread(self._evict)
+        return result
+
+    async def _spool(self, response: httpx.Response, limit: Optional[int]) -> _Body:
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=tmp_dir)
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in iter_limited(response, limit):
+                    hasher.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        return _Body(tmp=tmp, digest=hasher.hexdigest(), size=size)
+
+    @staticmethod
+    def _conditional(entry: Optional[dict]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _complete(
+        self,
+        url: str,
+        entry: Optional[dict],
+        response: httpx.Response,
+        body: _Body,
+        spool: bool = False,
+    ) -> CachedResponse:
+        if response.status_code == 304 and entry is not None:
+            expires = time.time() + _freshness(response.headers)
+            served = self._serve(url, entry, "revalidated", expires, load=not spool)
+            if served.status_code == 304:  # body file lost; the next fetch downloads it again
+                self._drop(url)
+            else:
+                return served
+        result = CachedResponse(
+            url=url,
+            status_code=response.status_code,
+            content=body.content,
+            content_type=response.headers.get("content-type", ""),
+            encoding=response.encoding,
+            body_hash=body.digest,
+        )
+        if not self._storable(response, body.size):
+            result.outcome = "uncacheable"
+            result.body_hash = ""  # nothing is kept, so nothing may be derived from it
+            if body.tmp is not None:
+                with open(body.tmp, "rb") as f:
+                    result.content = f.read()
+                os.remove(body.tmp)
+        elif entry is None:
+            result.outcome = "miss"
+        else:
+            result.outcome = "unchanged" if entry["body_hash"] == body.digest else "changed"
+        with self._lock:
+            if result.outcome != "uncacheable":
+                self._store(url, response, result, body)
+                if spool:
+                    result.path = self._body_path(body.digest)
+            if result.outcome == "changed":
+                self._release([entry["body_hash"]])
+            self._count(result.outcome)
+            self._db.commit()
+        return result
+
+    @staticmethod
+    def _storable(response: httpx.Response, size: int) -> bool:
+        control = _cache_control(response.headers)
+        return response.status_code == 200 and "no-store" not in control and size > 0
+
+    # -- storage ------------------------------------------------------------
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.root, "bodies", digest[:2], digest)
+
+    def _entry(self, url: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, body_hash, size, content_type, encoding,"
+                " expires FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("etag", "last_modified", "body_hash", "size", "content_type", "encoding", "expires")
+        return dict(zip(keys, row))
+
+    def _serve(
+        self,
+        url: str,
+        entry: dict,
+        outcome: str,
+        expires: Optional[float] = None,
+        load: bool = True,
+    ) -> CachedResponse:
+        path = self._body_path(entry["body_hash"])
+        content = b""
+        try:
+            if load:
+                with open(path, "rb") as f:
+                    content = f.read()
+            elif not os.path.exists(path):
+                raise FileNotFoundError(path)
+        except OSError:
+            logger.warning(f"HTTP cache body missing for {url}")
+            return CachedResponse(url=url, status_code=304, content=b"")
+        with self._lock:
+            if expires is None:
+                self._db.execute(
+                    "UPDATE entries SET last_used = ? WHERE url = ?", (time.time(), url)
+                )
+            else:
+                self._db.execute(
+                    "UPDATE entries SET last_used = ?, expires = ? WHERE url = ?",
+                    (time.time(), expires, url),
+                )
+            self._count(outcome, entry["size"])
+            self._db.commit()
+        return CachedResponse(
+            url=url,
+            status_code=200,
+            content=content,
+            content_type=entry["content_type"] or "",
+            encoding=entry["encoding"],
+            body_hash=entry["body_hash"],
+            outcome=outcome,
+            path=None if load else path,
+        )
+
+    def _store(
+        self, url: str, response: httpx.Response, result: CachedResponse, body: _Body
+    ) -> None:
+        path = self._body_path(body.digest)
+        if os.path.exists(path):
+            if body.tmp is not None:
+                os.remove(body.tmp)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if body.tmp is None:
+                tmp = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(body.content)
+            else:
+                tmp = body.tmp
+            os.replace(tmp, path)
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                url,
+                response.headers.get("etag"),
+                response.headers.get("last-modified"),
+                body.digest,
+                body.size,
+                result.content_type,
+                result.encoding,
+                now + _freshness(response.headers),
+                now,
+            ),
+        )
+
+    def _count(self, name: str, saved: int = 0, n: int = 1) -> None:
+        rows = [(name, n)]
+        if saved:
+            rows.append(("bytes_saved", saved))
+        self._db.executemany(
+            "INSERT INTO counters VALUES (?, ?)"
+            " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            rows,
+        )
+
+    def _drop(self, url: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._db.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the bodies fit in `max_bytes`."""
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            orphans, evicted = set(), 0
+            while total > self.max_bytes:
+                oldest = self._db.execute(
+                    "SELECT url, body_hash, size FROM entries ORDER BY last_used LIMIT 256"
+                ).fetchall()
+                if not oldest:
+                    break
+                for url, digest, size in oldest:
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                    orphans.add(digest)
+                    total -= size
+                    evicted += 1
+            self._release(orphans)
+            self._count("evicted", n=evicted)
+            self._db.commit()
+
+    def _release(self, digests) -> None:
+        """Delete bodies (and their derived text) no entry points at any more."""
+        for digest in digests:
+            still_used = self._db.execute(
+                "SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (digest,)
+            ).fetchone()
+            if still_used:
+                continue
+            self._db.execute("DELETE FROM derived WHERE body_hash = ?", (digest,))
+            try:
+                os.remove(self._body_path(digest))
+            except OSError:
+                pass
+
+    # -- derived text -------------------------------------------------------
+
+    def derived(self, digest: str, kind: str) -> Optional[str]:
+        """Text previously extracted (by `kind`) from the body with hash `digest`."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text FROM derived WHERE body_hash = ? AND kind = ?", (digest, kind)
+            ).fetchone()
+        return row[0] if row else None
+
+    def store_derived(self, digest: str, kind: str, text: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO derived VALUES (?, ?, ?)", (digest, kind, text)
+            )
+            self._db.commit()
+
+    # -- maintenance --------------------------------------------------------
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            counters = dict(self._db.execute("SELECT name, value FROM counters"))
+        result: Dict[str, float] = {name: counters.get(name, 0) for name in OUTCOMES}
+        lookups = sum(result.values())
+        hits = result["fresh"] + result["revalidated"]
+        result.update(
+            entries=entries,
+            bytes=size,
+            bytes_saved=counters.get("bytes_saved", 0),
+            evicted=counters.get("evicted", 0),
+            lookups=lookups,
+            hit_rate=hits / lookups if lookups else 0.0,
+        )
+        return result
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            for table in ("entries", "derived", "counters"):
+                self._db.execute(f"DELETE FROM {table}")
+            self._db.commit()
+        bodies = os.path.join(self.root, "bodies")
+        for dirpath, _, files in os.walk(bodies):
+            for name in files:
+                os.remove(os.path.join(dirpath, name))
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_cache: Optional[HTTPCache] = None
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """Process-wide cache, or None when `HTTP_CACHE_ENABLED` is off."""
+    global _cache
+    if not settings.HTTP_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = HTTPCache()
+    return _cache
+
+
+def close_http_cache() -> None:
+    global _cache
+    cache, _cache = _cache, None
+    if cache is not None:
+        cache.close()
@@ -1,305 +1,318 @@
+import hashlib
 import json
 import logging
 import subprocess
 import asyncio
 import re
+import time
+import uuid
 from datetime import datetime
-from typing import List, Tuple, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional
 import httpx
-import trafilatura
+import numpy as np
 
-from radar.db.models import Signal
+from radar.db.models import Signal, with_body
 from radar.core.models import KnowledgeGraphExtraction, TacticalSnapshot
+from radar.core.ann import get_ann_index
+from radar.core.bm25_index import get_bm25_index
+from radar.core.browser import BrowserPool, get_browser_pool
+from radar.core.extract import extract_stats
+from radar.core.fetch import AdaptiveFetcher, cached_get
+from radar.core.frontier import URLFrontier
+from radar.core.htmltext import get_html_extractor, html_to_text
+from radar.core.http_cache import get_http_cache
+from radar.core.hashing import HashingVectorizer
+from radar.core.passages import Passage, split_passages, summarizer_context
+from radar.core.pdf import fetch_pdf_text
+from radar.core.search import SearchHit, reciprocal_rank_fusion
+from radar.core.vector_store import get_vector_store
+from radar.db import fts
+from radar.db.corpus import linked_duplicates
 from radar.db.engine import async_session
 from radar.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Missing model package, failed model download, or a vector store built with
+# another backend's dimension: degrade to lexical search instead of failing.
+EMBEDDING_ERRORS = (ImportError, OSError, ValueError)
+
 
 class IntelligenceAgent:
     def __init__(self, intel: Optional["IntelligenceAgent"] = None):
-        self.embed_bin = settings.TOOL_EMBED
         self.extract_bin = settings.TOOL_EXTRACT
         self.summarize_bin = settings.TOOL_SUMMARIZE
-        self.fetch_bin = settings.TOOL_FETCH
         self.embedding_model = None
+        self.embeddings_unavailable = False
 
-    async def get_embedding(self, text: str) -> List[float]:
-        """Return dummy vector for legacy schema compatibility."""
-        return [0.0] * 384
+    def _load_embedding_model(self):
+        if self.embedding_model is None:
+            if settings.EMBEDDING_BACKEND == "hashing":
+                self.embedding_model = HashingVectorizer(
+                    n_features=settings.HASHING_DIM, mode=settings.HASHING_MODE
+                )
+            else:
+                from sentence_transformers import SentenceTransformer
 
-    def extract_stats(self, text: str) -> List[dict]:
-        """High-fidelity tactical OSINT/SIGINT numerical extraction engine with positional context."""
-        import re
+                self.embedding_model = SentenceTransformer(
+                    settings.EMBEDDING_MODEL_NAME, device="cpu"
+                )
+        return self.embedding_model
+
+    @property
+    def embedding_name(self) -> str:
+        """Identifier recorded in the vector store so mismatched rebuilds are caught."""
+        if settings.EMBEDDING_BACKEND == "hashing":
+            return f"hashing-{settings.HASHING_MODE}-{settings.HASHING_DIM}"
+        return settings.EMBEDDING_MODEL_NAME
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Encode a batch of texts into L2-normalized float32 rows (blocking)."""
+        model = self._load_embedding_model()
+        if isinstance(model, HashingVectorizer):
+            return model.transform(texts)
+        vectors = model.encode(
+            texts,
+            batch_size=settings.EMBED_BATCH_SIZE,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
 
-        stats = []
+    def _disable_embeddings(self, error: Exception) -> None:
+        """Fall back to lexical-only search for the rest of this process."""
+        logger.warning(f"Embeddings disabled: {error}")
+        self.embeddings_unavailable = True
 
-        def get_subject(match_pos, full_text):
-            """Heuristic to find the subject/noun phrase immediately before a specific match position."""
-            pre = (
-                full_text[max(0, match_pos - 80) : match_pos].replace("\n", " ").strip()
-            )
-            parts = re.split(r"[,.;:]", pre)
-            chunk = parts[-1].strip()
-            chunk = re.sub(
-                r"^(the|a|an|of|to|for|is|are|was|were|has|been|which|that|this|these)\s+",
-                "",
-                chunk,
-                flags=re.IGNORECASE,
-            )
-            chunk = re.sub(
-                r"\s+(rose|fell|dropped|increased|decreased|at|of|to|is|with|by|around|nearly|about)$",
-                "",
-                chunk,
-                flags=re.IGNORECASE,
-            )
-            words = chunk.split()
-            if len(words) > 5:
-                chunk = " ".join(words[-5:])
-            return chunk.title() if len(chunk) > 3 else None
-
-        def get_context(match_pos, match_len, full_text, window=80):
-            start = max(0, match_pos - window)
-            end = min(len(full_text), match_pos + match_len + window)
-            return full_text[start:end].replace("\n", " ").strip()
-
-        # 1. SPECIALIZED SIGINT
-        for m in re.finditer(r"(-\d+\.?\d*)\s*dBm", text, re.IGNORECASE):
-            val = m.group(1)
-            subject = get_subject(m.start(), text)
-            stats.append(
-                {
-                    "label": subject if subject else "Noise Floor/RSSI",
-                    "value": float(val),
-                    "unit": "dBm",
-                    "description": get_context(m.start(), len(m.group(0)), text),
-                }
+    async def get_embedding(self, text: str) -> List[float]:
+        """Dense embedding of a single text using the configured backend."""
+        vectors = await asyncio.to_thread(self.embed_batch, [text])
+        return vectors[0].tolist()
+
+    async def embed_signals(self, signals: List[Signal]) -> int:
+        """Embed signals and append them to the memory-mapped vector store."""
+        if not settings.EMBEDDINGS_ENABLED or self.embeddings_unavailable or not signals:
+            return 0
+        texts = [f"{s.title}\n{s.content}" for s in signals]
+        try:
+            vectors = await asyncio.to_thread(self.embed_batch, texts)
+            get_vector_store().append(
+                [s.id.hex for s in signals], vectors, model=self.embedding_name
             )
+        except EMBEDDING_ERRORS as e:
+            self._disable_embeddings(e)
+            return 0
+        await asyncio.to_thread(get_ann_index().add_new_rows)
+        return len(signals)
 
-        for m in re.finditer(
-            r"(\d+\.?\d*)\s*(kHz|MHz|GHz)\s*(?:bandwidth|BW|channel spacing)",
-            text,
-            re.IGNORECASE,
-        ):
-            val, unit = m.group(1), m.group(2)
-            subject = get_subject(m.start(), text)
-            stats.append(
-                {
-                    "label": subject if subject else "Signal BW",
-                    "value": float(val),
-                    "unit": unit,
-                    "description": get_context(m.start(), len(m.group(0)), text),
-                }
+    def extract_stats(self, text: str) -> List[dict]:
+        """High-fidelity tactical OSINT/SIGINT numerical extraction engine with positional context."""
+        return extract_stats(text)
+
+    async def search_signals(
+        self, query: str, limit: int = 5, mode: str = "bm25"
+    ) -> List[Signal]:
+        """Relevance-ranked signal search (see `search_hits` for scores and snippets)."""
+        return [h.signal for h in await self.search_hits(query, limit, mode)]
+
+    async def search_hits(
+        self,
+        query: str,
+        limit: int = 5,
+        mode: str = "bm25",
+        timings: Optional[Dict[str, float]] = None,
+        body: bool = True,
+    ) -> List[SearchHit]:
+        """Search the corpus.
+
+        `bm25` queries the persistent bm25s index (falling back to `fts` while it is empty),
+        `fts` the SQLite FTS5 index, `vector` an exact scan of the dense embedding
+        store, `ann` the IVF approximate index over it, `hybrid` runs the lexical
+        and ANN rankers concurrently and fuses them by reciprocal rank, and
+        `keyword` the legacy ILIKE scan. Per-stage milliseconds are written to
+        `timings` when given; `body=False` skips loading signal bodies.
+        """
+        timings = {} if timings is None else timings
+        started = time.perf_counter()
+        snippets: Dict[str, str] = {}
+        if mode == "hybrid":
+            depth = max(limit, settings.HYBRID_DEPTH)
+            (lexical, snippets), vector = await asyncio.gather(
+                self._timed(timings, "lexical_ms", self._lexical_rank(query, depth)),
+                self._timed(timings, "vector_ms", self._vector_rank(query, depth, "ann")),
             )
-
-        for m in re.finditer(
-            r"(\d+)-bit\s*(?:AES|DES|encryption|key)", text, re.IGNORECASE
-        ):
-            val = m.group(1)
-            subject = get_subject(m.start(), text)
-            stats.append(
-                {
-                    "label": subject if subject else "Encryption Depth",
-                    "value": float(val),
-                    "unit": "bit",
-                    "description": get_context(m.start(), len(m.group(0)), text),
-                }
+            t0 = time.perf_counter()
+            ranked = reciprocal_rank_fusion([lexical, vector], k=settings.RRF_K)[:limit]
+            timings["fusion_ms"] = (time.perf_counter() - t0) * 1000
+        elif mode in ("bm25", "fts"):
+            ranked, snippets = await self._timed(
+                timings, "lexical_ms", self._lexical_rank(query, limit, mode)
             )
-
-        # 2. TACTICAL OSINT
-        tactical_patterns = [
-            (
-                r"(\d+,?\d*)\s*(?:troops|personnel|soldiers|combatants)",
-                "Troop Count",
-                "Units",
-            ),
-            (
-                r"(\d+,?\d*)\s*(?:casualties|killed|wounded|fatalities)",
-                "Casualty Count",
-                "Units",
-            ),
-            (
-                r"(\d+,?\d*)\s*(?:drones|UAVs|quadcopters|fixed-wing)",
-                "Drone Density",
-                "Units",
-            ),
-            (
-                r"(\d+,?\d*)\s*(?:cameras|LPRs|ALPRs|surveillance nodes)",
-                "Sensor Density",
-                "Units",
-            ),
-            (
-                r"(\d+,?\d*)\s*(?:arrests|detained|apprehensions)",
-                "Enforcement Count",
-                "Units",
-            ),
-            (
-                r"(\d+\.?\d*)\s*(?:mi|km|miles|kilometers)\s*(?:radius|distance|range)",
-                "Tactical Range",
-                "Dist",
-            ),
-        ]
-        for pattern, default_label, unit in tactical_patterns:
-            for m in re.finditer(pattern, text, re.IGNORECASE):
-                val = m.group(1)
-                subject = get_subject(m.start(), text)
-                try:
-                    stats.append(
-                        {
-                            "label": subject if subject else default_label,
-                            "value": float(val.replace(",", "")),
-                            "unit": unit,
-                            "description": get_context(
-                                m.start(), len(m.group(0)), text
-                            ),
-                        }
-                    )
-                except ValueError:
-                    continue
-
-        # 3. FINANCIAL OSINT
-        for m in re.finditer(
-            r"\$(\d+\.?\d*)\s*([MBK]|Million|Billion)", text, re.IGNORECASE
-        ):
-            val, scale = m.group(1), m.group(2)
-            subject = get_subject(m.start(), text)
-            try:
-                f_val = float(val)
-                s = scale.upper()
-                if s.startswith("B") or s == "BILLION":
-                    f_val *= 1_000_000_000
-                elif s.startswith("M") or s == "MILLION":
-                    f_val *= 1_000_000
-                elif s.startswith("K"):
-                    f_val *= 1_000
-                stats.append(
-                    {
-                        "label": subject if subject else "Strategic Value",
-                        "value": f_val,
-                        "unit": "USD",
-                        "description": get_context(m.start(), len(m.group(0)), text),
-                    }
-                )
-            except ValueError:
-                continue
-
-        # 4. Standard Heuristics
-        for m in re.finditer(
-            r"(?:Gas|Fuel|Gasoline):\s*\$([0-9,]+\.?\d*)", text, re.IGNORECASE
-        ):
-            val = m.group(1)
-            stats.append(
-                {
-                    "label": "Gas Price",
-                    "value": float(val.replace(",", "")),
-                    "unit": "USD",
-                    "description": get_context(m.start(), len(m.group(0)), text),
-                }
+        elif mode in ("vector", "ann"):
+            ranked = await self._timed(
+                timings, "vector_ms", self._vector_rank(query, limit, mode)
             )
+        else:
+            async with async_session() as session:
+                hits = await self._keyword_search(session, query, limit)
+            timings["total_ms"] = (time.perf_counter() - started) * 1000
+            return hits
 
-        for m in re.finditer(r"\$([0-9,]+\.?\d*)", text):
-            val = m.group(1)
-            subject = get_subject(m.start(), text)
-            try:
-                f_val = float(val.replace(",", ""))
-                if not any(s["value"] == f_val and s["unit"] == "USD" for s in stats):
-                    stats.append(
-                        {
-                            "label": subject if subject else "Price/Value",
-                            "value": f_val,
-                            "unit": "USD",
-                            "description": get_context(
-                                m.start(), len(m.group(0)), text
-                            ),
-                        }
+        t0 = time.perf_counter()
+        async with async_session() as session:
+            hits = await self._hydrate(session, ranked, body)
+        for hit in hits:
+            hit.snippet = snippets.get(hit.signal.id.hex)
+        timings["hydrate_ms"] = (time.perf_counter() - t0) * 1000
+        timings["total_ms"] = (time.perf_counter() - started) * 1000
+        return hits
+
+    async def search_passages(
+        self, query: str, hits: List[SearchHit], limit: Optional[int] = None
+    ) -> List[Passage]:
+        """Best passages of the retrieved signals, for answering instead of whole bodies.
+
+        Signals that matched only through the vector ranker have no lexical
+        passage hit; they contribute their opening passage so no source is lost.
+        """
+        limit = limit or settings.ASK_PASSAGES
+        signals = {h.signal.id.hex: h.signal for h in hits}
+        if not signals:
+            return []
+        async with async_session() as session:
+            passages = await fts.search_passages(session, query, list(signals), limit)
+            await session.commit()
+        covered = {p.signal_id for p in passages}
+        for sid, signal in signals.items():
+            if len(passages) >= limit:
+                break
+            if sid not in covered:
+                spans = split_passages(signal.content, settings.PASSAGE_CHARS)
+                if spans:
+                    a, b = spans[0]
+                    passages.append(
+                        Passage(signal_id=sid, ordinal=0, start=a, end=b, text=signal.content[a:b])
                     )
-            except ValueError:
-                continue
+        for p in passages:
+            p.title = signals[p.signal_id].title
+        return passages
 
-        for m in re.finditer(r"(\d+\.?\d*)%", text):
-            val = m.group(1)
-            subject = get_subject(m.start(), text)
-            try:
-                stats.append(
-                    {
-                        "label": subject if subject else "Percentage",
-                        "value": float(val),
-                        "unit": "%",
-                        "description": get_context(m.start(), len(m.group(0)), text),
-                    }
-                )
-            except ValueError:
-                continue
-
-        unit_patterns = [
-            (r"(\d+,?\d*)\s*(?:acres|acre)", "Land Area", "Acres"),
-            (r"(\d+,?\d*)\s*(?:gallons|gal)", "Fuel Volume", "Gallons"),
-            (r"(\d+,?\d*)\s*(?:t/s|tokens/sec)", "Performance", "t/s"),
-            (r"(\d+,?\d*)\s*(?:beds|bed count)", "Medical Capacity", "Beds"),
-        ]
-        for pattern, default_label, unit in unit_patterns:
-            for m in re.finditer(pattern, text, re.IGNORECASE):
-                val = m.group(1)
-                subject = get_subject(m.start(), text)
-                try:
-                    stats.append(
-                        {
-                            "label": subject if subject else default_label,
-                            "value": float(val.replace(",", "")),
-                            "unit": unit,
-                            "description": get_context(
-                                m.start(), len(m.group(0)), text
-                            ),
-                        }
-                    )
-                except ValueError:
-                    continue
+    @staticmethod
+    async def _timed(timings: Dict[str, float], stage: str, coro):
+        t0 = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            timings[stage] = (time.perf_counter() - t0) * 1000
+
+    async def _lexical_rank(
+        self, query: str, limit: int, mode: str = "bm25"
+    ) -> Tuple[List[Tuple[str, float]], Dict[str, str]]:
+        """Ranked `(signal_id, score)` pairs plus FTS snippets (bm25 falls back to fts)."""
+        if mode == "bm25":
+            ranked = await asyncio.to_thread(get_bm25_index().search, query, limit)
+            if ranked:
+                return ranked, {}
+        async with async_session() as session:
+            if not await fts.ensure_fts(session):
+                return [], {}
+            await session.commit()
+            fts_hits = await fts.search_fts(session, query, limit)
+        return (
+            [(h.signal_id, h.score) for h in fts_hits],
+            {h.signal_id: h.snippet for h in fts_hits},
+        )
 
-        return stats
+    async def _vector_rank(
+        self, query: str, limit: int, mode: str = "vector"
+    ) -> List[Tuple[str, float]]:
+        """Ranked `(signal_id, cosine)` pairs; empty when embeddings are unavailable."""
+        store = get_vector_store()
+        if self.embeddings_unavailable or len(store) == 0:
+            return []
+        searcher = get_ann_index().search if mode == "ann" else store.search
+        try:
+            query_vec = await asyncio.to_thread(self.embed_batch, [query])
+            return await asyncio.to_thread(searcher, query_vec[0], limit)
+        except EMBEDDING_ERRORS as e:
+            self._disable_embeddings(e)
+            return []
+
+    async def _hydrate(
+        self, session, ranked: List[Tuple[str, float]], body: bool = True
+    ) -> List[SearchHit]:
+        """Load ranked `(signal_id, score)` pairs as hits, preserving rank order.
+
+        `body=False` leaves `Signal.content` deferred (title-only listings)."""
+        from sqlalchemy import select
+
+        if not ranked:
+            return []
+        ids = [uuid.UUID(sid) for sid, _ in ranked]
+        # The vector store keeps rows of signals later linked as near-duplicates.
+        stmt = select(Signal).where(
+            Signal.id.in_(ids), Signal.id.not_in(linked_duplicates())  # type: ignore
+        )
+        if body:
+            stmt = stmt.options(with_body())
+        rows = await session.execute(stmt)
+        by_id = {s.id.hex: s for s in rows.scalars().all()}
+        return [
+            SearchHit(signal=by_id[sid], score=score)
+            for sid, score in ranked
+            if sid in by_id
+        ]
 
-    async def search_signals(self, query: str, limit: int = 5) -> List[Signal]:
-        """Keyword-based relational search (SQLite friendly)."""
+    async def _keyword_search(self, session, query: str, limit: int) -> List[SearchHit]:
+        """Keyword-based relational search (full scan, date ordered)."""
         from sqlalchemy import select, or_
 
-        async with async_session() as session:
-            keywords = [k.strip() for k in query.split() if len(k.strip()) > 2]
-            if not keywords:
-                keywords = [query]
-
-            conditions = []
-            for kw in keywords:
-                conditions.append(
-                    or_(
-                        Signal.title.ilike(f"%{kw}%"),  # type: ignore
-                        Signal.content.ilike(f"%{kw}%"),  # type: ignore
-                    )
-                )
-
-            stmt = (
-                select(Signal)
-                .where(or_(*conditions))
-                .order_by(Signal.date.desc())  # type: ignore
-                .limit(limit)
-            )
+        keywords = [k.strip() for k in query.split() if len(k.strip()) > 2]
+        if not keywords:
+            keywords = [query]
+
+        # Chunk-stored bodies are not in signal.content, and the FTS index keeps
+        # no copy of them; match keywords as indexed words instead when it exists.
+        use_fts = await fts.ensure_fts(session)
+        if use_fts:
+            await session.commit()
+
+        conditions = []
+        for i, kw in enumerate(keywords):
+            body = Signal.content.ilike(f"%{kw}%")  # type: ignore
+            if use_fts:
+                body = or_(body, Signal.id.in_(fts.matching_ids(kw, f"kw{i}")))  # type: ignore
+            conditions.append(or_(Signal.title.ilike(f"%{kw}%"), body))  # type: ignore
+
+        stmt = (
+            select(Signal)
+            .options(with_body())
+            .where(or_(*conditions))
+            .order_by(Signal.date.desc())  # type: ignore
+            .limit(limit)
+        )
 
-            results = await session.execute(stmt)
-            return list(results.scalars().all())
+        results = await session.execute(stmt)
+        return [SearchHit(signal=s) for s in results.scalars().all()]
 
     def _clean_html(self, html: str) -> str:
-        """Use Trafilatura for high-precision content extraction."""
-        try:
-            result = trafilatura.extract(
-                html, include_comments=False, include_tables=True, no_fallback=False
-            )
-            return result if result else ""
-        except Exception:
-            return ""
+        """Use Trafilatura for high-precision content extraction (inline)."""
+        return html_to_text(html)
+
+    async def clean_html(self, html: str) -> str:
+        """`_clean_html` on the shared extraction process pool, memoized by HTML hash."""
+        return await get_html_extractor()(html)
 
     async def chat(
-        self, question: str, context_signals: List[Signal], history: List[dict] = []
+        self,
+        question: str,
+        context_signals: List[Signal],
+        history: List[dict] = [],
+        passages: Optional[List[Passage]] = None,
     ) -> str:
         """Lightweight chat passthrough."""
-        return await self.answer_question(question, context_signals)
+        return await self.answer_question(question, context_signals, passages)
 
     def _run_tool(self, tool: str, text: str) -> str:
         try:
@@ -316,39 +329,28 @@ class IntelligenceAgent:
             )
             return ""
 
-    def _fetch_url(self, url: str) -> str:
+    async def _fetch_url(self, url: str) -> str:
+        """Readable text of `url` (HTML or PDF), downloaded with the shared
+        pooled client and revalidated through the HTTP cache."""
+        if url.lower().endswith(".pdf"):
+            return await fetch_pdf_text(url)
         try:
-            is_pdf = url.lower().endswith(".pdf")
-            result = subprocess.run(
-                [self.fetch_bin, url], capture_output=True, check=True
-            )
-            if is_pdf:
-                import os
-                import tempfile
-
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                    tmp.write(result.stdout)
-                    tmp_path = tmp.name
-                try:
-                    pdf_result = subprocess.run(
-                        ["pdftotext", "-layout", tmp_path, "-"],
-                        capture_output=True,
-                        text=True,
-                        check=True,
-                    )
-                    return pdf_result.stdout.strip()
-                except Exception as pdf_e:
-                    logger.error(f"PDF extraction failed for {url}: {pdf_e}")
-                    return ""
-                finally:
-                    if os.path.exists(tmp_path):
-                        os.remove(tmp_path)
-            return result.stdout.decode("utf-8", errors="ignore").strip()
-        except subprocess.CalledProcessError as e:
-            logger.error(
-                f"Error fetching {url}: {e.stderr.decode('utf-8', errors='ignore')}"
-            )
+            response = await cached_get(url)
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching {url}: {e}")
+            return ""
+        if response.status_code >= 400:
+            logger.error(f"Error fetching {url}: HTTP {response.status_code}")
             return ""
+        cache = get_http_cache()
+        text = None
+        if cache is not None and response.body_hash:
+            text = await asyncio.to_thread(cache.derived, response.body_hash, "clean_html")
+        if text is None:
+            text = await self.clean_html(response.text)
+            if text and cache is not None and response.body_hash:
+                await asyncio.to_thread(cache.store_derived, response.body_hash, "clean_html", text)
+        return text
 
     async def parse(self, text: str) -> Tuple[Signal, KnowledgeGraphExtraction]:
         signal = Signal(
@@ -360,13 +362,21 @@ class IntelligenceAgent:
         return signal, KnowledgeGraphExtraction(entities=[], connections=[], trends=[])
 
     async def answer_question(
-        self, question: str, context_signals: List[Signal]
+        self,
+        question: str,
+        context_signals: List[Signal],
+        passages: Optional[List[Passage]] = None,
     ) -> str:
-        context_text = "\n\n".join(
-            [f"--- Signal: {s.title} ---\n{s.content}" for s in context_signals]
-        )
+        if passages:
+            context_text = summarizer_context(passages)
+        else:
+            context_text = "\n\n".join(
+                [f"--- Signal: {s.title} ---\n{s.content}" for s in context_signals]
+            )
+        # Context starts on its own line: the tool skips any line containing
+        # "Context: ", which would swallow the first header.
         return self._run_tool(
-            self.summarize_bin, f"Question: {question}\nContext: {context_text}"
+            self.summarize_bin, f"Question: {question}\nContext:\n{context_text}"
         )
 
     async def generate_briefing(self, context: dict) -> str:
@@ -388,63 +398,133 @@ class IntelligenceAgent:
         return anomalies
 
 
-class DeepResearchAgent:
-    def __init__(self, intel: Optional[IntelligenceAgent] = None):
-        self.intel = intel or IntelligenceAgent()
+@dataclass
+class ResearchResult:
+    """Text of one research run plus what happened to its search results."""
 
-    async def research(self, topic: str) -> str:
-        from playwright.async_api import async_playwright
-        import asyncio
+    text: str
+    urls: int = 0  # search results
+    fetched: int = 0  # pages that produced text
+    seen: int = 0  # fetched, but ingested unchanged by an earlier sweep
+    digest: str = ""  # over every fetched (url, text), seen ones included
+    error: str = ""  # why the last unfetched result failed, "<url>: <reason>"
+
+    @property
+    def sources(self) -> int:
+        return self.fetched - self.seen
+
+
+def _search_urls(topic: str) -> List[str]:
+    from ddgs import DDGS
 
+    with DDGS() as ddgs:
+        return [r["href"] for r in ddgs.text(topic, max_results=5)]
+
+
+class DeepResearchAgent:
+    def __init__(
+        self,
+        intel: Optional[IntelligenceAgent] = None,
+        browser_pool: Optional[BrowserPool] = None,
+        fetcher: Optional[AdaptiveFetcher] = None,
+        frontier: Optional[URLFrontier] = None,
+    ):
+        self.intel = intel or IntelligenceAgent()
+        self.browser_pool = browser_pool
+        self.fetcher = fetcher or AdaptiveFetcher(self.intel.clean_html)
+        self.frontier = frontier or URLFrontier()
+
+    async def research(self, topic: str) -> ResearchResult:
+        """Search `topic` and fetch the top results concurrently.
+
+        At most `RESEARCH_CONCURRENCY` pages load at once and the whole topic
+        gets `RESEARCH_DEADLINE` seconds; sources that are not done by then are
+        dropped. Sources are assembled in search-rank order. Searches and
+        page fetches go through `self.frontier`, so topics of one sweep share
+        them, and sources already ingested unchanged by an earlier sweep are
+        left out; call `self.frontier.commit(topic)` once the text is stored.
+        The counts in the result tell "nothing new" (every page `seen`) apart
+        from "nothing fetched" (an outage); `digest` covers what was fetched,
+        so it only changes when the sources do.
+        """
         combined_text = f"🎯 {topic}\n"
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            try:
+        urls = await self.frontier.search(topic, _search_urls)
+        result = ResearchResult(text="", urls=len(urls))
+        sem = asyncio.Semaphore(settings.RESEARCH_CONCURRENCY)
+
+        async def fetch(url: str) -> Optional[str]:
+            async with sem:
+                return await self.frontier.fetch(url, self._fetch_source)
+
+        tasks = [asyncio.create_task(fetch(url)) for url in urls]
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=settings.RESEARCH_DEADLINE)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            fetched: Dict[str, str] = {}
+            for url, task in zip(urls, tasks):
+                if task not in done:
+                    result.error = f"{url}: not done in {settings.RESEARCH_DEADLINE:g}s"
+                elif task.exception():
+                    result.error = f"{url}: {task.exception()!r}"
+                elif not task.result():
+                    result.error = f"{url}: no text"
+                else:
+                    text = task.result()
+                    fetched[url] = text
+                    result.fetched += 1
+                    if self.frontier.accept(topic, url, text):
+                        combined_text += f"\n--- Source: {url} ---\n{text[:5000]}"
+                    else:
+                        result.seen += 1
+            h = hashlib.sha256()
+            for url in sorted(fetched):
+                h.update(f"{url}\0{fetched[url]}\0".encode("utf-8", errors="ignore"))
+            result.digest = h.hexdigest()
+        result.text = combined_text
+        return result
+
+    async def _fetch_source(self, url: str) -> Optional[str]:
+        if url.lower().endswith(".pdf"):
+            return await self.intel._fetch_url(url)
+
+        async def render(url: str) -> Tuple[str, str]:
+            # A lease per render: the fetch may be shared by several topics
+            # and outlive the one that started it.
+            pool = self.browser_pool or get_browser_pool()
+            async with pool.lease() as browser:
                 page = await browser.new_page()
-                from ddgs import DDGS
+                try:
+                    await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                    await asyncio.sleep(3)
+                    html = await page.content()
+                    content = await self.intel.clean_html(html)
+                    if not content:
+                        content = await page.evaluate("() => document.body.innerText")
+                    return html, content
+                finally:
+                    await browser.release(page)
 
-                with DDGS() as ddgs:
-                    results = list(ddgs.text(topic, max_results=5))
-                    urls = [r["href"] for r in results]
-
-                for url in urls:
-                    try:
-                        if url.lower().endswith(".pdf"):
-                            content = self.intel._fetch_url(url)
-                        else:
-                            await page.goto(
-                                url, wait_until="domcontentloaded", timeout=30000
-                            )
-                            await asyncio.sleep(3)
-                            html = await page.content()
-                            content = self.intel._clean_html(html)
-                            if not content:
-                                content = await page.evaluate(
-                                    "() => document.body.innerText"
-                                )
-                        if content:
-                            combined_text += (
-                                f"\n--- Source: {url} ---\n{content[:5000]}"
-                            )
-                    except Exception:
-                        continue
-            finally:
-                await browser.close()
-        return combined_text
+        return await self.fetcher.fetch(url, render)
 
 
 class BrowserIngestAgent:
-    def __init__(self, intel: Optional[IntelligenceAgent] = None):
+    def __init__(
+        self,
+        intel: Optional[IntelligenceAgent] = None,
+        browser_pool: Optional[BrowserPool] = None,
+    ):
         self.intel = intel or IntelligenceAgent()
+        self.browser_pool = browser_pool
 
     async def extract(self, url: str, instructions: str) -> str:
-        from playwright.async_api import async_playwright
         import asyncio
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        pool = self.browser_pool or get_browser_pool()
+        async with pool.lease() as browser:
+            page = await browser.new_page()
             try:
-                page = await browser.new_page()
                 await page.goto(url, wait_until="networkidle", timeout=60000)
                 await asyncio.sleep(5)
 
@@ -478,12 +558,12 @@ class BrowserIngestAgent:
 
                 if not content:
                     html = await page.content()
-                    content = self.intel._clean_html(html)
+                    content = await self.intel.clean_html(html)
                     if not content:
                         content = await page.evaluate("() => document.body.innerText")
                 return content
             finally:
-                await browser.close()
+                await browser.release(page)
 
 
 class TextIngestAgent:
@@ -634,28 +714,27 @@ class USGSRiverGauge:
 
     async def get_levels(self) -> dict:
         url = f"https://waterservices.usgs.gov/nwis/iv/?format=json&sites={','.join(self.site_codes)}&parameterCd=00060,00065&siteStatus=all"
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.get(url, timeout=30)
-                if resp.status_code != 200:
-                    return {"text": f"Error: {resp.status_code}", "data": []}
-                data = resp.json()
-                res = []
-                structured = []
-                for ts in data.get("value", {}).get("timeSeries", []):
-                    name = ts["sourceInfo"]["siteName"]
-                    val_str = ts["values"][0]["value"][0]["value"]
-                    val = float(val_str)
-                    unit = (
-                        "ft"
-                        if "height" in ts["variable"]["variableName"].lower()
-                        else "cfs"
-                    )
-                    res.append(f"- {name}: {val} {unit}")
-                    structured.append({"name": name, "value": val, "unit": unit})
-                return {"text": "\n".join(sorted(list(set(res)))), "data": structured}
-            except Exception as e:
-                return {"text": f"USGS Error: {str(e)}", "data": []}
+        try:
+            resp = await cached_get(url, timeout=30)
+            if resp.status_code != 200:
+                return {"text": f"Error: {resp.status_code}", "data": []}
+            data = resp.json()
+            res = []
+            structured = []
+            for ts in data.get("value", {}).get("timeSeries", []):
+                name = ts["sourceInfo"]["siteName"]
+                val_str = ts["values"][0]["value"][0]["value"]
+                val = float(val_str)
+                unit = (
+                    "ft"
+                    if "height" in ts["variable"]["variableName"].lower()
+                    else "cfs"
+                )
+                res.append(f"- {name}: {val} {unit}")
+                structured.append({"name": name, "value": val, "unit": unit})
+            return {"text": "\n".join(sorted(list(set(res)))), "data": structured}
+        except Exception as e:
+            return {"text": f"USGS Error: {str(e)}", "data": []}
 
 
 class WidebandSDRScanner:
@@ -0,0 +1,70 @@
+import re
+import zlib
+from typing import List, Optional
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: candidate pairs start appearing around 0.7 similarity
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+
+_WORD_RE = re.compile(r"\w+")
+_MASK63 = (1 << 63) - 1
+
+# Fixed multiply-shift hash family so signatures stay comparable across runs.
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, 2**63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> np.ndarray:
+    """crc32 hashes of the distinct lowercase word `size`-grams of `text`."""
+    words = _WORD_RE.findall(text.lower())
+    grams = {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+    return np.fromiter(
+        (zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams)
+    )
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature (NUM_PERM uint32 values) of the text's word shingles.
+
+    None for text with fewer than SHINGLE_WORDS shingles: an empty or very
+    short text would estimate similarity 1.0 with every other one like it.
+    """
+    x = shingles(text)
+    if len(x) < SHINGLE_WORDS:
+        return None
+    sig = np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+    for start in range(0, len(x), 4096):  # bound the (shingles x perms) temporary
+        block = x[start : start + 4096]
+        h = ((block[:, None] * _A[None, :] + _B[None, :]) >> np.uint64(32)).astype(np.uint32)
+        np.minimum(sig, h.min(axis=0), out=sig)
+    return sig
+
+
+def band_keys(sig: np.ndarray) -> List[int]:
+    """One LSH bucket key per band; two signatures sharing any key are candidates.
+
+    The band number is folded into the key so a single indexed column holds all
+    bands. Keys fit in a signed 64-bit column.
+    """
+    rows = sig.reshape(BANDS, ROWS)
+    return [
+        ((band << 56) ^ zlib.crc32(rows[band].tobytes())) & _MASK63
+        for band in range(BANDS)
+    ]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.mean(a == b))
+
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    return sig.astype("<u4").tobytes()
+
+
+def from_bytes(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype="<u4").astype(np.uint32)
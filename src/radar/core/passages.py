@@ -0,0 +1,115 @@
+import math
+import re
+import textwrap
+from dataclasses import dataclass
+from typing import List, Tuple
+
+# Deep Research signals concatenate sources under these markers; a passage
+# never spans two sources.
+_SOURCE_RE = re.compile(r"^--- Source: .*$", re.MULTILINE)
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+# Lines radar_summarize would read as a title/source header instead of content.
+_MARKER_RE = re.compile(r"^[\s-]*(Title|Source):.*$", re.MULTILINE)
+_HEADER_RE = re.compile(r"[\s-]*(Title:|Source:|Question:|Target:|Autonomous Research)")
+
+# What radar_summarize prints: lines of up to 247 chars, at most 3 of them per
+# `Title:` header (15 under a SITREP title), skipping short digit-free lines.
+SUMMARIZE_LINE_CHARS = 240
+SUMMARIZE_LINES = 3
+SUMMARIZE_SITREP_LINES = 15
+
+
+@dataclass
+class Passage:
+    """A slice `content[start:end]` of a signal, as retrieved for answering."""
+
+    signal_id: str
+    ordinal: int
+    start: int
+    end: int
+    text: str
+    score: float = 0.0
+    title: str = ""
+
+
+def _pieces(text: str, start: int, end: int, max_chars: int) -> List[Tuple[int, int]]:
+    """Split `text[start:end]` into paragraph (or, for long paragraphs, sentence) spans."""
+    spans: List[Tuple[int, int]] = []
+    pos = start
+    for m in list(_PARAGRAPH_RE.finditer(text, start, end)) + [None]:
+        stop = m.start() if m else end
+        if stop - pos <= max_chars:
+            spans.append((pos, stop))
+        else:
+            cut, last = pos, None
+            for s in list(_SENTENCE_RE.finditer(text, pos, stop)) + [None]:
+                brk = s.start() if s else stop
+                if brk - cut > max_chars and last is not None:
+                    spans.append((cut, last.start()))  # close at the previous break
+                    cut, last = last.end(), None
+                if s and s.start() - cut <= max_chars:
+                    last = s
+            while stop - cut > max_chars:  # no sentence breaks: hard wrap
+                spans.append((cut, cut + max_chars))
+                cut += max_chars
+            spans.append((cut, stop))
+        pos = m.end() if m else end
+    return spans
+
+
+def split_passages(text: str, target_chars: int = 800) -> List[Tuple[int, int]]:
+    """Character offsets of passages covering `text`.
+
+    Sources are split into paragraphs, which are packed greedily up to
+    `target_chars`; an oversized paragraph is split at sentence boundaries.
+    Offsets index the original string, so `text[start:end]` is the passage.
+    """
+    bounds = [0] + [m.start() for m in _SOURCE_RE.finditer(text)] + [len(text)]
+    passages: List[Tuple[int, int]] = []
+    for sec_start, sec_end in zip(bounds, bounds[1:]):
+        cur_start = cur_end = None
+        for p_start, p_end in _pieces(text, sec_start, sec_end, target_chars):
+            # Trim surrounding whitespace so offsets point at real text.
+            while p_start < p_end and text[p_start].isspace():
+                p_start += 1
+            while p_end > p_start and text[p_end - 1].isspace():
+                p_end -= 1
+            if p_start == p_end:
+                continue
+            if cur_start is not None and p_end - cur_start <= target_chars:
+                cur_end = p_end
+                continue
+            if cur_start is not None:
+                passages.append((cur_start, cur_end))
+            cur_start, cur_end = p_start, p_end
+        if cur_start is not None:
+            passages.append((cur_start, cur_end))
+    return passages
+
+
+def summarizer_context(passages: List[Passage]) -> str:
+    """Passages laid out so radar_summarize prints all of their text.
+
+    Each passage's source/title markers are dropped and its text is wrapped
+    into balanced lines the tool does not truncate, under a `Title:` header
+    repeated often enough that its per-title line limit never cuts a passage.
+    """
+    blocks = []
+    for p in passages:
+        text = " ".join(_MARKER_RE.sub(" ", p.text).split())
+        if not text:
+            continue
+        n = math.ceil(len(text) / SUMMARIZE_LINE_CHARS)
+        # Even line lengths, so no short trailing fragment gets filtered out.
+        lines = textwrap.wrap(text, min(SUMMARIZE_LINE_CHARS, math.ceil(len(text) / n) + 16))
+        title = re.sub(r"^Title:\s*", "", p.title or "Signal")
+        per_title = SUMMARIZE_SITREP_LINES if "SITREP" in title else SUMMARIZE_LINES
+        # A wrapped line must not itself start like a header the tool parses.
+        lines = [f"… {line}" if _HEADER_RE.match(line) else line for line in lines]
+        for i in range(0, len(lines), per_title):
+            # The " --- passage" tail keeps short titles past the tool's
+            # minimum header length; it strips everything after " ---".
+            blocks.append(f"Title: {title} --- passage {p.ordinal}")
+            blocks.extend(lines[i : i + per_title])
+    return "\n".join(blocks)
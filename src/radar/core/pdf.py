@@ -0,0 +1,142 @@
+"""PDF-to-text for fetched documents, without temp files or event-loop stalls.
+
+With the HTTP cache enabled the download is spooled straight to its cache
+file (never held in memory) and `pdftotext` reads that file; text extracted
+from a document is stored against its body hash, so an unchanged report is
+neither downloaded (304) nor converted again. Without the cache the body is
+streamed from the socket into `pdftotext`'s stdin. Either way conversions
+run as async subprocesses, at most `PDF_WORKERS` at once, limited to
+`PDF_MAX_PAGES` pages and `PDF_MAX_BYTES` of download.
+"""
+
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, List, Optional
+
+import httpx
+
+from radar.config import settings
+from radar.core.fetch import get_http_client
+from radar.core.http_cache import HTTPCache, check_declared_size, get_http_cache, iter_limited
+
+logger = logging.getLogger(__name__)
+
+KIND = "pdftotext"  # derived-text kind in the HTTP cache
+
+
+class PDFConverter:
+    """Bounded-concurrency `pdftotext` runner."""
+
+    def __init__(self, workers: int = 0, max_pages: int = 0, timeout: float = 0):
+        self.workers = workers or settings.PDF_WORKERS or os.cpu_count() or 1
+        self.max_pages = max_pages or settings.PDF_MAX_PAGES
+        self.timeout = timeout or settings.PDF_TIMEOUT
+        self._slots = asyncio.Semaphore(self.workers)
+
+    def _args(self, source: str) -> List[str]:
+        return ["pdftotext", "-layout", "-l", str(self.max_pages), source, "-"]
+
+    async def convert_file(self, path: str) -> str:
+        async with self._slots:
+            proc = await asyncio.create_subprocess_exec(
+                *self._args(path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            return await self._finish(proc, proc.communicate())
+
+    async def convert_stream(self, chunks: AsyncIterator[bytes]) -> str:
+        """Convert a PDF whose bytes arrive as `chunks`, fed to pdftotext's stdin."""
+        async with self._slots:
+            proc = await asyncio.create_subprocess_exec(
+                *self._args("-"),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+
+            async def feed():
+                try:
+                    async for chunk in chunks:
+                        proc.stdin.write(chunk)
+                        await proc.stdin.drain()
+                finally:
+                    proc.stdin.close()
+
+            async def run():
+                # Read stdout while feeding so neither pipe can fill up and block.
+                _, output = await asyncio.gather(
+                    feed(), asyncio.gather(proc.stdout.read(), proc.stderr.read())
+                )
+                await proc.wait()
+                return output
+
+            return await self._finish(proc, run())
+
+    async def _finish(self, proc, communicate) -> str:
+        try:
+            stdout, stderr = await asyncio.wait_for(communicate, self.timeout)
+        except BaseException:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            raise
+        if proc.returncode != 0:
+            raise RuntimeError(stderr.decode("utf-8", errors="ignore").strip())
+        return stdout.decode("utf-8", errors="ignore").strip()
+
+
+_converter: Optional[PDFConverter] = None
+
+
+def get_pdf_converter() -> PDFConverter:
+    global _converter
+    if _converter is None:
+        _converter = PDFConverter()
+    return _converter
+
+
+async def fetch_pdf_text(
+    url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[HTTPCache] = None,
+    converter: Optional[PDFConverter] = None,
+) -> str:
+    """Text of the PDF at `url`; "" when it cannot be fetched or converted."""
+    client = client or get_http_client()
+    cache = cache if cache is not None else get_http_cache()
+    converter = converter or get_pdf_converter()
+    try:
+        if cache is None:
+            async with client.stream("GET", url) as response:
+                if response.status_code >= 400:
+                    logger.error(f"Error fetching {url}: HTTP {response.status_code}")
+                    return ""
+                check_declared_size(response, settings.PDF_MAX_BYTES)
+                return await converter.convert_stream(
+                    iter_limited(response, settings.PDF_MAX_BYTES)
+                )
+
+        response = await cache.get(client, url, limit=settings.PDF_MAX_BYTES, spool=True)
+        if response.status_code >= 400:
+            logger.error(f"Error fetching {url}: HTTP {response.status_code}")
+            return ""
+        if response.path is None:  # not cacheable: convert the in-memory body
+            return await converter.convert_stream(_chunks(response.content))
+        text = await asyncio.to_thread(cache.derived, response.body_hash, KIND)
+        if text is None:
+            text = await converter.convert_file(response.path)
+            if text:
+                await asyncio.to_thread(cache.store_derived, response.body_hash, KIND, text)
+        return text
+    except httpx.HTTPError as e:
+        logger.error(f"Error fetching {url}: {e}")
+    except Exception as e:
+        logger.error(f"PDF extraction failed for {url}: {e}")
+    return ""
+
+
+async def _chunks(content: bytes, size: int = 1 << 16) -> AsyncIterator[bytes]:
+    for i in range(0, len(content), size):
+        yield content[i : i + size]
@@ -0,0 +1,238 @@
+"""Bounded ingest pipeline for `radar ingest --batch`.
+
+    read -> parse -> extract -> write
+
+Each stage is a task joined to the next by a bounded queue, so a slow writer
+stalls the reader instead of letting records pile up in memory. Records are
+produced lazily (one file, or one NDJSON line, at a time); stat extraction
+for a whole batch runs on a process pool while the previous batch is being
+written, and every batch is committed on its own. A batch that fails to
+extract or write is logged and counted, and the run goes on with the next.
+
+Files that do not look like text (a NUL byte, or not UTF-8, in the first
+`_SNIFF_BYTES`) are skipped, so a directory with images or archives in it
+does not turn them into mojibake signals.
+"""
+
+import asyncio
+import codecs
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import IO, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from radar.config import settings
+from radar.core.extract import extract_batch
+from radar.db.models import Signal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Record:
+    text: str
+    title: Optional[str] = None
+    url: Optional[str] = None
+    source: Optional[str] = None
+    date: Optional[datetime] = None
+
+
+@dataclass
+class PipelineStats:
+    records: int = 0
+    signals: int = 0  # newly indexed (after near-duplicate handling)
+    stats: int = 0
+    batches: int = 0
+    failed: int = 0  # records in batches whose extraction or write failed
+    seconds: float = 0.0
+
+    @property
+    def records_per_s(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+
+_LINES_PER_READ = 256
+_SNIFF_BYTES = 8192
+_SENTINEL = None
+
+
+def _record_from_json(obj) -> Optional[Record]:
+    """A `Record` from one decoded NDJSON value; None for blank records and
+    TypeError for fields of the wrong type (the line is skipped)."""
+    if isinstance(obj, str):
+        return Record(text=obj) if obj.strip() else None
+    if not isinstance(obj, dict):
+        return None
+    text = obj.get("text") or obj.get("content")
+    if not text:
+        return None
+    fields = {"text": text, **{k: obj.get(k) for k in ("title", "url", "source", "date")}}
+    for name, value in fields.items():
+        if value is not None and not isinstance(value, str):
+            raise TypeError(f"{name} must be a string, got {type(value).__name__}")
+    if not text.strip():
+        return None
+    date = fields.pop("date")
+    return Record(**fields, date=datetime.fromisoformat(date) if date else None)
+
+
+async def _ndjson_records(stream: IO[str]) -> AsyncIterator[Record]:
+    while True:
+        lines = await asyncio.to_thread(lambda: list(islice(stream, _LINES_PER_READ)))
+        if not lines:
+            return
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = _record_from_json(json.loads(line))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Skipping malformed NDJSON record: {e}")
+                continue
+            if record is not None:
+                yield record
+
+
+def _is_ndjson(path: str) -> bool:
+    return path.endswith((".ndjson", ".jsonl"))
+
+
+def _read_text(path: str) -> Optional[str]:
+    """The file's text, or None when it does not look like text."""
+    with open(path, "rb") as f:
+        data = f.read()
+    head = data[:_SNIFF_BYTES]
+    try:
+        # Incremental, so a character cut at the sniff boundary is not an error.
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return None
+    if b"\0" in head:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+async def iter_records(source: str, stdin: Optional[IO[str]] = None) -> AsyncIterator[Record]:
+    """Records from a directory (recursive), a glob, an NDJSON file, or `-` (NDJSON on stdin)."""
+    if source == "-":
+        async for record in _ndjson_records(stdin):  # type: ignore[arg-type]
+            yield record
+        return
+    if os.path.isdir(source):
+        paths = (str(p) for p in sorted(Path(source).rglob("*")) if p.is_file())
+    elif glob.has_magic(source):
+        paths = (p for p in sorted(glob.iglob(source, recursive=True)) if os.path.isfile(p))
+    else:
+        paths = iter([source])
+    for path in paths:
+        if _is_ndjson(path):
+            with open(path, "r") as f:
+                async for record in _ndjson_records(f):
+                    yield record
+            continue
+        text = await asyncio.to_thread(_read_text, path)
+        if text is None:
+            logger.warning(f"Skipping non-text file: {path}")
+        elif text.strip():
+            yield Record(text=text)
+
+
+WriteFn = Callable[[List[Signal], Dict[uuid.UUID, List[dict]]], Awaitable[tuple]]
+
+
+async def run_pipeline(
+    records: AsyncIterator[Record],
+    parse: Callable[[str], Awaitable[tuple]],
+    write: WriteFn,
+    batch_size: int = 0,
+    workers: int = 0,
+    queue_size: int = 0,
+    progress: Optional[Callable[[PipelineStats], None]] = None,
+) -> PipelineStats:
+    """Drive `records` through parse -> extract -> write.
+
+    `parse(text)` returns `(signal, kg)` as `IntelligenceAgent.parse` does;
+    `write(signals, stats_by_id)` persists one batch and returns
+    `(indexed_count, stat_count)`.
+    """
+    batch_size = batch_size or settings.INGEST_BATCH
+    workers = workers or settings.INGEST_WORKERS or os.cpu_count() or 1
+    queue_size = queue_size or settings.INGEST_QUEUE
+    result = PipelineStats()
+    parsed: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    # Each entry is a whole batch; two let extraction of the next batch
+    # overlap the current write without buffering more than that.
+    extracted: asyncio.Queue = asyncio.Queue(maxsize=2)
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+
+    async def read_and_parse():
+        async for record in records:
+            signal, _ = await parse(record.text)
+            if record.title:
+                signal.title = record.title[:255]
+            for name in ("url", "source", "date"):
+                value = getattr(record, name)
+                if value is not None:
+                    setattr(signal, name, value)
+            result.records += 1
+            await parsed.put(signal)
+        await parsed.put(_SENTINEL)
+
+    async def extract(pool):
+        batch: List[Signal] = []
+        while True:
+            signal = await parsed.get()
+            if signal is not _SENTINEL:
+                batch.append(signal)
+            if batch and (signal is _SENTINEL or len(batch) >= batch_size):
+                items = [(s.id.hex, s.title, s.content) for s in batch]
+                size = max(1, -(-len(items) // workers))
+                futures = [
+                    loop.run_in_executor(pool, extract_batch, items[i : i + size])
+                    for i in range(0, len(items), size)
+                ]
+                await extracted.put((batch, asyncio.gather(*futures)))
+                batch = []
+            if signal is _SENTINEL:
+                await extracted.put(_SENTINEL)
+                return
+
+    async def write_batches():
+        while True:
+            entry = await extracted.get()
+            if entry is _SENTINEL:
+                return
+            batch, future = entry
+            try:
+                stats = {uuid.UUID(sid): rows for part in await future for sid, rows in part}
+                indexed, count = await write(batch, stats)
+            except Exception as e:
+                # Earlier batches are committed already; lose only this one.
+                logger.error(f"Batch of {len(batch)} records failed: {e!r}")
+                result.failed += len(batch)
+            else:
+                result.signals += indexed
+                result.stats += count
+                result.batches += 1
+            result.seconds = time.perf_counter() - started
+            if progress:
+                progress(result)
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(read_and_parse())
+            group.create_task(extract(pool))
+            group.create_task(write_batches())
+    result.seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,161 @@
+"""Staleness-driven scheduling of the daily research sweep.
+
+Instead of researching every line of `sweep_targets.txt` on every run, each
+topic gets its own revisit interval:
+
+  * a base interval from the topic's Frequency in
+    `interests_and_sigint_topics.csv` (High 12 h ... Monthly 30 d; Seasonal
+    topics are Medium in season and rare out of it; unlisted topics Medium);
+  * scaled by how often its research result actually changes, tracked as
+    an exponentially weighted average over the content hash of each run.
+
+A run researches only topics that are due, most overdue first, and stops
+starting new ones once the wall-clock budget is spent. State lives in
+`INDEX_DIR/sweep_schedule.json`.
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from radar.config import settings
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600.0
+FREQUENCY_HOURS = {
+    "high": 12,
+    "daily": 24,
+    "medium": 48,
+    "low": 168,
+    "monthly": 720,
+}
+OFF_SEASON_HOURS = 336
+SEASON_MONTHS = {
+    "spring": (3, 4, 5),
+    "summer": (6, 7, 8),
+    "fall": (9, 10, 11),
+    "autumn": (9, 10, 11),
+    "winter": (12, 1, 2),
+    "boat": (5, 6, 7, 8, 9),
+}
+CHANGE_ALPHA = 0.3  # weight of the latest run in the change-rate average
+DUE_SLACK = 0.1  # fraction of its interval a topic may be run early
+
+
+def base_hours(frequency: Optional[str], month: int) -> float:
+    """Revisit interval implied by a Frequency value from the interests CSV."""
+    value = (frequency or "medium").strip().lower()
+    if value.startswith("seasonal"):
+        season = value.partition("(")[2].rstrip(")").strip()
+        months = SEASON_MONTHS.get(season)
+        if months is not None and month not in months:
+            return OFF_SEASON_HOURS
+        return FREQUENCY_HOURS["medium"]
+    for name, hours in FREQUENCY_HOURS.items():
+        if value.startswith(name):
+            return hours
+    return FREQUENCY_HOURS["medium"]
+
+
+def load_frequencies(path: Optional[str] = None) -> Dict[str, str]:
+    """Topic -> Frequency from the interests CSV ({} when it is missing)."""
+    path = path or settings.SWEEP_PRIORITIES
+    try:
+        with open(path, newline="") as f:
+            return {
+                row["Topic"].strip(): row.get("Frequency") or ""
+                for row in csv.DictReader(f)
+                if row.get("Topic")
+            }
+    except (OSError, KeyError, csv.Error) as e:
+        logger.debug(f"No sweep priorities from {path}: {e}")
+        return {}
+
+
+class SweepBudget:
+    """Wall-clock allowance for one sweep (0 = unlimited).
+
+    Wall-clock is the only budget: most of a sweep's CPU is spent in HTML pool
+    workers and the browser, which outlive the sweep and so never show up in
+    this process's rusage.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = settings.SWEEP_TIME_BUDGET if seconds is None else seconds
+        self._started = time.monotonic()
+
+    def exhausted(self) -> bool:
+        return bool(self.seconds) and time.monotonic() - self._started >= self.seconds
+
+
+class SweepScheduler:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        frequencies: Optional[Dict[str, str]] = None,
+    ):
+        self.path = Path(path or os.path.join(settings.INDEX_DIR, "sweep_schedule.json"))
+        self.frequencies = load_frequencies() if frequencies is None else frequencies
+        self.topics: Dict[str, dict] = {}
+        try:
+            self.topics = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            pass
+
+    def interval(self, topic: str, now: Optional[float] = None) -> float:
+        """Seconds until `topic` should be researched again after a run."""
+        month = datetime.fromtimestamp(now or time.time()).month
+        base = base_hours(self.frequencies.get(topic), month) * HOUR
+        rate = self.topics.get(topic, {}).get("change_rate", 0.5)
+        # rate 0.5 (the prior) keeps the base interval; a topic that never
+        # changes is visited 4x less often, one that always changes ~1.75x more.
+        seconds = base / (0.25 + 1.5 * rate)
+        low = settings.SWEEP_MIN_INTERVAL_HOURS * HOUR
+        high = settings.SWEEP_MAX_INTERVAL_HOURS * HOUR
+        return min(max(seconds, low), high)
+
+    def due(self, topics: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """Topics whose next-due time has passed, most overdue (relative to
+        their interval) first; never-researched topics lead, by priority."""
+        now = now or time.time()
+        ranked = []
+        for topic in dict.fromkeys(topics):
+            state = self.topics.get(topic)
+            interval = self.interval(topic, now)
+            if state is None:
+                ranked.append((float("inf"), -interval, topic))
+            # A little slack, so a run that starts slightly earlier than the
+            # previous one does not push every topic back a whole cycle.
+            elif state["next_due"] <= now + DUE_SLACK * interval:
+                ranked.append(((now - state["next_due"]) / interval, -interval, topic))
+        ranked.sort(reverse=True)
+        return [topic for _, _, topic in ranked]
+
+    def record(self, topic: str, result: str, now: Optional[float] = None) -> float:
+        """Note a finished run of `topic`; returns its next-due time."""
+        now = now or time.time()
+        digest = hashlib.sha256(result.encode("utf-8", errors="ignore")).hexdigest()
+        state = self.topics.setdefault(topic, {"change_rate": 0.5, "runs": 0})
+        if state.get("hash") is not None:
+            changed = 1.0 if digest != state["hash"] else 0.0
+            state["change_rate"] = (
+                1 - CHANGE_ALPHA
+            ) * state["change_rate"] + CHANGE_ALPHA * changed
+        state["hash"] = digest
+        state["runs"] += 1
+        state["last_run"] = now
+        state["next_due"] = now + self.interval(topic, now)
+        return state["next_due"]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.topics, indent=1, sort_keys=True))
+        os.replace(tmp, self.path)
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from radar.db.models import Signal
+
+
+@dataclass
+class SearchHit:
+    """A retrieved signal plus the ranker's score and a matching excerpt."""
+
+    signal: Signal
+    score: float = 0.0
+    snippet: Optional[str] = None
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Tuple[str, float]]], k: int = 60
+) -> List[Tuple[str, float]]:
+    """Fuse ranked `(signal_id, score)` lists by reciprocal rank.
+
+    Each list contributes `1 / (k + rank)` per id; raw scores are ignored, so
+    rankers with incomparable scales (BM25, cosine) combine cleanly. Ids
+    appearing in several lists are merged into one entry.
+    """
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, (sid, _) in enumerate(ranking, start=1):
+            fused[sid] = fused.get(sid, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda x: x[1], reverse=True)
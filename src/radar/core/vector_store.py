@@ -0,0 +1,210 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from radar.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize a 2-D float32 batch so dot products are cosine similarities."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k_rows(
+    rows: np.ndarray,
+    scores: np.ndarray,
+    ids: List[str],
+    latest: Dict[str, int],
+    k: int,
+) -> List[Tuple[str, float]]:
+    """Best `k` of the scored `rows`, skipping rows superseded by a newer embedding."""
+    n = scores.shape[0]
+    if n == 0:
+        return []
+    want = min(n, k + (len(ids) - len(latest)))  # room for superseded rows
+    top = np.argpartition(-scores, want - 1)[:want] if want < n else np.arange(n)
+    top = top[np.argsort(-scores[top])]
+    results = []
+    for i in top:
+        row = int(rows[i])
+        sid = ids[row]
+        if latest[sid] == row:
+            results.append((sid, float(scores[i])))
+            if len(results) == k:
+                break
+    return results
+
+
+class VectorStore:
+    """Append-only embedding store under `.radar_index/vectors/`.
+
+    Layout:
+      vectors.f32   row-major float32 matrix, one L2-normalized row per signal
+      ids.txt       sidecar id map, line N is the signal id of row N
+      meta.json     {"dim": ..., "model": ...}
+
+    Rows are appended at ingest time and read back through `np.memmap`, so a
+    top-k query is a single matrix-vector product over the mapped file.
+    """
+
+    def __init__(self, root: Optional[str] = None, subdir: str = "vectors"):
+        self.root = os.path.join(root or settings.INDEX_DIR, subdir)
+        self.vec_path = os.path.join(self.root, "vectors.f32")
+        self.ids_path = os.path.join(self.root, "ids.txt")
+        self.meta_path = os.path.join(self.root, "meta.json")
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: List[str] = []
+        self._latest: Dict[str, int] = {}
+        self._loaded_size = -1
+
+    # --- metadata ----------------------------------------------------------------
+
+    def meta(self) -> dict:
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.meta().get("dim")
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._latest)
+
+    # --- writes ------------------------------------------------------------------
+
+    def append(self, ids: List[str], vectors: np.ndarray, model: str = "") -> None:
+        """Append a batch of rows; the first write fixes the store's dimension."""
+        if not ids:
+            return
+        batch = normalize_rows(vectors)
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            meta = self.meta()
+            if not meta:
+                # `store_id` changes whenever the store is recreated, so derived
+                # indexes keyed on row numbers (the IVF index) can detect it.
+                meta = {
+                    "dim": int(batch.shape[1]),
+                    "model": model,
+                    "store_id": uuid.uuid4().hex,
+                }
+                with open(self.meta_path, "w") as f:
+                    json.dump(meta, f)
+            elif meta["dim"] != batch.shape[1]:
+                raise ValueError(
+                    f"Vector store holds {meta['dim']}-d vectors from {meta.get('model')!r}; "
+                    f"got {batch.shape[1]}-d. Run `radar reindex --vectors` to rebuild."
+                )
+            # Vectors first, ids second: a crash in between leaves an unreferenced
+            # trailing row, which _load() ignores.
+            with open(self.vec_path, "ab") as f:
+                f.write(batch.tobytes())
+            with open(self.ids_path, "a") as f:
+                f.write("".join(f"{sid}\n" for sid in ids))
+
+    def start_rebuild(self) -> "VectorStore":
+        """Return an empty sibling store to fill; swap it in with `commit_rebuild`."""
+        tmp = VectorStore(
+            os.path.dirname(self.root), os.path.basename(self.root) + ".tmp"
+        )
+        shutil.rmtree(tmp.root, ignore_errors=True)
+        return tmp
+
+    def commit_rebuild(self, tmp: "VectorStore") -> None:
+        with self._lock:
+            old = self.root + ".old"
+            shutil.rmtree(old, ignore_errors=True)
+            if os.path.exists(self.root):
+                os.rename(self.root, old)
+            if os.path.exists(tmp.root):
+                os.rename(tmp.root, self.root)
+            shutil.rmtree(old, ignore_errors=True)
+            self._loaded_size = -1
+
+    def rebuild(
+        self, batches: Iterable[Tuple[List[str], np.ndarray]], model: str = ""
+    ) -> int:
+        """Write a fresh store from `(ids, vectors)` batches and swap it in."""
+        tmp = self.start_rebuild()
+        count = 0
+        for ids, vectors in batches:
+            tmp.append(ids, vectors, model=model)
+            count += len(ids)
+        self.commit_rebuild(tmp)
+        return count
+
+    # --- reads -------------------------------------------------------------------
+
+    def _load(self) -> None:
+        """Map the matrix, remapping only when the file has grown since the last call."""
+        try:
+            size = os.path.getsize(self.vec_path)
+        except FileNotFoundError:
+            self._matrix, self._ids, self._latest, self._loaded_size = None, [], {}, -1
+            return
+        if size == self._loaded_size:
+            return
+        dim = self.dim
+        with open(self.ids_path) as f:
+            ids = f.read().split()
+        rows = min(len(ids), size // (dim * 4)) if dim else 0
+        self._ids = ids[:rows]
+        self._matrix = (
+            np.memmap(self.vec_path, dtype=np.float32, mode="r", shape=(rows, dim))
+            if rows
+            else None
+        )
+        # A re-embedded signal supersedes its earlier rows.
+        self._latest = {sid: i for i, sid in enumerate(self._ids)}
+        self._loaded_size = size
+
+    def snapshot(self) -> Tuple[Optional[np.ndarray], List[str], Dict[str, int]]:
+        """Current `(matrix, row ids, id -> latest row)` view for derived indexes."""
+        with self._lock:
+            self._load()
+            return self._matrix, self._ids, self._latest
+
+    def search(self, query: np.ndarray, k: int = 5) -> List[Tuple[str, float]]:
+        """Top-k cosine neighbours of `query` as `(signal_id, similarity)` pairs."""
+        with self._lock:
+            self._load()
+            if self._matrix is None:
+                return []
+            q = normalize_rows(query)[0]
+            if q.shape[0] != self._matrix.shape[1]:
+                raise ValueError(
+                    f"Query has {q.shape[0]} dims, store has {self._matrix.shape[1]}."
+                )
+            scores = self._matrix @ q
+            ids, latest = self._ids, self._latest
+        return top_k_rows(np.arange(scores.shape[0]), scores, ids, latest, k)
+
+
+_stores: Dict[str, VectorStore] = {}
+
+
+def get_vector_store(root: Optional[str] = None) -> VectorStore:
+    """Process-wide store instance so the memmap is opened once."""
+    key = root or settings.INDEX_DIR
+    if key not in _stores:
+        _stores[key] = VectorStore(key)
+    return _stores[key]
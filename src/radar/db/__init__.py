@@ -1 +1,2 @@
 from .init import init_db as init_db
+from . import chunkstore as chunkstore  # registers the Signal content mapper events
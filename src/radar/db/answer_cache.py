@@ -0,0 +1,118 @@
+import hashlib
+import json
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from radar.config import settings
+from radar.db.models import AnswerCache, RadarMeta
+
+GENERATION_KEY = "corpus_generation"
+HITS_KEY = "answer_cache_hits"
+MISSES_KEY = "answer_cache_misses"
+
+
+def normalize_question(question: str) -> str:
+    """Case, punctuation and whitespace-insensitive form of a question."""
+    return " ".join(re.findall(r"\w+", question.lower()))
+
+
+def cache_key(question: str, **params: Any) -> str:
+    """Stable key over the normalized question and the retrieval parameters."""
+    blob = json.dumps(
+        {"q": normalize_question(question), **params}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+async def get_counter(session: AsyncSession, key: str) -> int:
+    row = await session.get(RadarMeta, key)
+    return row.value if row else 0
+
+
+async def incr_counter(session: AsyncSession, key: str, by: int = 1) -> None:
+    """Atomic increment inside the caller's transaction."""
+    result = await session.execute(
+        update(RadarMeta)
+        .where(RadarMeta.key == key)  # type: ignore
+        .values(value=RadarMeta.value + by)
+    )
+    if not result.rowcount:
+        session.add(RadarMeta(key=key, value=by))
+        await session.flush()
+
+
+async def bump_generation(session: AsyncSession) -> None:
+    """Mark the corpus as changed; every cached answer becomes stale."""
+    await incr_counter(session, GENERATION_KEY)
+
+
+async def lookup(session: AsyncSession, key: str) -> Optional[AnswerCache]:
+    """Return a fresh entry for `key` (and record the hit or miss), else None."""
+    entry = await session.get(AnswerCache, key)
+    fresh = (
+        entry is not None
+        and entry.generation == await get_counter(session, GENERATION_KEY)
+        and datetime.now() - entry.created_at < timedelta(seconds=settings.ANSWER_CACHE_TTL)
+    )
+    if fresh:
+        entry.last_used = datetime.now()
+        entry.hits += 1
+        await incr_counter(session, HITS_KEY)
+    else:
+        await incr_counter(session, MISSES_KEY)
+    await session.commit()
+    return entry if fresh else None
+
+
+async def store(
+    session: AsyncSession,
+    key: str,
+    question: str,
+    answer: str,
+    payload: Dict[str, Any],
+) -> None:
+    """Save an answer for the current generation and evict stale / LRU entries."""
+    generation = await get_counter(session, GENERATION_KEY)
+    entry = await session.get(AnswerCache, key)
+    if entry is None:
+        entry = AnswerCache(key=key, question=question, answer=answer, generation=generation)
+        session.add(entry)
+    entry.answer, entry.payload, entry.generation = answer, payload, generation
+    entry.created_at = entry.last_used = datetime.now()
+    await session.flush()
+
+    await session.execute(
+        delete(AnswerCache).where(AnswerCache.generation != generation)  # type: ignore
+    )
+    keep = (
+        select(AnswerCache.key)
+        .order_by(AnswerCache.last_used.desc())  # type: ignore
+        .limit(settings.ANSWER_CACHE_MAX)
+    )
+    await session.execute(
+        delete(AnswerCache).where(AnswerCache.key.not_in(keep))  # type: ignore
+    )
+    await session.commit()
+
+
+async def stats(session: AsyncSession) -> Dict[str, int]:
+    entries = (await session.execute(select(func.count()).select_from(AnswerCache))).scalar()
+    return {
+        "entries": entries or 0,
+        "hits": await get_counter(session, HITS_KEY),
+        "misses": await get_counter(session, MISSES_KEY),
+        "generation": await get_counter(session, GENERATION_KEY),
+    }
+
+
+async def clear(session: AsyncSession) -> int:
+    result = await session.execute(delete(AnswerCache))
+    await session.execute(
+        delete(RadarMeta).where(RadarMeta.key.in_([HITS_KEY, MISSES_KEY]))  # type: ignore
+    )
+    await session.commit()
+    return result.rowcount or 0
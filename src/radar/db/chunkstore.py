@@ -0,0 +1,313 @@
+"""Content-addressed, deduplicated storage for `Signal.content`.
+
+Bodies longer than `CHUNK_MIN_CHARS` are cut into content-defined chunks: a
+boundary falls wherever a rolling hash over the last few characters hits a
+bit pattern, so an edit only changes the chunks around it and the rest of the
+text still hashes to chunks that are already stored. Each chunk is stored once
+in `contentchunk`, keyed by its hash; the signal row keeps only the ordered
+chunk list (`chunk_refs`) and an empty `content` column.
+
+Chunk payloads are compressed (`CONTENT_COMPRESSION`, default zlib); every
+payload carries a one-byte codec tag, so the setting can change at any time.
+
+The mapping is transparent to the ORM: mapper events chunk bodies on
+insert/update and reassemble them when a row's `content` is loaded.
+Column-level selects (`select(Signal.content)`) bypass the ORM, so bulk
+readers go through `iter_signal_batches`, which resolves the refs itself.
+"""
+
+import hashlib
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import event, select
+from sqlalchemy.orm import attributes
+from sqlalchemy.orm.attributes import set_committed_value
+
+from radar.config import settings
+from radar.db.models import ContentChunk, Signal
+
+logger = logging.getLogger(__name__)
+
+WINDOW = 16  # characters covered by the rolling hash
+AVG_BITS = 10  # boundary probability 1/1024 -> ~1 KiB average chunks
+MIN_CHUNK = 256
+MAX_CHUNK = 8192
+SEP = ","
+
+_MASK = np.uint64((1 << AVG_BITS) - 1)
+_POW = np.array(
+    [pow(0x100000001B3, j, 1 << 64) for j in range(WINDOW)], dtype=np.uint64
+)
+
+
+def chunk_spans(text: str) -> List[Tuple[int, int]]:
+    """Content-defined `(start, end)` spans covering `text`."""
+    n = len(text)
+    if n <= MIN_CHUNK:
+        return [(0, n)] if n else []
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    h = np.zeros(n, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(WINDOW):  # polynomial hash of codes[i-WINDOW+1 .. i]
+            h[j:] += codes[: n - j] * _POW[j]
+        h ^= h >> np.uint64(29)  # mix high bits down; the low bits alone are weak
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(32)
+    cuts = np.flatnonzero((h & _MASK) == 0) + 1
+
+    spans: List[Tuple[int, int]] = []
+    start = 0
+    for cut in cuts.tolist():
+        if cut - start < MIN_CHUNK:
+            continue
+        while cut - start > MAX_CHUNK:
+            spans.append((start, start + MAX_CHUNK))
+            start += MAX_CHUNK
+        spans.append((start, cut))
+        start = cut
+    while n - start > MAX_CHUNK:
+        spans.append((start, start + MAX_CHUNK))
+        start += MAX_CHUNK
+    if start < n:
+        spans.append((start, n))
+    return spans
+
+
+def chunk_hash(piece: str) -> str:
+    return hashlib.blake2b(piece.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def split(text: str) -> List[Tuple[str, str]]:
+    """`(hash, piece)` pairs in order."""
+    return [(chunk_hash(text[a:b]), text[a:b]) for a, b in chunk_spans(text)]
+
+
+# --- codecs --------------------------------------------------------------------------
+
+_RAW, _ZLIB, _ZSTD = b"n", b"z", b"s"
+
+
+def _zstd():
+    import zstandard
+
+    return zstandard
+
+
+def encode_chunk(piece: str) -> bytes:
+    """Compress one chunk with the configured codec, prefixed by its tag byte."""
+    raw = piece.encode("utf-8")
+    codec = settings.CONTENT_COMPRESSION
+    level = settings.CONTENT_COMPRESSION_LEVEL
+    if codec == "zstd":
+        try:
+            return _ZSTD + _zstd().ZstdCompressor(level=level).compress(raw)
+        except ImportError:
+            logger.warning("zstandard not installed; compressing chunks with zlib")
+            codec = "zlib"
+    if codec == "zlib":
+        packed = zlib.compress(raw, level)
+        if len(packed) < len(raw):
+            return _ZLIB + packed
+    return _RAW + raw
+
+
+def decode_chunk(blob) -> str:
+    if isinstance(blob, str):  # stored before compression was introduced
+        return blob
+    tag, payload = blob[:1], blob[1:]
+    if tag == _ZLIB:
+        return zlib.decompress(payload).decode("utf-8")
+    if tag == _ZSTD:
+        return _zstd().ZstdDecompressor().decompress(payload).decode("utf-8")
+    return bytes(payload).decode("utf-8")
+
+
+# --- chunk cache ---------------------------------------------------------------------
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(hashes: List[str]) -> Dict[str, str]:
+    with _cache_lock:
+        found = {}
+        for h in hashes:
+            piece = _cache.get(h)
+            if piece is not None:
+                _cache.move_to_end(h)
+                found[h] = piece
+        return found
+
+
+def _cache_put(pieces: Dict[str, str]) -> None:
+    with _cache_lock:
+        _cache.update(pieces)
+        while len(_cache) > settings.CHUNK_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def _select_chunks(hashes: List[str]):
+    return select(ContentChunk.hash, ContentChunk.data).where(
+        ContentChunk.hash.in_(hashes)  # type: ignore
+    )
+
+
+def _assemble(hashes: List[str], pieces: Dict[str, str]) -> str:
+    missing = [h for h in hashes if h not in pieces]
+    if missing:
+        raise LookupError(f"Content chunks missing from store: {missing[:3]}")
+    return "".join(pieces[h] for h in hashes)
+
+
+# --- sync API (mapper events run on the flush/load connection) -----------------------
+
+
+def store_content(connection, text: str) -> str:
+    """Persist the chunks of `text` that are not stored yet; return the manifest."""
+    pairs = split(text)
+    unique = dict(pairs)
+    existing = set()
+    keys = list(unique)
+    for i in range(0, len(keys), 500):
+        existing.update(
+            connection.execute(
+                select(ContentChunk.hash).where(ContentChunk.hash.in_(keys[i : i + 500]))  # type: ignore
+            ).scalars()
+        )
+    new = [
+        {"hash": h, "data": encode_chunk(p), "size": len(p)}
+        for h, p in unique.items()
+        if h not in existing
+    ]
+    if new:
+        connection.execute(ContentChunk.__table__.insert(), new)  # type: ignore[attr-defined]
+    _cache_put(unique)
+    return SEP.join(h for h, _ in pairs)
+
+
+def resolve_sync(connection, manifest: str) -> str:
+    hashes = manifest.split(SEP)
+    pieces = _cache_get(hashes)
+    missing = list({h for h in hashes if h not in pieces})
+    if missing:
+        fetched = {h: decode_chunk(d) for h, d in connection.execute(_select_chunks(missing))}
+        _cache_put(fetched)
+        pieces.update(fetched)
+    return _assemble(hashes, pieces)
+
+
+# --- async API -----------------------------------------------------------------------
+
+
+async def resolve(session, manifest: str) -> str:
+    """Reassemble a body from its manifest inside an `AsyncSession`."""
+    hashes = manifest.split(SEP)
+    pieces = _cache_get(hashes)
+    missing = list({h for h in hashes if h not in pieces})
+    if missing:
+        fetched = {
+            h: decode_chunk(d) for h, d in (await session.execute(_select_chunks(missing))).all()
+        }
+        _cache_put(fetched)
+        pieces.update(fetched)
+    return _assemble(hashes, pieces)
+
+
+# Every hash named by a manifest; SQLite splits the manifests itself (hashes are
+# hex, so quoting them as a JSON array is safe).
+_LIVE_SQL = (
+    f"SELECT refs.value FROM {Signal.__tablename__}, "
+    f"json_each('[\"' || replace(chunk_refs, '{SEP}', '\",\"') || '\"]') AS refs "
+    "WHERE chunk_refs IS NOT NULL"
+)
+
+
+async def collect_garbage(session) -> int:
+    """Delete chunks no signal references any more (after merges or deletes).
+
+    On SQLite the live set is computed in SQL, so memory does not grow with
+    the corpus; other backends walk the manifests in keyset-paginated batches.
+    """
+    from sqlalchemy import delete, text
+
+    from radar.db.corpus import iter_signal_batches
+
+    if session.bind is not None and session.bind.dialect.name == "sqlite":
+        result = await session.execute(
+            text(f"DELETE FROM {ContentChunk.__tablename__} WHERE hash NOT IN ({_LIVE_SQL})")
+        )
+        return result.rowcount or 0
+
+    live = set()
+    async for rows in iter_signal_batches(session, columns=[Signal.id, Signal.chunk_refs]):
+        for _, refs in rows:
+            if refs:
+                live.update(refs.split(SEP))
+    stored = (await session.execute(select(ContentChunk.hash))).scalars().all()
+    dead = [h for h in stored if h not in live]
+    for i in range(0, len(dead), 500):
+        await session.execute(
+            delete(ContentChunk).where(ContentChunk.hash.in_(dead[i : i + 500]))  # type: ignore
+        )
+    return len(dead)
+
+
+# --- ORM wiring ----------------------------------------------------------------------
+
+_pending: Dict[int, str] = {}  # id(target) -> plaintext while the row is being written
+
+
+def _chunk_on_write(connection, target: Signal) -> None:
+    text = target.content
+    if not settings.CHUNK_STORE_ENABLED or text is None or len(text) < settings.CHUNK_MIN_CHARS:
+        target.chunk_refs = None
+        return
+    target.chunk_refs = store_content(connection, text)
+    _pending[id(target)] = text
+    target.content = ""  # the row stores only the manifest
+
+
+def _restore_after_write(target: Signal) -> None:
+    text = _pending.pop(id(target), None)
+    if text is not None:
+        set_committed_value(target, "content", text)
+
+
+@event.listens_for(Signal, "before_insert")
+def _before_insert(mapper, connection, target):
+    _chunk_on_write(connection, target)
+
+
+@event.listens_for(Signal, "before_update")
+def _before_update(mapper, connection, target):
+    if attributes.get_history(target, "content").has_changes():
+        _chunk_on_write(connection, target)
+
+
+@event.listens_for(Signal, "after_insert")
+@event.listens_for(Signal, "after_update")
+def _after_write(mapper, connection, target):
+    _restore_after_write(target)
+
+
+def _reassemble(target: Signal, session) -> None:
+    state = attributes.instance_state(target)
+    refs = state.dict.get("chunk_refs")
+    if refs and "content" in state.dict and session is not None:
+        set_committed_value(target, "content", resolve_sync(session.connection(), refs))
+
+
+@event.listens_for(Signal, "load")
+def _on_load(target, context):
+    _reassemble(target, context.session)
+
+
+@event.listens_for(Signal, "refresh")
+def _on_refresh(target, context, attrs):
+    if attrs is None or "content" in attrs or "chunk_refs" in attrs:
+        _reassemble(target, context.session)
@@ -0,0 +1,78 @@
+import uuid
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from radar.db.models import Signal, SignalMinHash
+
+
+def linked_duplicates():
+    """Subquery of signal ids stored as near-duplicates of another signal."""
+    return select(SignalMinHash.signal_id).where(
+        SignalMinHash.duplicate_of.is_not(None)  # type: ignore
+    )
+
+
+async def signal_bodies(
+    session: AsyncSession, signal_ids: Iterable[str]
+) -> Dict[str, Tuple[str, str]]:
+    """`{id hex: (title, content)}` for the given signals, chunk-stored bodies reassembled."""
+    from radar.db import chunkstore
+
+    ids = [uuid.UUID(sid) for sid in dict.fromkeys(signal_ids)]
+    bodies: Dict[str, Tuple[str, str]] = {}
+    for i in range(0, len(ids), 500):
+        rows = await session.execute(
+            select(Signal.id, Signal.title, Signal.content, Signal.chunk_refs).where(
+                Signal.id.in_(ids[i : i + 500])  # type: ignore
+            )
+        )
+        for sid, title, content, refs in rows.all():
+            if refs:
+                content = await chunkstore.resolve(session, refs)
+            bodies[sid.hex] = (title, content)
+    return bodies
+
+
+async def iter_signal_batches(
+    session: AsyncSession,
+    batch_size: int = 256,
+    columns: Optional[Sequence] = None,
+    after: Optional[str] = None,
+    canonical_only: bool = False,
+) -> AsyncIterator[List]:
+    """Stream the signal table in id order using keyset pagination.
+
+    Yields lists of rows (tuples of `columns`, default id/title/content). Each
+    page is a fresh indexed range query, so memory stays flat and a caller can
+    resume from the last id it saw via `after`. Bodies kept in the chunk store
+    are reassembled, so `Signal.content` always comes back as plain text.
+    `canonical_only` leaves out linked near-duplicates, which the search
+    indexes never hold.
+    """
+    from radar.db import chunkstore
+
+    cols = list(columns) if columns else [Signal.id, Signal.title, Signal.content]
+    content_at = next((i for i, c in enumerate(cols) if c is Signal.content), None)
+    query_cols = cols + [Signal.chunk_refs] if content_at is not None else cols
+    last = uuid.UUID(after) if isinstance(after, str) else after
+    while True:
+        stmt = select(*query_cols).order_by(Signal.id).limit(batch_size)  # type: ignore
+        if last is not None:
+            stmt = stmt.where(Signal.id > last)  # type: ignore
+        if canonical_only:
+            stmt = stmt.where(Signal.id.not_in(linked_duplicates()))  # type: ignore
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            return
+        if content_at is not None:
+            resolved = []
+            for row in rows:
+                values = list(row[:-1])
+                if row[-1]:
+                    values[content_at] = await chunkstore.resolve(session, row[-1])
+                resolved.append(tuple(values))
+            rows = resolved
+        yield rows
+        last = rows[-1][0]
@@ -0,0 +1,84 @@
+import uuid
+from typing import Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from radar.config import settings
+from radar.core import minhash
+from radar.db.models import MinHashBand, SignalMinHash
+
+
+async def find_duplicate(
+    session: AsyncSession, sig: np.ndarray, threshold: Optional[float] = None
+) -> Optional[Tuple[uuid.UUID, float]]:
+    """Most similar canonical signal at or above `threshold`, via the LSH band index."""
+    threshold = settings.DEDUP_THRESHOLD if threshold is None else threshold
+    keys = minhash.band_keys(sig)
+    candidates = (
+        await session.execute(
+            select(SignalMinHash.signal_id, SignalMinHash.signature)
+            .where(
+                SignalMinHash.signal_id.in_(  # type: ignore
+                    select(MinHashBand.signal_id).where(MinHashBand.key.in_(keys))  # type: ignore
+                )
+            )
+            .where(SignalMinHash.duplicate_of.is_(None))  # type: ignore
+        )
+    ).all()
+    best: Optional[Tuple[uuid.UUID, float]] = None
+    for signal_id, blob in candidates:
+        score = minhash.similarity(sig, minhash.from_bytes(blob))
+        if score >= threshold and (best is None or score > best[1]):
+            best = (signal_id, score)
+    return best
+
+
+async def record(
+    session: AsyncSession,
+    signal_id: uuid.UUID,
+    sig: np.ndarray,
+    duplicate_of: Optional[uuid.UUID] = None,
+    similarity: Optional[float] = None,
+) -> None:
+    """Store (or replace) a signature. Only canonical signals enter the band index,
+    so a cluster of near-duplicates is matched against one representative."""
+    await session.execute(
+        delete(MinHashBand).where(MinHashBand.signal_id == signal_id)  # type: ignore
+    )
+    row = await session.get(SignalMinHash, signal_id)
+    if row is None:
+        row = SignalMinHash(signal_id=signal_id, signature=b"")
+        session.add(row)
+    row.signature = minhash.to_bytes(sig)
+    row.duplicate_of, row.similarity = duplicate_of, similarity
+    if duplicate_of is None:
+        session.add_all(
+            MinHashBand(key=key, signal_id=signal_id) for key in set(minhash.band_keys(sig))
+        )
+    await session.flush()
+
+
+async def promote(
+    session: AsyncSession,
+    signal_id: uuid.UUID,
+    sig: np.ndarray,
+    canonical_id: uuid.UUID,
+    similarity: float,
+) -> None:
+    """Make `signal_id` the canonical signal of `canonical_id`'s cluster.
+
+    The newest report of a recurring series is the one worth searching, so
+    the former canonical and every signal linked to it are re-linked to the
+    newcomer, which takes over the band index.
+    """
+    await record(session, signal_id, sig)
+    await session.execute(
+        update(SignalMinHash)
+        .where(SignalMinHash.duplicate_of == canonical_id)  # type: ignore
+        .values(duplicate_of=signal_id)
+    )
+    old = await session.get(SignalMinHash, canonical_id, populate_existing=True)
+    if old is not None:
+        await record(session, canonical_id, minhash.from_bytes(old.signature), signal_id, similarity)
@@ -0,0 +1,419 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, column, event, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from radar.config import settings
+from radar.core.passages import Passage, split_passages
+from radar.db import chunkstore
+from radar.db.corpus import iter_signal_batches, signal_bodies
+from radar.db.models import RadarMeta, Signal
+
+logger = logging.getLogger(__name__)
+
+# Contentless FTS5 tables: they hold only the inverted index, never a copy of
+# the text, so signal bodies are stored once (in the chunk store). Their rowids
+# map to signals through the small `fts_signal`/`fts_passage` tables, and
+# snippets and passage text are cut from the bodies at query time.
+#
+# A contentless row can only be deleted by replaying the text it was indexed
+# with (`contentless_delete=1` needs SQLite 3.43), so a signal must be removed
+# from the index *before* its stored text changes; `_delete_ids` reads the
+# current body back from the database for that. Deleting a `Signal` through the
+# ORM unindexes it in the same flush; a row deleted behind the ORM's back leaves
+# postings nothing can replay, so its map rows are kept and the next `ensure_fts`
+# rebuilds the indexes (`STALE_KEY`).
+FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS signal_fts USING fts5("
+    "title, content, content='', tokenize='porter unicode61')"
+)
+FTS_MAP_DDL = (
+    "CREATE TABLE IF NOT EXISTS fts_signal ("
+    "rowid INTEGER PRIMARY KEY, signal_id TEXT NOT NULL UNIQUE)"
+)
+
+# Passage-level index: each row is `content[start_offset:end_offset]` of a signal.
+PASSAGE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS passage_fts USING fts5("
+    "body, content='', tokenize='porter unicode61')"
+)
+PASSAGE_MAP_DDL = (
+    "CREATE TABLE IF NOT EXISTS fts_passage ("
+    "rowid INTEGER PRIMARY KEY, signal_id TEXT NOT NULL, ordinal INTEGER NOT NULL, "
+    "start_offset INTEGER NOT NULL, end_offset INTEGER NOT NULL)"
+)
+PASSAGE_MAP_INDEX = (
+    "CREATE INDEX IF NOT EXISTS ix_fts_passage_signal ON fts_passage(signal_id)"
+)
+_TABLES = ("signal_fts", "passage_fts", "fts_signal", "fts_passage")
+STALE_KEY = "fts_stale"
+
+_SIGNAL_INSERT = (
+    "INSERT INTO signal_fts(rowid, title, content) VALUES (:rowid, :title, :content)"
+)
+_SIGNAL_DELETE = (
+    "INSERT INTO signal_fts(signal_fts, rowid, title, content) "
+    "VALUES ('delete', :rowid, :title, :content)"
+)
+_PASSAGE_INSERT = "INSERT INTO passage_fts(rowid, body) VALUES (:rowid, :body)"
+_PASSAGE_DELETE = (
+    "INSERT INTO passage_fts(passage_fts, rowid, body) VALUES ('delete', :rowid, :body)"
+)
+
+# Title matches count for more than body matches.
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+_ready: set = set()
+
+
+@dataclass
+class FTSHit:
+    signal_id: str
+    score: float
+    snippet: str
+
+
+def is_supported(session: AsyncSession) -> bool:
+    """FTS5 is a SQLite feature; other backends use the legacy ILIKE search."""
+    bind = session.bind
+    return bind is not None and bind.dialect.name == "sqlite"
+
+
+async def ensure_fts(session: AsyncSession, backfill: bool = True) -> bool:
+    """Create the FTS5 tables on first use and backfill them from existing signals.
+
+    Tables from before the indexes went contentless (they stored a copy of
+    every body) are dropped and rebuilt. `backfill=False` leaves the tables
+    empty (and a stale index as it is) for a caller about to `rebuild_fts`.
+    """
+    if not is_supported(session):
+        return False
+    key = str(session.bind.url)  # type: ignore[union-attr]
+    if key in _ready:
+        return True
+
+    names = ", ".join(f"'{t}'" for t in _TABLES)
+    found = dict(
+        (
+            await session.execute(
+                text(f"SELECT name, sql FROM sqlite_master WHERE type='table' AND name IN ({names})")
+            )
+        ).all()
+    )
+    # Not cached as ready until seen committed; the caller's transaction owns
+    # the DDL and the rebuild.
+    if len(found) != len(_TABLES) or "content=''" not in found["signal_fts"]:
+        for name in _TABLES:
+            await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        for ddl in (FTS_DDL, FTS_MAP_DDL, PASSAGE_DDL, PASSAGE_MAP_DDL, PASSAGE_MAP_INDEX):
+            await session.execute(text(ddl))
+        if backfill:
+            await rebuild_fts(session)
+    elif backfill and await session.get(RadarMeta, STALE_KEY) is not None:
+        logger.info("Rebuilding FTS indexes left with postings of deleted signals")
+        await rebuild_fts(session)
+    else:
+        _ready.add(key)
+    return True
+
+
+async def rebuild_fts(session: AsyncSession) -> int:
+    """Drop and repopulate both indexes from the canonical rows of `signal`."""
+    for name in ("signal_fts", "passage_fts"):
+        await session.execute(text(f"INSERT INTO {name}({name}) VALUES('delete-all')"))
+    await session.execute(text("DELETE FROM fts_signal"))
+    await session.execute(text("DELETE FROM fts_passage"))
+    count = 0
+    # Bodies may live in the chunk store, so rows are read through the ORM
+    # helper rather than with INSERT ... SELECT.
+    async for rows in iter_signal_batches(session, canonical_only=True):
+        await _insert(session, [(sid.hex, title, content) for sid, title, content in rows])
+        count += len(rows)
+    await session.execute(text("INSERT INTO signal_fts(signal_fts) VALUES('optimize')"))
+    await session.execute(text("INSERT INTO passage_fts(passage_fts) VALUES('optimize')"))
+    stale = await session.get(RadarMeta, STALE_KEY)
+    if stale is not None:
+        await session.delete(stale)
+    return count
+
+
+async def _insert(session: AsyncSession, docs: List[Tuple[str, str, str]]) -> None:
+    """Index `(signal_id, title, content)` triples not currently in the index."""
+    if not docs:
+        return
+    ids = [sid for sid, _, _ in docs]
+    await session.execute(
+        text("INSERT INTO fts_signal(signal_id) VALUES (:signal_id)"),
+        [{"signal_id": sid} for sid in ids],
+    )
+    passages = {sid: split_passages(content, settings.PASSAGE_CHARS) for sid, _, content in docs}
+    spans = [
+        {"signal_id": sid, "ordinal": i, "start": a, "end": b}
+        for sid, _, _ in docs
+        for i, (a, b) in enumerate(passages[sid])
+    ]
+    if spans:
+        await session.execute(
+            text(
+                "INSERT INTO fts_passage(signal_id, ordinal, start_offset, end_offset) "
+                "VALUES (:signal_id, :ordinal, :start, :end)"
+            ),
+            spans,
+        )
+    rowids = await session.run_sync(lambda s: _rowids(s.connection(), "fts_signal", ids))
+    await session.execute(
+        text(_SIGNAL_INSERT),
+        [
+            {"rowid": rowid, "title": title, "content": content}
+            for sid, title, content in docs
+            for rowid, _ in rowids.get(sid, [])
+        ],
+    )
+    passage_rows = await session.run_sync(
+        lambda s: _rowids(s.connection(), "fts_passage", ids)
+    )
+    content_of = {sid: content for sid, _, content in docs}
+    params = [
+        {"rowid": rowid, "body": content_of[sid][a:b]}
+        for sid, rows in passage_rows.items()
+        for rowid, (a, b) in rows
+    ]
+    if params:
+        await session.execute(text(_PASSAGE_INSERT), params)
+
+
+def _rowids(
+    connection, table: str, ids: List[str]
+) -> Dict[str, List[Tuple[int, Tuple[int, int]]]]:
+    """`{signal_id: [(rowid, (start, end)), ...]}` from a map table (spans are
+    (0, 0) for `fts_signal`)."""
+    spans = "start_offset, end_offset" if table == "fts_passage" else "0, 0"
+    out: Dict[str, List[Tuple[int, Tuple[int, int]]]] = {}
+    for i in range(0, len(ids), 500):
+        stmt = text(
+            f"SELECT rowid, signal_id, {spans} FROM {table} WHERE signal_id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True))
+        for rowid, sid, a, b in connection.execute(stmt, {"ids": ids[i : i + 500]}).all():
+            out.setdefault(sid, []).append((rowid, (a, b)))
+    return out
+
+
+async def index_signal(session: AsyncSession, signal: Signal) -> None:
+    """Add (or replace) a single signal in the index inside the caller's transaction."""
+    await index_signals(session, [signal])
+
+
+async def index_signals(session: AsyncSession, signals: List[Signal]) -> None:
+    """Add signals with one multi-row insert per table.
+
+    A signal that is already indexed is replaced; that only works while its
+    stored text is still the indexed one (see `remove_signals`).
+    """
+    if not signals or not await ensure_fts(session):
+        return
+    unique = {s.id.hex: s for s in signals}
+    await _delete_ids(session, list(unique))
+    await _insert(session, [(sid, s.title, s.content) for sid, s in unique.items()])
+
+
+async def _delete_ids(session: AsyncSession, ids: List[str]) -> None:
+    """Remove indexed signals, replaying the text they were indexed with."""
+    indexed = await session.run_sync(lambda s: list(_rowids(s.connection(), "fts_signal", ids)))
+    if not indexed:
+        return
+    bodies = await signal_bodies(session, indexed)
+    missing = await session.run_sync(lambda s: _replay_delete(s.connection(), indexed, bodies))
+    if missing:
+        # Their postings cannot be replayed any more: keep them mapped and let
+        # the next ensure_fts rebuild the indexes.
+        logger.warning(
+            f"{len(missing)} indexed signals no longer exist (e.g. {missing[0]}); "
+            "the FTS indexes will be rebuilt"
+        )
+        if await session.get(RadarMeta, STALE_KEY) is None:
+            session.add(RadarMeta(key=STALE_KEY))
+
+
+def _replay_delete(connection, ids: List[str], bodies: Dict[str, Tuple[str, str]]) -> List[str]:
+    """Unindex the signals of `ids` whose `(title, content)` is in `bodies`;
+    returns the indexed ids that had no body."""
+    indexed = _rowids(connection, "fts_signal", ids)
+    missing = [sid for sid in indexed if sid not in bodies]
+    ids = [sid for sid in indexed if sid in bodies]
+    if not ids:
+        return missing
+    passages = _rowids(connection, "fts_passage", ids)
+    signal_params, passage_params = [], []
+    for sid in ids:
+        title, content = bodies[sid]
+        signal_params += [
+            {"rowid": rowid, "title": title, "content": content} for rowid, _ in indexed[sid]
+        ]
+        passage_params += [
+            {"rowid": rowid, "body": content[a:b]} for rowid, (a, b) in passages.get(sid, [])
+        ]
+    connection.execute(text(_SIGNAL_DELETE), signal_params)
+    if passage_params:
+        connection.execute(text(_PASSAGE_DELETE), passage_params)
+    for i in range(0, len(ids), 500):
+        for name in ("fts_signal", "fts_passage"):
+            stmt = text(f"DELETE FROM {name} WHERE signal_id IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            )
+            connection.execute(stmt, {"ids": ids[i : i + 500]})
+    return missing
+
+
+@event.listens_for(Signal, "before_delete")
+def _unindex_on_delete(mapper, connection, target):
+    """`session.delete(signal)` drops it from the indexes in the same flush."""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type='table' AND name='fts_signal'")
+    ).first()
+    if exists is None:
+        return
+    row = connection.execute(
+        select(Signal.title, Signal.content, Signal.chunk_refs).where(Signal.id == target.id)  # type: ignore
+    ).first()
+    if row is None:
+        return
+    title, content, refs = row
+    if refs:
+        content = chunkstore.resolve_sync(connection, refs)
+    _replay_delete(connection, [target.id.hex], {target.id.hex: (title, content)})
+
+
+async def remove_signal(session: AsyncSession, signal_id: str) -> None:
+    await remove_signals(session, [signal_id])
+
+
+async def remove_signals(session: AsyncSession, signal_ids: List[str]) -> None:
+    """Drop signals from the index; call before changing their stored text."""
+    if not signal_ids or not await ensure_fts(session):
+        return
+    await _delete_ids(session, signal_ids)
+
+
+def _terms(query: str) -> List[str]:
+    terms = [t for t in re.findall(r"\w+", query.lower()) if len(t) > 2]
+    return list(dict.fromkeys(terms or re.findall(r"\w+", query.lower())))
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn a free-form question into a safe FTS5 MATCH expression (OR of quoted terms)."""
+    terms = _terms(query)
+    if not terms:
+        return None
+    return " OR ".join(f'"{t}"' for t in terms)
+
+
+def make_snippet(text_: str, query: str, tokens: int = 16) -> str:
+    """A `tokens`-word excerpt around the first query match, matches in [brackets]
+    (the layout FTS5's snippet() used)."""
+    terms = _terms(query)
+    words = text_.split()
+
+    def hit(word: str) -> bool:
+        w = re.sub(r"\W+", "", word.lower())
+        # Loose stand-in for the porter stemmer: "levels" ~ "level".
+        return len(w) > 2 and any(w.startswith(t[:5]) or t.startswith(w) for t in terms)
+
+    first = next((i for i, w in enumerate(words) if hit(w)), 0)
+    start = max(0, min(first - tokens // 4, len(words) - tokens))
+    window = words[start : start + tokens]
+    out = " ".join(f"[{w}]" if hit(w) else w for w in window)
+    return ("…" if start > 0 else "") + out + ("…" if start + tokens < len(words) else "")
+
+
+def matching_ids(keyword: str, name: str = "kw"):
+    """Subquery of signal ids whose indexed title or body contains `keyword`
+    as a word (or word prefix); bound as `:name`."""
+    match = build_match_query(keyword)
+    if match is None:
+        match = '""'
+    prefix = " OR ".join(f"{t}*" for t in match.split(" OR "))
+    return (
+        select(column("signal_id"))
+        .select_from(table("fts_signal"))
+        .where(
+            text(
+                f"rowid IN (SELECT rowid FROM signal_fts WHERE signal_fts MATCH :{name})"
+            ).bindparams(**{name: f"{match} OR {prefix}"})
+        )
+    )
+
+
+async def search_fts(session: AsyncSession, query: str, limit: int = 5) -> List[FTSHit]:
+    """BM25-ranked full-text search. Lower bm25() is better, so scores are negated."""
+    match = build_match_query(query)
+    if match is None or not await ensure_fts(session):
+        return []
+
+    rows = (
+        await session.execute(
+            text(
+                "SELECT m.signal_id, bm25(signal_fts, :tw, :cw) AS score "
+                "FROM signal_fts JOIN fts_signal m ON m.rowid = signal_fts.rowid "
+                "WHERE signal_fts MATCH :match ORDER BY score LIMIT :limit"
+            ),
+            {
+                "tw": TITLE_WEIGHT,
+                "cw": CONTENT_WEIGHT,
+                "match": match,
+                "limit": limit,
+            },
+        )
+    ).all()
+    bodies = await signal_bodies(session, [r[0] for r in rows])
+    return [
+        FTSHit(
+            signal_id=sid,
+            score=-score,
+            snippet=make_snippet(bodies[sid][1], query) if sid in bodies else "",
+        )
+        for sid, score in rows
+    ]
+
+
+async def search_passages(
+    session: AsyncSession,
+    query: str,
+    signal_ids: Optional[List[str]] = None,
+    limit: int = 8,
+) -> List[Passage]:
+    """BM25-ranked passages, optionally restricted to the given signals."""
+    match = build_match_query(query)
+    if match is None or not await ensure_fts(session):
+        return []
+
+    params: dict = {"match": match, "limit": limit}
+    where = "passage_fts MATCH :match"
+    if signal_ids:
+        names = [f"sid{i}" for i in range(len(signal_ids))]
+        where += f" AND p.signal_id IN ({', '.join(':' + n for n in names)})"
+        params.update(zip(names, signal_ids))
+    rows = (
+        await session.execute(
+            text(
+                "SELECT p.signal_id, p.ordinal, p.start_offset, p.end_offset, "
+                "bm25(passage_fts) AS score FROM passage_fts "
+                "JOIN fts_passage p ON p.rowid = passage_fts.rowid "
+                f"WHERE {where} ORDER BY score LIMIT :limit"
+            ),
+            params,
+        )
+    ).all()
+    bodies = await signal_bodies(session, [r[0] for r in rows])
+    return [
+        Passage(
+            signal_id=sid, ordinal=ordinal, start=a, end=b, text=bodies[sid][1][a:b], score=-score
+        )
+        for sid, ordinal, a, b, score in rows
+        if sid in bodies
+    ]
@@ -1,5 +1,23 @@
+from sqlalchemy import inspect
 from sqlmodel import SQLModel
-from radar.db.engine import engine
+from radar.db.engine import engine, async_session
+from radar.db import fts
+
+
+def _add_missing_columns(conn) -> list:
+    """create_all() never alters existing tables; add new nullable columns in place."""
+    inspector = inspect(conn)
+    added = []
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        present = {c["name"] for c in inspector.get_columns(table.name)}
+        for col in table.columns:
+            if col.name not in present and col.nullable:
+                ddl = col.type.compile(dialect=conn.dialect)
+                conn.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{col.name}" {ddl}')
+                added.append(f"{table.name}.{col.name}")
+    return added
 
 
 async def init_db():
@@ -15,8 +33,15 @@ async def init_db():
     async with engine.begin() as conn:
         print("[VERBOSE] EXECUTING TABLE SCHEMA CREATION...")
         await conn.run_sync(SQLModel.metadata.create_all)
+        for name in await conn.run_sync(_add_missing_columns):
+            print(f"[VERBOSE] ADDED COLUMN {name}")
+
+    async with async_session() as session:
+        if await fts.ensure_fts(session):
+            print("[VERBOSE] FTS5 SEARCH INDEXES READY (signal_fts, passage_fts).")
+        await session.commit()
 
     print("[VERBOSE] SCHEMA VERIFICATION COMPLETE.")
     print(
-        "[VERBOSE] TABLES INITIALIZED: signal, telemetry, riverlevel, rfpeak, softwareinventory, statistic, chatsession, chatmessage\n"
+        "[VERBOSE] TABLES INITIALIZED: signal, telemetry, riverlevel, rfpeak, softwareinventory, statistic, chatsession, chatmessage, radarmeta, answercache, signalminhash, minhashband, contentchunk, sweepjob, sweeptask, signal_fts, passage_fts\n"
     )
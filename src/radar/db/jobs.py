@@ -0,0 +1,182 @@
+"""Durable, resumable job queue for `radar sync` sweeps.
+
+A sweep is a `SweepJob` whose topics, news run, route places and dynamic
+targets are `SweepTask` rows, all written up front. A worker `acquire`s a
+task (a compare-and-set that leases it for `SWEEP_LEASE_SECONDS`), does the
+work, and `complete`s it; completion only moves a task that is not already
+done, so repeating it is harmless. A failure puts the task back with an
+exponential backoff until `SWEEP_MAX_ATTEMPTS` is reached, after which it
+stays `failed`. Every transition commits on its own, so after a crash
+`radar sync --resume` finds the last unfinished job, releases the dead
+run's leases and runs only what is left.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from radar.config import settings
+from radar.db.models import SweepJob, SweepTask
+
+
+async def create_job(
+    session: AsyncSession, kind: str, tasks: Iterable[Tuple[str, str]]
+) -> SweepJob:
+    """A new job with one pending task per `(kind, key)`, duplicates dropped.
+
+    Older unfinished jobs of the same kind are marked `abandoned`; the new
+    sweep plans its own work, so they can no longer be resumed.
+    """
+    await session.execute(
+        update(SweepJob)
+        .where(SweepJob.kind == kind, SweepJob.status == "running")  # type: ignore
+        .values(status="abandoned")
+    )
+    job = SweepJob(kind=kind)
+    session.add(job)
+    for position, (task_kind, key) in enumerate(dict.fromkeys(tasks)):
+        session.add(SweepTask(job_id=job.id, kind=task_kind, key=key, position=position))
+    await session.commit()
+    return job
+
+
+async def latest_unfinished(
+    session: AsyncSession, kind: Optional[str] = None
+) -> Optional[SweepJob]:
+    stmt = select(SweepJob).where(SweepJob.status == "running")
+    if kind is not None:
+        stmt = stmt.where(SweepJob.kind == kind)
+    stmt = stmt.order_by(SweepJob.created_at.desc()).limit(1)  # type: ignore
+    return (await session.execute(stmt)).scalars().first()
+
+
+async def release_leases(
+    session: AsyncSession, job_id: uuid.UUID, now: Optional[datetime] = None
+) -> int:
+    """Return tasks whose lease has expired to the queue.
+
+    Live leases are left alone: they may belong to a sweep still running.
+    """
+    now = now or datetime.now()
+    result = await session.execute(
+        update(SweepTask)
+        .where(
+            SweepTask.job_id == job_id,
+            SweepTask.status == "leased",
+            SweepTask.lease_until < now,  # type: ignore
+        )
+        .values(status="pending", lease_until=None, updated_at=datetime.now())
+    )
+    await session.commit()
+    return result.rowcount or 0
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(
+            SweepTask.status == "pending",
+            or_(SweepTask.not_before.is_(None), SweepTask.not_before <= now),  # type: ignore
+        ),
+        and_(SweepTask.status == "leased", SweepTask.lease_until < now),  # type: ignore
+    )
+
+
+async def runnable(
+    session: AsyncSession, job_id: uuid.UUID, kind: str, now: Optional[datetime] = None
+) -> List[SweepTask]:
+    """Tasks of `kind` that can be acquired now, in sweep order."""
+    now = now or datetime.now()
+    stmt = (
+        select(SweepTask)
+        .where(SweepTask.job_id == job_id, SweepTask.kind == kind, _claimable(now))  # type: ignore
+        .order_by(SweepTask.position)
+    )
+    return list((await session.execute(stmt)).scalars().all())
+
+
+async def acquire(session: AsyncSession, task_id: uuid.UUID) -> bool:
+    """Lease `task_id` if nobody holds it; False when it is taken or finished."""
+    now = datetime.now()
+    result = await session.execute(
+        update(SweepTask)
+        .where(SweepTask.id == task_id, _claimable(now))  # type: ignore
+        .values(
+            status="leased",
+            attempts=SweepTask.attempts + 1,
+            lease_until=now + timedelta(seconds=settings.SWEEP_LEASE_SECONDS),
+            updated_at=now,
+        )
+    )
+    await session.commit()
+    return bool(result.rowcount)
+
+
+async def complete(session: AsyncSession, task_id: uuid.UUID) -> bool:
+    """Mark `task_id` done; False when it already was."""
+    now = datetime.now()
+    result = await session.execute(
+        update(SweepTask)
+        .where(SweepTask.id == task_id, SweepTask.status != "done")  # type: ignore
+        .values(status="done", lease_until=None, last_error=None, updated_at=now, finished_at=now)
+    )
+    await session.commit()
+    return bool(result.rowcount)
+
+
+async def fail(session: AsyncSession, task_id: uuid.UUID, error: str) -> str:
+    """Record a failed attempt; returns the task's new status (pending or failed)."""
+    task = await session.get(SweepTask, task_id, populate_existing=True)
+    if task is None or task.status == "done":
+        return task.status if task else "missing"
+    now = datetime.now()
+    task.last_error = error[:1000]
+    task.lease_until = None
+    task.updated_at = now
+    if task.attempts >= settings.SWEEP_MAX_ATTEMPTS:
+        task.status = "failed"
+        task.finished_at = now
+    else:
+        task.status = "pending"
+        delay = settings.SWEEP_RETRY_BACKOFF * 2 ** max(task.attempts - 1, 0)
+        task.not_before = now + timedelta(seconds=delay)
+    await session.commit()
+    return task.status
+
+
+async def next_retry(
+    session: AsyncSession, job_id: uuid.UUID, kind: str
+) -> Optional[datetime]:
+    """Earliest backoff expiry among pending tasks of `kind`, if any are waiting."""
+    stmt = select(func.min(SweepTask.not_before)).where(
+        SweepTask.job_id == job_id,
+        SweepTask.kind == kind,
+        SweepTask.status == "pending",  # type: ignore
+    )
+    return (await session.execute(stmt)).scalar()
+
+
+async def progress(session: AsyncSession, job_id: uuid.UUID) -> Dict[str, int]:
+    stmt = (
+        select(SweepTask.status, func.count())
+        .where(SweepTask.job_id == job_id)
+        .group_by(SweepTask.status)
+    )
+    counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+    counts.update(dict((await session.execute(stmt)).all()))  # type: ignore[arg-type]
+    return counts
+
+
+async def finish_if_done(session: AsyncSession, job_id: uuid.UUID) -> bool:
+    """Close the job once no task is pending or leased."""
+    counts = await progress(session, job_id)
+    if counts["pending"] or counts["leased"]:
+        return False
+    job = await session.get(SweepJob, job_id)
+    if job is not None and job.status != "done":
+        job.status = "done"
+        job.finished_at = datetime.now()
+        await session.commit()
+    return True
@@ -1,17 +1,38 @@
 import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, AutoString
 from sqlalchemy import Column, JSON
+from sqlalchemy.orm import deferred, undefer_group
+
+# Signal bodies are deferred: list-style queries load id/title/source/url/date
+# only. Add `with_body()` to a query when the text is actually needed.
+_signal_content = Column("content", AutoString, nullable=False)
+_signal_chunk_refs = Column("chunk_refs", AutoString, nullable=True)
+
+
+def with_body():
+    """Query option that loads the deferred `Signal` body columns."""
+    return undefer_group("body")
 
 
 class Signal(SQLModel, table=True):
+    __mapper_args__ = {
+        "properties": {
+            "content": deferred(_signal_content, group="body"),
+            "chunk_refs": deferred(_signal_chunk_refs, group="body"),
+        }
+    }
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str = Field(index=True)
-    content: str
+    content: str = Field(sa_column=_signal_content)
     source: str
     url: Optional[str] = None
     date: datetime = Field(default_factory=datetime.now, index=True)
+    # Ordered ContentChunk hashes when the body lives in the chunk store
+    # (see radar.db.chunkstore); `content` is then empty in the row itself.
+    chunk_refs: Optional[str] = Field(default=None, sa_column=_signal_chunk_refs)
 
 
 class TacticalAlert(SQLModel, table=True):
@@ -80,3 +101,73 @@ class ChatMessage(SQLModel, table=True):
     role: str  # user, assistant
     content: str
     timestamp: datetime = Field(default_factory=datetime.now)
+
+
+class RadarMeta(SQLModel, table=True):
+    """Small key/value counters (corpus generation, cache stats) and cursors."""
+
+    key: str = Field(primary_key=True)
+    value: int = 0
+    text: Optional[str] = None
+
+
+class AnswerCache(SQLModel, table=True):
+    key: str = Field(primary_key=True)  # hash of normalized question + retrieval params
+    question: str
+    answer: str
+    payload: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
+    generation: int  # corpus generation the answer was computed against
+    created_at: datetime = Field(default_factory=datetime.now)
+    last_used: datetime = Field(default_factory=datetime.now, index=True)
+    hits: int = 0
+
+
+class SignalMinHash(SQLModel, table=True):
+    """MinHash signature of a signal, plus its canonical signal if it is a near-duplicate."""
+
+    signal_id: uuid.UUID = Field(primary_key=True)
+    signature: bytes
+    duplicate_of: Optional[uuid.UUID] = Field(default=None, index=True)
+    similarity: Optional[float] = None
+
+
+class MinHashBand(SQLModel, table=True):
+    """LSH band index: signals sharing any `key` are near-duplicate candidates."""
+
+    key: int = Field(primary_key=True)
+    signal_id: uuid.UUID = Field(primary_key=True)
+
+
+class ContentChunk(SQLModel, table=True):
+    """One deduplicated piece of signal text, addressed by its plaintext hash."""
+
+    hash: str = Field(primary_key=True)
+    data: bytes  # codec tag byte + payload, see radar.db.chunkstore.encode_chunk
+    size: int  # plaintext length in characters
+
+
+class SweepJob(SQLModel, table=True):
+    """One `radar sync` sweep; its units of work are `SweepTask` rows."""
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    kind: str = Field(index=True)  # daily | web
+    status: str = "running"  # running | done | abandoned
+    created_at: datetime = Field(default_factory=datetime.now, index=True)
+    finished_at: Optional[datetime] = None
+
+
+class SweepTask(SQLModel, table=True):
+    """A topic, news run, route place or dynamic target of a sweep (see radar.db.jobs)."""
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    job_id: uuid.UUID = Field(foreign_key="sweepjob.id", index=True)
+    kind: str  # topic | news | route | dynamic
+    key: str  # the topic, place, or "url | instructions" line
+    position: int = 0  # order within the sweep
+    status: str = Field(default="pending", index=True)  # pending | leased | done | failed
+    attempts: int = 0
+    lease_until: Optional[datetime] = None
+    not_before: Optional[datetime] = None  # retry backoff
+    last_error: Optional[str] = None
+    updated_at: datetime = Field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
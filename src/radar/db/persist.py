@@ -0,0 +1,137 @@
+"""Batched persistence of parsed signals and their extracted stats.
+
+One session and one transaction per batch. Signals go through the ORM (the
+chunk store hooks into their inserts); the much more numerous `Statistic`
+rows and FTS rows are written with multi-row Core inserts, so no ORM objects
+or identity-map entries are created for them. Ids are generated client-side
+with `uuid.uuid4()`, exactly as the models' `default_factory` does.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from radar.config import settings
+from radar.core import minhash
+from radar.core.extract import categorize, extract_stats
+from radar.db import answer_cache, dedup, fts
+from radar.db.models import Signal, Statistic
+
+
+@dataclass
+class SaveResult:
+    indexed: List[Signal] = field(default_factory=list)  # new or merged canonical signals
+    duplicates: List[Tuple[Signal, uuid.UUID, float]] = field(default_factory=list)
+    superseded: List[uuid.UUID] = field(default_factory=list)  # demoted by `link`
+    stats: int = 0
+
+
+def stat_rows(
+    signal_id: uuid.UUID, stats: Iterable[dict], timestamp: Optional[datetime] = None
+) -> List[dict]:
+    """Core insert parameters for categorized stats of one signal."""
+    timestamp = timestamp or datetime.now()
+    return [
+        {
+            "id": uuid.uuid4(),
+            "timestamp": timestamp,
+            "category": s["category"],
+            "label": s["label"],
+            "value": s["value"],
+            "unit": s["unit"],
+            "description": s.get("description"),
+            "source_signal_id": signal_id,
+        }
+        for s in stats
+    ]
+
+
+async def insert_stats(session: AsyncSession, rows: List[dict]) -> int:
+    if rows:
+        await session.execute(insert(Statistic), rows)
+    return len(rows)
+
+
+async def save_signals(
+    session: AsyncSession,
+    signals: Iterable[Signal],
+    extract: Callable[[str], List[dict]] = extract_stats,
+    action: Optional[str] = None,
+    stats: Optional[Dict[uuid.UUID, List[dict]]] = None,
+) -> SaveResult:
+    """Persist a batch of signals and their stats; commits once at the end.
+
+    Near-duplicates of a stored signal, or of an earlier one in the same batch,
+    are handled per `DEDUP_ACTION`: `skip` drops them; `link` stores the newer
+    signal as the cluster's canonical one (indexed, with its stats) and links
+    the previous canonical to it, leaving that out of the search indexes (its
+    stats stay, as history); and `merge` overwrites the canonical signal with
+    the newer text and re-extracts its stats.
+
+    `stats` may carry already categorized stats per signal id (extracted
+    ahead of time, e.g. on a process pool); other signals are run through
+    `extract` here.
+    """
+    action = action or settings.DEDUP_ACTION
+    result = SaveResult()
+    rows: List[dict] = []
+    changed = False
+    for signal in signals:
+        sig = minhash.signature(signal.content)
+        # Too short to sign: never a near-duplicate, and not recorded as one.
+        duplicate = (
+            await dedup.find_duplicate(session, sig)
+            if action != "off" and sig is not None
+            else None
+        )
+        if duplicate is not None:
+            canonical_id, similarity = duplicate
+            result.duplicates.append((signal, canonical_id, similarity))
+            if action == "skip":
+                continue
+        changed = True
+
+        found = stats.get(signal.id) if stats else None
+        if found is None:
+            found = extract(signal.content)
+            for s in found:
+                s["category"] = categorize(signal.title, s["label"])
+
+        if duplicate is not None and action == "merge":
+            # The contentless FTS index can only drop the text it indexed.
+            await fts.remove_signals(session, [canonical_id.hex])
+            canonical = await session.get(Signal, canonical_id)
+            for name in ("title", "content", "source", "url", "date"):
+                setattr(canonical, name, getattr(signal, name))
+            await session.execute(
+                delete(Statistic).where(Statistic.source_signal_id == canonical_id)  # type: ignore
+            )
+            rows = [r for r in rows if r["source_signal_id"] != canonical_id]
+            await session.flush()
+            await dedup.record(session, canonical_id, sig)
+            rows.extend(stat_rows(canonical_id, found))
+            result.indexed = [s for s in result.indexed if s.id != canonical_id]
+            result.indexed.append(canonical)
+            continue
+
+        session.add(signal)
+        if duplicate is not None:  # link
+            await dedup.promote(session, signal.id, sig, canonical_id, similarity)
+            result.superseded.append(canonical_id)
+            result.indexed = [s for s in result.indexed if s.id != canonical_id]
+        elif sig is not None:
+            await dedup.record(session, signal.id, sig)
+        rows.extend(stat_rows(signal.id, found))
+        result.indexed.append(signal)
+
+    await fts.remove_signals(session, [sid.hex for sid in result.superseded])
+    await fts.index_signals(session, result.indexed)
+    result.stats = await insert_stats(session, rows)
+    if changed:
+        await answer_cache.bump_generation(session)
+    await session.commit()
+    return result
@@ -0,0 +1,148 @@
+"""Re-run stat extraction over stored signals (`radar reprocess`).
+
+Signals are read in keyset-paginated batches; each batch is extracted on a
+process pool while the next one is read, then its `Statistic` rows are
+replaced in one transaction together with the resume cursor. A killed run
+therefore restarts after the last batch that was fully written.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from radar.config import settings
+from radar.core.extract import extract_batch
+from radar.db.corpus import iter_signal_batches
+from radar.db.models import RadarMeta, SignalMinHash, Statistic
+from radar.db.persist import insert_stats, stat_rows
+
+CURSOR_KEY = "reprocess_cursor"
+
+
+async def get_cursor(session: AsyncSession) -> Optional[str]:
+    row = await session.get(RadarMeta, CURSOR_KEY)
+    return row.text if row else None
+
+
+async def set_cursor(session: AsyncSession, cursor: Optional[str]) -> None:
+    row = await session.get(RadarMeta, CURSOR_KEY)
+    if cursor is None:
+        if row is not None:
+            await session.delete(row)
+        return
+    if row is None:
+        row = RadarMeta(key=CURSOR_KEY)
+        session.add(row)
+    row.text = cursor
+
+
+async def replace_stats(
+    session: AsyncSession, results: List[Tuple[str, List[dict]]]
+) -> int:
+    """Swap the Statistic rows of the given signals for freshly extracted ones.
+
+    Rows keep the timestamp of the stats they replace, so time-ordered views
+    do not jump to the reprocessing date.
+    """
+    ids = [uuid.UUID(sid) for sid, _ in results]
+    stamps = dict(
+        (
+            await session.execute(
+                select(Statistic.source_signal_id, func.min(Statistic.timestamp))
+                .where(Statistic.source_signal_id.in_(ids))  # type: ignore
+                .group_by(Statistic.source_signal_id)
+            )
+        ).all()
+    )
+    await session.execute(
+        delete(Statistic).where(Statistic.source_signal_id.in_(ids))  # type: ignore
+    )
+    now = datetime.now()
+    rows = [
+        row
+        for signal_id, (_, stats) in zip(ids, results)
+        for row in stat_rows(signal_id, stats, stamps.get(signal_id, now))
+    ]
+    return await insert_stats(session, rows)
+
+
+def _split(items: list, parts: int) -> List[list]:
+    size = max(1, -(-len(items) // parts))
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+async def reprocess(
+    session: AsyncSession,
+    workers: int = 0,
+    batch_size: int = 0,
+    restart: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[int, int]:
+    """Re-extract stats for every canonical signal; returns (signals, stats).
+
+    Resumes after the stored cursor unless `restart`. Linked near-duplicates
+    are skipped, as at ingest. `progress(signals, stats)` is called after
+    each committed batch.
+    """
+    workers = workers or settings.REPROCESS_WORKERS or os.cpu_count() or 1
+    batch_size = batch_size or settings.REPROCESS_BATCH
+    after = None if restart else await get_cursor(session)
+    duplicates = set(
+        (
+            await session.execute(
+                select(SignalMinHash.signal_id).where(
+                    SignalMinHash.duplicate_of.is_not(None)  # type: ignore
+                )
+            )
+        ).scalars()
+    )
+
+    loop = asyncio.get_running_loop()
+    done_signals = done_stats = 0
+    # spawn: the event loop and aiosqlite run threads, which fork() does not copy.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+
+        def submit(rows) -> Tuple[str, "asyncio.Future"]:
+            items = [
+                (sid.hex, title, content)
+                for sid, title, content in rows
+                if sid not in duplicates
+            ]
+            futures = [
+                loop.run_in_executor(pool, extract_batch, part)
+                for part in _split(items, workers)
+            ]
+            return rows[-1][0].hex, asyncio.gather(*futures)
+
+        async def write(pending) -> None:
+            nonlocal done_signals, done_stats
+            cursor, future = pending
+            results = [r for part in await future for r in part]
+            done_stats += await replace_stats(session, results)
+            await set_cursor(session, cursor)
+            await session.commit()
+            done_signals += len(results)
+            if progress:
+                progress(done_signals, done_stats)
+
+        pending = None
+        # Extraction of batch k overlaps the read of batch k+1.
+        async for rows in iter_signal_batches(session, batch_size=batch_size, after=after):
+            submitted = submit(rows)
+            if pending is not None:
+                await write(pending)
+            pending = submitted
+        if pending is not None:
+            await write(pending)
+
+    await set_cursor(session, None)
+    await session.commit()
+    return done_signals, done_stats
@@ -1,8 +1,9 @@
 import asyncio
 import click
+import uuid
 import typer
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, List, Optional
 from rich.console import Console
 from rich.panel import Panel
 
@@ -14,8 +15,21 @@ from radar.core.ingest import (
     RSSIngestAgent,
     TextIngestAgent,
 )
+from radar.core.ann import get_ann_index
+from radar.core.bm25_index import get_bm25_index, tokenize
+from radar.core.browser import close_browser_pool
+from radar.core.fetch import close_fetcher
+from radar.core.frontier import URLFrontier
+from radar.core.htmltext import close_html_extractor
+from radar.core.http_cache import get_http_cache
+from radar.core import minhash
 from radar.core.models import KnowledgeGraphExtraction
+from radar.core.schedule import SweepBudget, SweepScheduler
+from radar.core.vector_store import get_vector_store
 from radar.db.engine import async_session
+from radar.db import answer_cache, chunkstore, dedup, fts, jobs, persist
+from radar.db.persist import SaveResult
+from radar.db.corpus import iter_signal_batches
 from radar.db.init import init_db
 from radar.db.models import (
     Signal,
@@ -27,6 +41,8 @@ from radar.db.models import (
     RFPeak,
     SoftwareInventory,
     Statistic,
+    SignalMinHash,
+    with_body,
 )
 from sqlalchemy import select, desc
 from radar.config import settings
@@ -41,9 +57,12 @@ async def do_ask_logic(
     interactive: bool = False,
     session_id: Optional[str] = None,
     json_out: bool = False,
+    mode: str = "hybrid",
+    use_cache: bool = True,
 ):
     import uuid
     import json
+    import time
 
     intel = IntelligenceAgent()
 
@@ -75,33 +94,89 @@ async def do_ask_logic(
             if not current_question:
                 break
 
-            with console.status("[bold blue]Searching...[/bold blue]"):
-                relevant_signals = await intel.search_signals(current_question, limit=5)
-
-            async with async_session() as session:
-                history = []
-                if active_session_id:
-                    hist_stmt = (
-                        select(ChatMessage)
-                        .where(ChatMessage.session_id == active_session_id)  # type: ignore
-                        .order_by(ChatMessage.timestamp)  # type: ignore
+            t_start = time.perf_counter()
+            key = answer_cache.cache_key(
+                current_question,
+                mode=mode,
+                limit=5,
+                passages=settings.ASK_PASSAGES,
+                passage_chars=settings.PASSAGE_CHARS,
+            )
+            cached = None
+            if use_cache and not active_session_id:
+                async with async_session() as session:
+                    cached = await answer_cache.lookup(session, key)
+
+            if cached is not None:
+                result = {
+                    **cached.payload,
+                    "question": current_question,
+                    "answer": cached.answer,
+                    "cached": True,
+                    "timings": {"total_ms": (time.perf_counter() - t_start) * 1000},
+                }
+            else:
+                timings: dict = {}
+                with console.status("[bold blue]Searching...[/bold blue]"):
+                    hits = await intel.search_hits(
+                        current_question, limit=5, mode=mode, timings=timings
                     )
-                    for msg in (await session.execute(hist_stmt)).scalars().all():
-                        history.append({"role": msg.role, "content": msg.content})
+                    relevant_signals = [h.signal for h in hits]
 
-            if not relevant_signals:
-                console.print("[yellow]No signals found.[/yellow]")
-                if not interactive:
-                    break
-                current_question = ""
-                continue
-
-            with console.status("[bold blue]Thinking...[/bold blue]"):
-                answer = await (
-                    intel.chat(current_question, relevant_signals, history)
-                    if active_session_id
-                    else intel.answer_question(current_question, relevant_signals)
-                )
+                async with async_session() as session:
+                    history = []
+                    if active_session_id:
+                        hist_stmt = (
+                            select(ChatMessage)
+                            .where(ChatMessage.session_id == active_session_id)  # type: ignore
+                            .order_by(ChatMessage.timestamp)  # type: ignore
+                        )
+                        for msg in (await session.execute(hist_stmt)).scalars().all():
+                            history.append({"role": msg.role, "content": msg.content})
+
+                if not relevant_signals:
+                    console.print("[yellow]No signals found.[/yellow]")
+                    if not interactive:
+                        break
+                    current_question = ""
+                    continue
+
+                with console.status("[bold blue]Thinking...[/bold blue]"):
+                    t0 = time.perf_counter()
+                    passages = await intel.search_passages(current_question, hits)
+                    timings["passages_ms"] = (time.perf_counter() - t0) * 1000
+                    t0 = time.perf_counter()
+                    answer = await (
+                        intel.chat(current_question, relevant_signals, history, passages)
+                        if active_session_id
+                        else intel.answer_question(current_question, relevant_signals, passages)
+                    )
+                    timings["answer_ms"] = (time.perf_counter() - t0) * 1000
+
+                payload = {
+                    "sources": [
+                        {"title": h.signal.title, "score": h.score, "snippet": h.snippet}
+                        for h in hits
+                    ],
+                    "passages": [
+                        {"title": p.title, "start": p.start, "end": p.end, "score": p.score}
+                        for p in passages
+                    ],
+                    "context_chars": sum(len(p.text) for p in passages),
+                    "mode": mode,
+                }
+                if use_cache and not active_session_id and answer:
+                    async with async_session() as session:
+                        await answer_cache.store(
+                            session, key, current_question, answer, payload
+                        )
+                result = {
+                    "question": current_question,
+                    "answer": answer,
+                    **payload,
+                    "cached": False,
+                    "timings": timings,
+                }
 
             if active_session_id:
                 async with async_session() as session:
@@ -116,28 +191,25 @@ async def do_ask_logic(
                         ChatMessage(
                             session_id=active_session_id,
                             role="assistant",
-                            content=answer,
+                            content=result["answer"],
                         )
                     )
                     await session.commit()
 
             if json_out:
-                print(
-                    json.dumps(
-                        {
-                            "question": current_question,
-                            "answer": answer,
-                            "sources": [{"title": s.title} for s in relevant_signals],
-                        },
-                        indent=2,
-                    )
-                )
+                result["timings"] = {k: round(v, 2) for k, v in result["timings"].items()}
+                print(json.dumps(result, indent=2))
             else:
                 console.print(
-                    Panel(answer, title=f"[bold cyan]{current_question}[/bold cyan]")
+                    Panel(
+                        result["answer"],
+                        title=f"[bold cyan]{current_question}[/bold cyan]",
+                    )
                 )
+                titles = dict.fromkeys(src["title"] for src in result["sources"])
                 console.print(
-                    f"[dim]Sources: {', '.join(set([s.title for s in relevant_signals]))}[/dim]"
+                    f"[dim]Sources: {', '.join(titles)}"
+                    f"{' (cached)' if result['cached'] else ''}[/dim]"
                 )
 
             if not interactive:
@@ -155,6 +227,15 @@ def ask(
         False, "--interactive", "-i", help="Interactive mode."
     ),
     session_id: Optional[str] = typer.Option(None, "--session", help="Session ID."),
+    mode: str = typer.Option(
+        "hybrid",
+        "--mode",
+        "-m",
+        help="Retrieval mode: hybrid, bm25, fts, vector, ann or keyword.",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Bypass the answer cache for this question."
+    ),
 ):
     """Ask a question or start an interactive chat."""
     asyncio.run(
@@ -163,6 +244,8 @@ def ask(
             interactive=interactive,
             session_id=session_id,
             json_out=json_out,
+            mode=mode,
+            use_cache=settings.ANSWER_CACHE_ENABLED and not no_cache,
         )
     )
 
@@ -188,6 +271,16 @@ def sync(
         False, "--web", "-w", help="Run dynamic web browser scrapes (every 4h)."
     ),
     voice: bool = typer.Option(False, "--voice", "-v", help="Enable voice."),
+    all_topics: bool = typer.Option(
+        False,
+        "--all-topics",
+        help="Research every sweep topic, not just the ones the schedule says are due.",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Finish the last interrupted sweep instead of starting a new one.",
+    ),
 ):
     """Unified intelligence sync."""
 
@@ -201,111 +294,8 @@ def sync(
         shared_intel = IntelligenceAgent()
 
         try:
-            if daily:
-                console.print(
-                    "[bold blue]Starting Daily Intelligence Sweep...[/bold blue]"
-                )
-                # 1. Standard Deep Research Sweep
-                targets = "sweep_targets.txt"
-                if os.path.exists(targets):
-                    with open(targets, "r") as f:
-                        topics = [line.strip() for line in f if line.strip()]
-                    agent = DeepResearchAgent(intel=shared_intel)
-
-                    # Process topics concurrently
-                    sem = asyncio.Semaphore(5)
-
-                    async def process_topic(topic):
-                        async with sem:
-                            console.print(f"[cyan]Researching:[/cyan] {topic}")
-                            try:
-                                text = await agent.research(topic)
-                                await run_ingest(
-                                    f"Title: Deep Research - {topic}\n\n{text}",
-                                    voice,
-                                    shared_intel,
-                                )
-                            except Exception as e:
-                                console.print(f"[red]Error {topic}:[/red] {e}")
-
-                    tasks = [process_topic(t) for t in topics]
-                    await asyncio.gather(*tasks)
-
-                # 2. Automated News Wire Ingestion
-                console.print(
-                    "\n[bold blue]Starting Global News Ingestion...[/bold blue]"
-                )
-                rss_agent = RSSIngestAgent(intel=shared_intel)
-                news_results = await rss_agent.sync_news()
-                for signal, kg in news_results:
-                    await save_ingest_to_db(signal, kg, shared_intel)
-                    console.print(f"[green]Ingested News:[/green] {signal.title}")
-
-                # 2.5 Roam Route Intel Ingestion
-                console.print(
-                    "\n[bold blue]Starting Roam Route Ingestion...[/bold blue]"
-                )
-                import subprocess
-
-                places = ["Dewey", "Rylie", "Pam", "Alex", "Mom", "Ember", "Arcturus"]
-                for place in places:
-                    console.print(f"[cyan]Routing to:[/cyan] {place}")
-                    try:
-                        roam_cmd = [
-                            settings.ROAM_BIN,
-                            "route",
-                            place,
-                            "--weather",
-                            "-F",
-                            "gas",
-                        ]
-                        result = subprocess.run(
-                            roam_cmd, capture_output=True, text=True
-                        )
-                        if result.returncode == 0:
-                            import re
-
-                            clean_out = re.sub(r"\x1b\[[0-9;]*m", "", result.stdout)
-                            final_text = (
-                                f"Title: Route Intel - to {place}\n\n{clean_out}"
-                            )
-                            await run_ingest(final_text, voice, shared_intel)
-                        else:
-                            console.print(
-                                f"[red]Roam failed for {place}:[/red] {result.stderr}"
-                            )
-                    except Exception as e:
-                        console.print(
-                            f"[red]Roam execution error for {place}:[/red] {e}"
-                        )
-
-            if daily or web:
-                # 3. Dynamic Web Browser Sweep
-                dynamic_targets = "dynamic_targets.txt"
-                if os.path.exists(dynamic_targets):
-                    with open(dynamic_targets, "r") as f:
-                        dyn_targets = [
-                            line.strip() for line in f if line.strip() and "|" in line
-                        ]
-
-                    if dyn_targets:
-                        console.print(
-                            "[bold blue]Starting Dynamic Browser Sweep...[/bold blue]"
-                        )
-                        browser_agent = BrowserIngestAgent(intel=shared_intel)
-                        for target in dyn_targets:
-                            parts = target.split("|", 1)
-                            if len(parts) == 2:
-                                url, inst = parts[0].strip(), parts[1].strip()
-                                console.print(f"[cyan]Dynamic Scrape:[/cyan] {url}")
-                                try:
-                                    text = await browser_agent.extract(url, inst)
-                                    final_text = f"Title: Dynamic Web Extraction - {url}\n\n{text}"
-                                    await run_ingest(final_text, voice, shared_intel)
-                                except Exception as e:
-                                    console.print(
-                                        f"[red]Dynamic Scrape failed for {url}:[/red] {e}"
-                                    )
+            if daily or web or resume:
+                await run_sweep(daily, web, resume, all_topics, voice, shared_intel)
 
             if tactical:
                 console.print(
@@ -319,6 +309,7 @@ def sync(
                     seven_days_ago = datetime.now() - timedelta(days=7)
                     baseline_stmt = (
                         select(Signal)
+                        .options(with_body())
                         .where(Signal.title.contains("SITREP"))
                         .where(Signal.date >= seven_days_ago)
                         .order_by(desc(Signal.date))  # type: ignore
@@ -432,110 +423,301 @@ def sync(
 
                 await run_ingest(sitrep_text, voice, shared_intel)
 
+            # Too slow for the per-ingest path; a sync retrains once it is due.
+            if await asyncio.to_thread(get_ann_index().maybe_train):
+                console.print("[dim]IVF index retrained.[/dim]")
+
         finally:
-            pass
+            await close_browser_pool()
+            await close_fetcher()
+            close_html_extractor()
 
     asyncio.run(do_sync())
 
 
+SWEEP_TARGETS = "sweep_targets.txt"
+DYNAMIC_TARGETS = "dynamic_targets.txt"
+ROUTE_PLACES = ["Dewey", "Rylie", "Pam", "Alex", "Mom", "Ember", "Arcturus"]
+
+
+def _read_lines(path: str) -> List[str]:
+    import os
+
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def sweep_tasks(
+    daily: bool, all_topics: bool, scheduler: Optional[SweepScheduler] = None
+) -> List[tuple]:
+    """`(kind, key)` work items of a new sweep, in the order they run."""
+    tasks: List[tuple] = []
+    if daily:
+        topics = _read_lines(SWEEP_TARGETS)
+        if topics:
+            due = topics if all_topics else (scheduler or SweepScheduler()).due(topics)
+            console.print(f"[dim]{len(due)} of {len(topics)} topics due for research[/dim]")
+            tasks += [("topic", topic) for topic in due]
+        tasks.append(("news", "rss"))
+        tasks += [("route", place) for place in ROUTE_PLACES]
+    for line in _read_lines(DYNAMIC_TARGETS):
+        url, sep, inst = line.partition("|")
+        if sep and url.strip():
+            tasks.append(("dynamic", f"{url.strip()}|{inst.strip()}"))
+    return tasks
+
+
+async def run_sweep_tasks(
+    job_id: uuid.UUID,
+    kind: str,
+    handler,
+    concurrency: int = 1,
+    budget: Optional[SweepBudget] = None,
+) -> int:
+    """Run the job's `kind` tasks through `await handler(key)`; returns how many
+    were left for a later run because the budget ran out.
+
+    A handler that raises is retried after its backoff, waiting up to
+    `SWEEP_RETRY_WAIT`; longer backoffs are left for `radar sync --resume`.
+    """
+    sem = asyncio.Semaphore(concurrency)
+    deferred = 0
+
+    async def run(task):
+        nonlocal deferred
+        async with sem:
+            if budget is not None and budget.exhausted():
+                deferred += 1
+                return
+            async with async_session() as session:
+                if not await jobs.acquire(session, task.id):
+                    return
+            try:
+                await handler(task.key)
+            except Exception as e:
+                async with async_session() as session:
+                    status = await jobs.fail(session, task.id, str(e))
+                outcome = "will retry" if status == "pending" else "giving up"
+                console.print(f"[red]{kind} failed for {task.key}:[/red] {e} ({outcome})")
+                return
+            async with async_session() as session:
+                await jobs.complete(session, task.id)
+
+    while True:
+        deferred = 0
+        async with async_session() as session:
+            tasks = await jobs.runnable(session, job_id, kind)
+        if tasks:
+            await asyncio.gather(*(run(task) for task in tasks))
+            if deferred:
+                return deferred
+            continue
+        async with async_session() as session:
+            retry_at = await jobs.next_retry(session, job_id, kind)
+        if retry_at is None:
+            return 0
+        wait = (retry_at - datetime.now()).total_seconds()
+        if wait > settings.SWEEP_RETRY_WAIT:
+            return 0
+        await asyncio.sleep(max(wait, 0))
+
+
+async def run_sweep(
+    daily: bool,
+    web: bool,
+    resume: bool,
+    all_topics: bool,
+    voice: bool,
+    shared_intel: IntelligenceAgent,
+):
+    """The research / news / route / dynamic-browser sweep, as a durable job.
+
+    Every work item is a `SweepTask` committed before any work starts, so an
+    interrupted sweep can be finished with `radar sync --resume`.
+    """
+    import re
+    import subprocess
+
+    kind = "daily" if daily else "web" if web else None
+    scheduler = SweepScheduler()
+    job = None
+    async with async_session() as session:
+        if resume:
+            job = await jobs.latest_unfinished(session, kind)
+            if job is not None:
+                released = await jobs.release_leases(session, job.id)
+                counts = await jobs.progress(session, job.id)
+                console.print(
+                    f"[bold blue]Resuming {job.kind} sweep from "
+                    f"{job.created_at:%Y-%m-%d %H:%M}[/bold blue] "
+                    f"({counts['done']} done, {counts['pending'] + released} to go, "
+                    f"{counts['failed']} failed)"
+                )
+            elif kind is None:
+                console.print("[yellow]No interrupted sweep to resume.[/yellow]")
+                return
+        if job is None:
+            if daily:
+                console.print("[bold blue]Starting Daily Intelligence Sweep...[/bold blue]")
+            job = await jobs.create_job(session, kind, sweep_tasks(daily, all_topics, scheduler))
+    daily = job.kind == "daily"
+
+    if daily:
+        # 1. Standard Deep Research Sweep
+        frontier = URLFrontier()
+        agent = DeepResearchAgent(intel=shared_intel, frontier=frontier)
+
+        async def research_topic(topic: str):
+            console.print(f"[cyan]Researching:[/cyan] {topic}")
+            result = await agent.research(topic)
+            if not result.fetched:
+                # An outage, not an unchanged topic: fail so the job retries it,
+                # and leave its schedule and change rate alone.
+                raise RuntimeError(
+                    f"0 of {result.urls} search results fetched"
+                    + (f"; last error: {result.error}" if result.error else "")
+                )
+            if not result.sources:
+                console.print(f"[dim]No new sources for {topic} ({result.seen} unchanged)[/dim]")
+            elif await run_ingest(
+                f"Title: Deep Research - {topic}\n\n{result.text}", voice, shared_intel
+            ):
+                frontier.commit(topic)
+            else:
+                raise RuntimeError("ingest failed")
+            # Only a finished topic moves its next-due time; a failed one is retried.
+            scheduler.record(topic, result.digest)
+
+        try:
+            deferred = await run_sweep_tasks(
+                job.id, "topic", research_topic, concurrency=5, budget=SweepBudget()
+            )
+        finally:
+            frontier.close()
+            scheduler.save()
+        c = frontier.counts
+        console.print(
+            f"[dim]Frontier: {c['fetched']} pages fetched, {c['shared']} shared "
+            f"between topics, {c['seen']} unchanged sources skipped; "
+            f"{c['cached_searches']} cached / {c['searches']} live searches[/dim]"
+        )
+        if deferred:
+            console.print(
+                f"[yellow]Sweep budget spent; {deferred} topics left for "
+                f"`radar sync --resume`.[/yellow]"
+            )
+
+        # 2. Automated News Wire Ingestion
+        async def ingest_news(_key: str):
+            console.print("\n[bold blue]Starting Global News Ingestion...[/bold blue]")
+            rss_agent = RSSIngestAgent(intel=shared_intel)
+            news_results = await rss_agent.sync_news()
+            await save_ingest_batch([signal for signal, _ in news_results], shared_intel)
+            for signal, kg in news_results:
+                console.print(f"[green]Ingested News:[/green] {signal.title}")
+
+        await run_sweep_tasks(job.id, "news", ingest_news)
+
+        # 2.5 Roam Route Intel Ingestion
+        async def route_intel(place: str):
+            console.print(f"[cyan]Routing to:[/cyan] {place}")
+            roam_cmd = [settings.ROAM_BIN, "route", place, "--weather", "-F", "gas"]
+            result = await asyncio.to_thread(
+                subprocess.run, roam_cmd, capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"roam: {result.stderr.strip()}")
+            clean_out = re.sub(r"\x1b\[[0-9;]*m", "", result.stdout)
+            final_text = f"Title: Route Intel - to {place}\n\n{clean_out}"
+            if not await run_ingest(final_text, voice, shared_intel):
+                raise RuntimeError("ingest failed")
+
+        console.print("\n[bold blue]Starting Roam Route Ingestion...[/bold blue]")
+        await run_sweep_tasks(job.id, "route", route_intel)
+
+    # 3. Dynamic Web Browser Sweep
+    browser_agent = BrowserIngestAgent(intel=shared_intel)
+
+    async def dynamic_scrape(key: str):
+        url, _, inst = key.partition("|")
+        console.print(f"[cyan]Dynamic Scrape:[/cyan] {url}")
+        text = await browser_agent.extract(url, inst)
+        final_text = f"Title: Dynamic Web Extraction - {url}\n\n{text}"
+        if not await run_ingest(final_text, voice, shared_intel):
+            raise RuntimeError("ingest failed")
+
+    async with async_session() as session:
+        has_dynamic = bool(await jobs.runnable(session, job.id, "dynamic"))
+    if has_dynamic:
+        console.print("[bold blue]Starting Dynamic Browser Sweep...[/bold blue]")
+    await run_sweep_tasks(job.id, "dynamic", dynamic_scrape)
+
+    async with async_session() as session:
+        if await jobs.finish_if_done(session, job.id):
+            counts = await jobs.progress(session, job.id)
+            if counts["failed"]:
+                console.print(
+                    f"[yellow]Sweep finished with {counts['failed']} failed tasks.[/yellow]"
+                )
+        else:
+            console.print(
+                "[yellow]Sweep incomplete; finish it with `radar sync --resume`.[/yellow]"
+            )
+
+
 async def save_ingest_to_db(
     signal: Signal, kg: KnowledgeGraphExtraction, intel: IntelligenceAgent
 ):
     """Helper to persist a signal and its extracted stats to SQLite."""
-    extracted_stats = intel.extract_stats(signal.content)
+    await save_ingest_batch([signal], intel)
+
 
+async def save_ingest_batch(
+    signals: List[Signal],
+    intel: IntelligenceAgent,
+    stats: Optional[Dict[uuid.UUID, List[dict]]] = None,
+) -> SaveResult:
+    """Persist signals in one transaction, then update the search indexes.
+
+    See `radar.db.persist.save_signals` for near-duplicate handling.
+    """
     async with async_session() as session:
         try:
-            session.add(signal)
-            await session.flush()
-
-            for s in extracted_stats:
-                category = "GENERAL"
-                t_lower, l_lower = signal.title.lower(), s["label"].lower()
-
-                if any(
-                    k in t_lower
-                    for k in [
-                        "price",
-                        "cost",
-                        "economic",
-                        "finance",
-                        "route intel",
-                        "gas",
-                    ]
-                ):
-                    category = "FINANCE"
-                elif any(
-                    k in t_lower for k in ["benchmark", "performance", "fps", "t/s"]
-                ):
-                    category = "TECH_METRICS"
-                elif any(
-                    k in t_lower or k in l_lower
-                    for k in [
-                        "capacity",
-                        "count",
-                        "stats",
-                        "troops",
-                        "casualties",
-                        "density",
-                        "enforcement",
-                    ]
-                ):
-                    category = "LOGISTICS/OSINT"
-                elif any(
-                    k in t_lower or k in l_lower
-                    for k in [
-                        "sdr",
-                        "radio",
-                        "p25",
-                        "frequency",
-                        "bandwidth",
-                        "encryption",
-                        "noise floor",
-                        "rssi",
-                        "sigint",
-                    ]
-                ):
-                    category = "SIGINT/COMSEC"
-                elif any(
-                    k in t_lower
-                    for k in [
-                        "phishing",
-                        "malware",
-                        "vuln",
-                        "cve",
-                        "zero-day",
-                        "exploit",
-                    ]
-                ):
-                    category = "CYBER_INTEL"
-
-                session.add(
-                    Statistic(
-                        category=category,
-                        label=s["label"],
-                        value=s["value"],
-                        unit=s["unit"],
-                        description=s.get("description"),
-                        source_signal_id=signal.id,
-                    )
-                )
-
-            await session.commit()
+            result = await persist.save_signals(
+                session, signals, intel.extract_stats, stats=stats
+            )
         except Exception as e:
             await session.rollback()
             if "duplicate key" not in str(e).lower():
                 raise
+            return SaveResult()
+
+    for dup, canonical_id, similarity in result.duplicates:
+        console.print(
+            f"[dim]Near-duplicate of {canonical_id.hex[:8]} "
+            f"({similarity:.2f}), {settings.DEDUP_ACTION}: {dup.title}[/dim]"
+        )
+    if result.indexed:
+        bm25 = get_bm25_index()
+        for sid in result.superseded:
+            bm25.remove(sid.hex)
+        for s in result.indexed:
+            bm25.add(s.id.hex, f"{s.title}\n{s.content}")
+        await asyncio.to_thread(bm25.maybe_compact)
+        await intel.embed_signals(result.indexed)
+    return result
 
 
 async def run_ingest(
     text: str, voice: bool, shared_intel: Optional[IntelligenceAgent] = None
-):
+) -> bool:
     import subprocess
 
     agent = TextIngestAgent(intel=shared_intel)
 
-    async def _ingest():
+    async def _ingest() -> bool:
         try:
             signal, kg = await agent.ingest(text)
             intel = shared_intel if shared_intel else agent.intel
@@ -550,10 +732,45 @@ async def run_ingest(
         except Exception as e:
             if "duplicate key value" not in str(e):
                 console.print(f"[red]Ingest failed:[/red] {e}")
-        finally:
-            pass
+                return False
+        return True
+
+    return await _ingest()
 
-    await _ingest()
+
+async def run_batch_ingest(source: str, batch_size: int = 0):
+    """Stream many records through the bounded ingest pipeline."""
+    import sys
+    from radar.core.pipeline import iter_records, run_pipeline
+
+    intel = IntelligenceAgent()
+
+    async def write(signals, stats):
+        result = await save_ingest_batch(signals, intel, stats)
+        return len(result.indexed), result.stats
+
+    with console.status("[bold blue]Ingesting...[/bold blue]") as status:
+
+        def progress(p):
+            status.update(
+                f"[bold blue]Ingested {p.records} records "
+                f"({p.records_per_s:.1f}/s, {p.stats} stats)...[/bold blue]"
+            )
+
+        result = await run_pipeline(
+            iter_records(source, stdin=sys.stdin),
+            intel.parse,
+            write,
+            batch_size=batch_size,
+            progress=progress,
+        )
+    console.print(
+        f"[bold green]Ingested {result.records} records as {result.signals} new signals "
+        f"({result.stats} stats) in {result.seconds:.1f}s, "
+        f"{result.records_per_s:.1f} records/s.[/bold green]"
+    )
+    if result.failed:
+        console.print(f"[red]{result.failed} records in failed batches were not saved.[/red]")
 
 
 @app.command(hidden=True)
@@ -573,17 +790,36 @@ def ingest(
         "-i",
         help="If source is a URL, navigate and extract data based on these instructions.",
     ),
+    batch: bool = typer.Option(
+        False,
+        "--batch",
+        "-b",
+        help="Treat source as a directory, glob or NDJSON file ('-' = NDJSON on stdin) "
+        "and ingest each file/record as its own signal.",
+    ),
+    batch_size: int = typer.Option(0, help="Signals per commit with --batch (0 = INGEST_BATCH)."),
 ):
     """Ingest massive textual intelligence via stdin, file, or URL."""
     import sys
 
+    if batch:
+        if not source:
+            console.print("[red]Error: --batch needs a directory, glob, NDJSON file or '-'.[/red]")
+            raise typer.Exit(code=1)
+        asyncio.run(run_batch_ingest(source, batch_size))
+        return
+
     if source and (source.startswith("http://") or source.startswith("https://")):
         if instructions:
             console.print(f"[bold cyan]Fetching source at:[/bold cyan] {source}")
 
             async def run_dynamic():
                 agent = BrowserIngestAgent()
-                text = await agent.extract(source, instructions)
+                try:
+                    text = await agent.extract(source, instructions)
+                finally:
+                    await close_browser_pool()
+                    close_html_extractor()
                 final_text = f"Title: Web Extraction - {source}\n\n{text}"
                 await run_ingest(final_text, voice)
 
@@ -680,6 +916,7 @@ def report(
             # 1. LIVE TARGETS (Latest SITREP)
             stmt = (
                 select(Signal)
+                .options(with_body())
                 .where(Signal.title.contains("SITREP"))
                 .order_by(desc(Signal.date))
                 .limit(1)
@@ -790,6 +1027,7 @@ def report(
             flights = []
             stmt_sitrep = (
                 select(Signal)
+                .options(with_body())
                 .where(Signal.title.contains("SITREP"))
                 .order_by(desc(Signal.date))
                 .limit(1)
@@ -1035,7 +1273,12 @@ def map():
             pass
 
         async with async_session() as session:
-            stmt = select(Signal).where(Signal.title.contains("SITREP")).limit(100)
+            stmt = (
+                select(Signal)
+                .options(with_body())
+                .where(Signal.title.contains("SITREP"))
+                .limit(100)
+            )
             sitreps = (await session.execute(stmt)).scalars().all()
 
             for s in sitreps:
@@ -1080,6 +1323,7 @@ def serve(port: int = typer.Option(8080, help="Port to run the sync server on.")
         async with async_session() as session:
             stmt = (
                 select(Signal)
+                .options(with_body())
                 .where(Signal.title.contains("SITREP"))
                 .order_by(desc(Signal.date))
                 .limit(5)
@@ -1129,6 +1373,246 @@ def brief(voice: bool = True):
     )
 
 
+@app.command()
+def reindex(
+    compact_only: bool = typer.Option(
+        False, "--compact", help="Only fold pending BM25 deltas into the base segment."
+    ),
+    vectors: bool = typer.Option(
+        False, "--vectors", help="Also re-embed the whole corpus into the vector store."
+    ),
+    ann: bool = typer.Option(
+        False, "--ann", help="Retrain the IVF approximate nearest-neighbour index."
+    ),
+    nlist: int = typer.Option(0, help="IVF list count for --ann (0 = sqrt(N))."),
+):
+    """Rebuild the local search indexes (.radar_index/ and the FTS5 table) from the database."""
+
+    async def _reindex():
+        bm25 = get_bm25_index()
+        if compact_only:
+            folded = await asyncio.to_thread(bm25.compact)
+            console.print(f"[bold green]BM25 compaction folded {folded} documents.[/bold green]")
+            return
+
+        # Signatures first, so signals found to be linked duplicates stay out of
+        # the rebuilt indexes.
+        with console.status("[bold blue]Backfilling MinHash signatures...[/bold blue]"):
+            signed = 0
+            async with async_session() as session:
+                known = set(
+                    (await session.execute(select(SignalMinHash.signal_id))).scalars().all()
+                )
+                async for rows in iter_signal_batches(
+                    session, columns=[Signal.id, Signal.content]
+                ):
+                    for sid, content in rows:
+                        if sid in known:
+                            continue
+                        sig = minhash.signature(content)
+                        if sig is None:
+                            continue
+                        duplicate = await dedup.find_duplicate(session, sig)
+                        await dedup.record(session, sid, sig, *(duplicate or (None, None)))
+                        signed += 1
+                    await session.commit()
+        if signed:
+            console.print(f"[bold green]Signed {signed} signals for near-duplicate detection.[/bold green]")
+
+        with console.status("[bold blue]Rebuilding search indexes...[/bold blue]"):
+            async with async_session() as session:
+                if await fts.ensure_fts(session, backfill=False):
+                    await fts.rebuild_fts(session)
+                    await session.commit()
+                orphans = await chunkstore.collect_garbage(session)
+                await session.commit()
+            # Only tokens are kept in memory, one batch of bodies at a time.
+            tokens = []
+            async with async_session() as session:
+                async for rows in iter_signal_batches(session, canonical_only=True):
+                    tokens += await asyncio.to_thread(
+                        lambda: [(sid.hex, tokenize(f"{t}\n{c}")) for sid, t, c in rows]
+                    )
+            count = await asyncio.to_thread(bm25.rebuild_tokens, tokens)
+        console.print(f"[bold green]Indexed {count} signals.[/bold green]")
+        if orphans:
+            console.print(f"[bold green]Removed {orphans} unreferenced content chunks.[/bold green]")
+
+        if vectors:
+            intel = IntelligenceAgent()
+            store = get_vector_store()
+            tmp = store.start_rebuild()
+            embedded = 0
+            with console.status("[bold blue]Embedding corpus...[/bold blue]") as status:
+                async with async_session() as session:
+                    async for rows in iter_signal_batches(
+                        session, batch_size=settings.EMBED_BATCH_SIZE, canonical_only=True
+                    ):
+                        texts = [f"{title}\n{content}" for _, title, content in rows]
+                        vecs = await asyncio.to_thread(intel.embed_batch, texts)
+                        tmp.append(
+                            [sid.hex for sid, _, _ in rows],
+                            vecs,
+                            model=intel.embedding_name,
+                        )
+                        embedded += len(rows)
+                        status.update(f"[bold blue]Embedded {embedded} signals...[/bold blue]")
+            store.commit_rebuild(tmp)
+            console.print(f"[bold green]Embedded {embedded} signals.[/bold green]")
+
+        if ann:
+            with console.status("[bold blue]Training IVF index...[/bold blue]"):
+                lists = await asyncio.to_thread(get_ann_index().train, nlist or None)
+            console.print(f"[bold green]IVF index trained with {lists} lists.[/bold green]")
+
+    asyncio.run(_reindex())
+
+
+@app.command()
+def reprocess(
+    workers: int = typer.Option(0, help="Extraction processes (0 = REPROCESS_WORKERS or cores)."),
+    batch: int = typer.Option(0, help="Signals per transaction (0 = REPROCESS_BATCH)."),
+    restart: bool = typer.Option(
+        False, "--restart", help="Ignore the checkpoint of an interrupted run."
+    ),
+):
+    """Re-extract Statistic rows for every stored signal with the current patterns."""
+    from radar.db import reprocess as reproc
+
+    async def _reprocess():
+        async with async_session() as session:
+            cursor = await reproc.get_cursor(session)
+            if cursor and not restart:
+                console.print(f"[dim]Resuming after signal {cursor[:8]}...[/dim]")
+            with console.status("[bold blue]Reprocessing signals...[/bold blue]") as status:
+
+                def progress(signals: int, stats: int):
+                    status.update(
+                        f"[bold blue]Reprocessed {signals} signals ({stats} stats)...[/bold blue]"
+                    )
+
+                signals, stats = await reproc.reprocess(
+                    session, workers=workers, batch_size=batch, restart=restart, progress=progress
+                )
+        console.print(
+            f"[bold green]Reprocessed {signals} signals, {stats} stats extracted.[/bold green]"
+        )
+
+    asyncio.run(_reprocess())
+
+
+@app.command()
+def cache(
+    clear: bool = typer.Option(
+        False, "--clear", help="Drop all cached answers and HTTP responses."
+    ),
+):
+    """Show answer-cache and HTTP-cache statistics."""
+
+    async def _cache():
+        http = get_http_cache()
+        async with async_session() as session:
+            if clear:
+                removed = await answer_cache.clear(session)
+                console.print(f"[bold green]Cleared {removed} cached answers.[/bold green]")
+                if http is not None:
+                    removed = http.clear()
+                    console.print(
+                        f"[bold green]Cleared {removed} cached HTTP responses.[/bold green]"
+                    )
+                return
+            st = await answer_cache.stats(session)
+        lookups = st["hits"] + st["misses"]
+        rate = f"{100 * st['hits'] / lookups:.1f}%" if lookups else "n/a"
+        console.print(
+            f"[bold cyan]Answer cache:[/bold cyan] {st['entries']} entries, "
+            f"{st['hits']} hits / {st['misses']} misses (hit rate {rate}), "
+            f"corpus generation {st['generation']}"
+        )
+        if http is None:
+            console.print("[bold cyan]HTTP cache:[/bold cyan] disabled")
+            return
+        hs = http.stats()
+        rate = f"{100 * hs['hit_rate']:.1f}%" if hs["lookups"] else "n/a"
+        console.print(
+            f"[bold cyan]HTTP cache:[/bold cyan] {hs['entries']} entries, "
+            f"{hs['bytes'] / 1e6:.1f} MB; {hs['fresh']} fresh + {hs['revalidated']} "
+            f"revalidated (304) of {hs['lookups']} lookups (hit rate {rate}), "
+            f"{hs['unchanged']} unchanged re-downloads, {hs['bytes_saved'] / 1e6:.1f} MB "
+            f"not downloaded, {hs['evicted']} evictions"
+        )
+
+    asyncio.run(_cache())
+
+
+@app.command(hidden=True)
+def bench(
+    target: str = typer.Argument("ann", help="What to benchmark: ann, extract, ingest."),
+    n: int = typer.Option(100_000, help="Synthetic corpus size."),
+    chars: int = typer.Option(1_000_000, help="Synthetic document size (extract)."),
+    signals: int = typer.Option(500, help="Signals to write (ingest)."),
+    k: int = typer.Option(10, help="Neighbours per query (recall@k)."),
+    use_store: bool = typer.Option(
+        False, "--use-store", help="Benchmark the real .radar_index/ vectors."
+    ),
+):
+    """Micro-benchmarks for the local indexes and the stat extractor."""
+    from rich.table import Table
+    from radar.bench import bench_ann, bench_extract, bench_ingest
+
+    if target == "ingest":
+        with console.status("[bold blue]Benchmarking batched ingest...[/bold blue]"):
+            rows = bench_ingest(n=signals)
+        table = Table(title="[bold green]Ingest throughput (persist.save_signals)[/bold green]")
+        for col in ("BATCH", "SIGNALS", "STATS", "SECONDS", "SIGNALS/S"):
+            table.add_column(col, justify="right")
+        for r in rows:
+            table.add_row(
+                str(r["batch"]),
+                str(r["signals"]),
+                str(r["stats"]),
+                f"{r['seconds']:.2f}",
+                f"{r['signals_per_s']:.1f}",
+            )
+        console.print(table)
+        return
+
+    if target == "extract":
+        with console.status("[bold blue]Benchmarking stat extraction...[/bold blue]"):
+            rows = bench_extract(chars=chars)
+        table = Table(title="[bold green]extract_stats throughput[/bold green]")
+        for col in ("DOC", "CHARS", "STATS", "SECONDS", "MB/S"):
+            table.add_column(col, justify="right")
+        for r in rows:
+            table.add_row(
+                str(r["doc"]),
+                f"{r['chars']:,}",
+                str(r["stats"]),
+                f"{r['seconds']:.3f}",
+                f"{r['mb_per_s']:.2f}",
+            )
+        console.print(table)
+        return
+
+    if target != "ann":
+        console.print(f"[red]Unknown benchmark target: {target}[/red]")
+        raise typer.Exit(code=1)
+
+    with console.status("[bold blue]Benchmarking IVF vs exact search...[/bold blue]"):
+        rows = bench_ann(n=n, k=k, root=settings.INDEX_DIR if use_store else None)
+    if not rows:
+        console.print("[yellow]No vectors to benchmark.[/yellow]")
+        return
+    table = Table(title=f"[bold green]IVF recall@{k} (nlist={rows[0]['nlist']})[/bold green]")
+    table.add_column("NPROBE")
+    table.add_column("RECALL", justify="right")
+    table.add_column("MS/QUERY", justify="right")
+    for r in rows:
+        table.add_row(str(r["nprobe"]), f"{r['recall']:.3f}", f"{r['ms_per_query']:.2f}")
+    console.print(table)
+    console.print(f"[dim]Training took {rows[0]['train_s']:.1f}s[/dim]")
+
+
 @app.command()
 def init():
     """Initialize the local SQLite database and verify table integrity."""
@@ -10,17 +10,18 @@ from textual.widgets import (
     ListItem,
     ListView,
 )
+from radar.core.ingest import IntelligenceAgent
 from radar.db.engine import async_session
-from radar.db.models import Signal, TacticalAlert
+from radar.db.models import Signal, TacticalAlert, with_body
 from sqlalchemy import select, desc
 import textwrap
 
 
 class SignalItem(ListItem):
-    def __init__(self, title: str, content: str):
+    def __init__(self, signal_id, title: str):
         super().__init__()
+        self.signal_id = signal_id
         self.signal_title = title
-        self.signal_content = content
 
     def compose(self) -> ComposeResult:
         yield Label(f"📡 {self.signal_title}", classes="signal-title")
@@ -68,6 +69,7 @@ class RadarApp(App):
 
     async def on_mount(self) -> None:
         self.title = "Radar Mission Control"
+        self.intel = IntelligenceAgent()
         await self.action_refresh_data()
 
     def compose(self) -> ComposeResult:
@@ -91,7 +93,7 @@ class RadarApp(App):
         """Fetch latest signals and alerts from the database."""
         try:
             async with async_session() as session:
-                # Get Signals
+                # Get Signals (titles only; bodies stay deferred until opened)
                 stmt = select(Signal).order_by(desc(Signal.date)).limit(50)  # type: ignore
                 results = await session.execute(stmt)
                 signals = results.scalars().all()
@@ -99,7 +101,7 @@ class RadarApp(App):
                 list_view = self.query_one("#signal-list", ListView)
                 await list_view.clear()
                 for s in signals:
-                    await list_view.append(SignalItem(s.title, s.content))
+                    await list_view.append(SignalItem(s.id, s.title))
 
                 # Get Alerts
                 astmt = (
@@ -123,18 +125,35 @@ class RadarApp(App):
         item = event.item
         if isinstance(item, SignalItem):
             viewer = self.query_one("#document-content", Static)
-            wrapped = "\n".join(textwrap.wrap(item.signal_content, width=120))
+            async with async_session() as session:
+                signal = await session.get(Signal, item.signal_id, options=[with_body()])
+            content = signal.content if signal else ""
+            wrapped = "\n".join(textwrap.wrap(content, width=120))
             viewer.update(wrapped)
 
     async def on_input_submitted(self, event: Input.Submitted) -> None:
-        """Handle BM25s searches."""
+        """Handle BM25s searches against the persistent .radar_index/ segments."""
         query = event.value
         viewer = self.query_one("#document-content", Static)
         if not query.strip():
             return
 
+        viewer.update(f"Searching BM25 index for: {query}")
+        try:
+            hits = await self.intel.search_hits(query, limit=20, mode="bm25", body=False)
+        except Exception as e:
+            viewer.update(f"Search error: {e}")
+            return
+
+        list_view = self.query_one("#signal-list", ListView)
+        await list_view.clear()
+        for h in hits:
+            await list_view.append(SignalItem(h.signal.id, h.signal.title))
         viewer.update(
-            f"Searching BM25 index for: {query}\n[Implement BM25s hook here...]"
+            "\n".join(
+                [f"{len(hits)} results for: {query}"]
+                + [f"{h.score:6.2f}  {h.signal.title}" for h in hits]
+            )
         )
 
 
@@ -0,0 +1,70 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlmodel import SQLModel
+
+
+@pytest.fixture(autouse=True)
+def temp_index_dir(tmp_path, monkeypatch):
+    """Keep .radar_index/ artifacts out of the working tree."""
+    from radar.config import settings
+    from radar.core import ann, bm25_index, http_cache, vector_store
+
+    index_dir = tmp_path / "radar_index"
+    monkeypatch.setattr(settings, "INDEX_DIR", str(index_dir))
+    monkeypatch.setattr(bm25_index, "_indexes", {})
+    monkeypatch.setattr(vector_store, "_stores", {})
+    monkeypatch.setattr(ann, "_indexes", {})
+    monkeypatch.setattr(http_cache, "_cache", None)
+    return index_dir
+
+
+class FakeEmbeddingModel:
+    """Deterministic bag-of-words stand-in for sentence-transformers."""
+
+    dim = 64
+
+    def encode(self, texts, **kwargs):
+        import re
+        import zlib
+        import numpy as np
+
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, t in enumerate(texts):
+            for tok in re.findall(r"[a-z0-9]+", t.lower()):
+                out[i, zlib.crc32(tok.encode()) % self.dim] += 1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+@pytest.fixture
+def fake_embedder():
+    return FakeEmbeddingModel()
+
+
+@pytest_asyncio.fixture
+async def temp_db(tmp_path):
+    """A throwaway SQLite database wired into every module that opens sessions."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'radar.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    with (
+        patch("radar.core.ingest.async_session", session_factory),
+        patch("radar.main.async_session", session_factory),
+    ):
+        yield session_factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def sample_texts():
+    return [
+        "Title: Gas Prices in Tioga County\nGas: $3.45 at the Wellsboro station. Diesel rose 4.5% this week.",
+        "Title: Master Tactical SITREP\nRiver levels nominal. 3 drones observed near the river gauge.",
+        "Title: Deep Research - GMRS Operations\nGMRS repeaters use 12.5 kHz channel spacing and 256-bit AES keys.",
+    ]
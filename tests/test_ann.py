@@ -0,0 +1,67 @@
+import numpy as np
+from radar.core.ann import IVFIndex
+from radar.core.vector_store import VectorStore
+
+
+def _clustered(n=2000, dim=32, centers=20, seed=0):
+    rng = np.random.default_rng(seed)
+    c = rng.normal(size=(centers, dim))
+    x = c[rng.integers(0, centers, n)] + 0.3 * rng.normal(size=(n, dim))
+    return x.astype(np.float32)
+
+
+def test_train_and_search_matches_exact(tmp_path):
+    store = VectorStore(str(tmp_path))
+    vecs = _clustered()
+    store.append([f"id{i}" for i in range(len(vecs))], vecs)
+    index = IVFIndex(str(tmp_path), store)
+    assert index.train(nlist=16) == 16
+    assert index.trained
+
+    hits = 0
+    for q in vecs[:50]:
+        exact = {sid for sid, _ in store.search(q, k=10)}
+        approx = {sid for sid, _ in index.search(q, k=10, nprobe=4)}
+        hits += len(exact & approx)
+    assert hits / 500 > 0.9
+
+
+def test_new_rows_are_searchable_before_and_after_assignment(tmp_path):
+    store = VectorStore(str(tmp_path))
+    vecs = _clustered()
+    store.append([f"id{i}" for i in range(1000)], vecs[:1000])
+    index = IVFIndex(str(tmp_path), store)
+    index.train(nlist=8)
+
+    store.append(["fresh"], vecs[1500:1501])
+    # Unassigned tail is scanned exactly.
+    assert index.search(vecs[1500], k=1, nprobe=1)[0][0] == "fresh"
+    assert index.add_new_rows() == 1
+    assert index.add_new_rows() == 0
+    assert index.search(vecs[1500], k=1, nprobe=8)[0][0] == "fresh"
+
+
+def test_rebuilt_store_invalidates_index(tmp_path):
+    store = VectorStore(str(tmp_path))
+    vecs = _clustered(n=500)
+    store.append([f"id{i}" for i in range(500)], vecs)
+    index = IVFIndex(str(tmp_path), store)
+    index.train(nlist=4)
+
+    store.rebuild([(["a", "b"], vecs[:2])])
+    assert not index.trained
+    assert index.search(vecs[1], k=1)[0][0] == "b"
+
+
+def test_maybe_train_runs_in_foreground_once_due(tmp_path, monkeypatch):
+    monkeypatch.setattr("radar.core.ann.settings.ANN_MIN_TRAIN", 400)
+    store = VectorStore(str(tmp_path))
+    vecs = _clustered(n=800)
+    store.append([f"id{i}" for i in range(300)], vecs[:300])
+    index = IVFIndex(str(tmp_path), store)
+    assert not index.maybe_train()
+
+    store.append([f"id{i}" for i in range(300, 500)], vecs[300:500])
+    assert index.maybe_train()
+    assert index.trained  # finished before returning
+    assert not index.maybe_train()  # not due again until the store doubles
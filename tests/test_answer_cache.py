@@ -0,0 +1,52 @@
+import json
+
+import pytest
+from radar.config import settings
+from radar.core.ingest import IntelligenceAgent
+from radar.db import answer_cache
+from radar.main import do_ask_logic, save_ingest_to_db
+
+
+def test_normalized_key_ignores_case_and_punctuation():
+    a = answer_cache.cache_key("What are GAS prices?", mode="hybrid")
+    b = answer_cache.cache_key("  what are gas   prices", mode="hybrid")
+    assert a == b
+    assert a != answer_cache.cache_key("what are gas prices", mode="bm25")
+
+
+@pytest.mark.asyncio
+async def test_ask_answers_from_cache_until_corpus_changes(
+    temp_db, sample_texts, monkeypatch, capsys
+):
+    monkeypatch.setattr(settings, "EMBEDDINGS_ENABLED", False)
+    calls = []
+
+    async def fake_answer(self, question, signals, passages=None):
+        calls.append(question)
+        return f"answer #{len(calls)}"
+
+    monkeypatch.setattr(IntelligenceAgent, "answer_question", fake_answer)
+    intel = IntelligenceAgent()
+    for t in sample_texts[:2]:
+        signal, kg = await intel.parse(t)
+        await save_ingest_to_db(signal, kg, intel)
+
+    async def ask(q):
+        await do_ask_logic(q, json_out=True)
+        out = capsys.readouterr().out
+        return json.loads(out[out.index("{") :])
+
+    first = await ask("Gas prices?")
+    second = await ask("gas PRICES")
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert second["answer"] == first["answer"] == "answer #1"
+    assert second["sources"] == first["sources"]
+
+    signal, kg = await intel.parse(sample_texts[2])
+    await save_ingest_to_db(signal, kg, intel)
+    third = await ask("gas prices")
+    assert not third["cached"] and third["answer"] == "answer #2"
+
+    async with temp_db() as session:
+        st = await answer_cache.stats(session)
+    assert st == {"entries": 1, "hits": 1, "misses": 2, "generation": 3}
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import pytest
+from radar.core.bm25_index import BM25Index
+from radar.core.ingest import IntelligenceAgent
+from radar.main import save_ingest_to_db
+
+
+def test_delta_then_compact_then_reload(tmp_path):
+    index = BM25Index(str(tmp_path))
+    index.add("a", "gas prices rose in tioga county")
+    index.add("b", "river gauge levels nominal")
+    assert [sid for sid, _ in index.search("river levels")] == ["b"]
+
+    assert index.compact() == 2
+    assert index.delta_count() == 0
+    index.add("c", "second river flood warning for the river")
+
+    reopened = BM25Index(str(tmp_path))
+    ranked = [sid for sid, _ in reopened.search("river", k=5)]
+    assert set(ranked) == {"b", "c"}
+    assert reopened._base is not None  # base segment came back from disk
+
+
+def test_delta_version_supersedes_base(tmp_path):
+    index = BM25Index(str(tmp_path))
+    index.rebuild([("a", "old drone report"), ("b", "gas prices")])
+    index.add("a", "updated aircraft report")
+    assert index.search("drone") == []
+    assert [sid for sid, _ in index.search("aircraft")] == ["a"]
+
+
+def test_superseded_base_hits_do_not_shrink_results(tmp_path):
+    index = BM25Index(str(tmp_path))
+    top = [(f"top{i}", "drone drone drone sighting") for i in range(3)]
+    low = [(f"low{i}", f"drone sighting number {i} filed late") for i in range(5)]
+    index.rebuild(top + low)
+    for i in range(3):
+        index.remove(f"top{i}")
+    ranked = [sid for sid, _ in index.search("drone", k=3)]
+    assert len(ranked) == 3 and all(sid.startswith("low") for sid in ranked)
+
+
+def test_base_and_delta_fused_by_rank(tmp_path):
+    index = BM25Index(str(tmp_path))
+    # Segment scores use different IDF/length statistics; the best hit of
+    # each segment must survive the merge whatever their raw scales.
+    docs = [(f"b{i}", f"river report {i}") for i in range(20)]
+    index.rebuild(docs + [("gauge", "river river gauge")])
+    index.add("d", "river")
+    ranked = [sid for sid, _ in index.search("river gauge", k=2)]
+    assert set(ranked) == {"gauge", "d"}
+
+
+def test_compaction_runs_in_foreground_under_file_lock(tmp_path):
+    index = BM25Index(str(tmp_path))
+    index.add("a", "gas prices")
+    with patch("radar.core.bm25_index.settings.BM25_COMPACT_THRESHOLD", 1):
+        with index._file_lock("compact.lock"):
+            assert not BM25Index(str(tmp_path)).maybe_compact()  # another process holds it
+        assert index.maybe_compact()
+    assert index.delta_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_ingest_appends_and_ask_queries_index(temp_db, sample_texts):
+    intel = IntelligenceAgent()
+    for t in sample_texts:
+        signal, kg = await intel.parse(t)
+        await save_ingest_to_db(signal, kg, intel)
+
+    hits = await intel.search_hits("GMRS channel spacing", mode="bm25")
+    assert hits[0].signal.title == "Title: Deep Research - GMRS Operations"
+    assert hits[0].score > 0
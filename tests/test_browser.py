@@ -0,0 +1,196 @@
+import asyncio
+
+import pytest
+
+from radar.config import settings
+from radar.core.browser import BrowserPool
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = 0
+        self.closed = False
+
+    async def new_page(self):
+        if not self.browser.connected:
+            raise RuntimeError("Target closed")
+        self.pages += 1
+        return object()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self):
+        ctx = FakeContext(self)
+        self.contexts.append(ctx)
+        return ctx
+
+    async def close(self):
+        self.connected = False
+
+
+def _pool(**kw):
+    browsers = []
+
+    async def launch():
+        browsers.append(FakeBrowser())
+        return browsers[-1]
+
+    return BrowserPool(launcher=launch, **kw), browsers
+
+
+@pytest.mark.asyncio
+async def test_one_launch_shared_by_isolated_leases():
+    pool, browsers = _pool(max_contexts=2)
+    active = peak = 0
+
+    async def task():
+        nonlocal active, peak
+        async with pool.lease() as lease:
+            active += 1
+            peak = max(peak, active)
+            await lease.new_page()
+            await asyncio.sleep(0.01)
+            active -= 1
+            return lease.context
+
+    contexts = await asyncio.gather(*(task() for _ in range(6)))
+    assert len(browsers) == 1
+    assert len({id(c) for c in contexts}) == 6  # a fresh context per task
+    assert all(c.closed for c in contexts)
+    assert peak == 2
+    await pool.close()
+    assert not browsers[0].connected
+
+
+@pytest.mark.asyncio
+async def test_context_recycled_after_page_budget(monkeypatch):
+    monkeypatch.setattr(settings, "BROWSER_PAGES_PER_CONTEXT", 2)
+    pool, browsers = _pool()
+    async with pool.lease() as lease:
+        for _ in range(5):
+            await lease.new_page()
+    assert [c.pages for c in browsers[0].contexts] == [2, 2, 1]
+    assert all(c.closed for c in browsers[0].contexts)
+
+
+@pytest.mark.asyncio
+async def test_crashed_browser_is_relaunched():
+    pool, browsers = _pool()
+    async with pool.lease() as lease:
+        await lease.new_page()
+        browsers[0].connected = False  # renderer crash mid-task
+        await lease.new_page()
+    async with pool.lease() as lease:
+        await lease.new_page()
+    assert len(browsers) == 2 and pool.launches == 2
+
+
+class SlowPage:
+    delays = {}
+
+    def __init__(self):
+        self.url = None
+
+    async def goto(self, url, **kw):
+        self.url = url
+        delay = self.delays[url]
+        if delay is None:
+            raise RuntimeError("net::ERR_HTTP2_PROTOCOL_ERROR")
+        await asyncio.sleep(delay)
+
+    async def content(self):
+        return f"<html><body><p>{self.url} body text</p></body></html>"
+
+    async def close(self):
+        pass
+
+
+class SlowContext(FakeContext):
+    async def new_page(self):
+        return SlowPage()
+
+
+@pytest.mark.asyncio
+async def test_research_fetches_concurrently_in_rank_order(monkeypatch, tmp_path):
+    import sys
+    import types
+    import time
+
+    from radar.core.frontier import SearchCache, SeenURLs, URLFrontier
+    from radar.core.ingest import DeepResearchAgent
+
+    def frontier():
+        return URLFrontier(
+            SearchCache(str(tmp_path / "search.json")), SeenURLs(str(tmp_path / "seen.bloom"))
+        )
+
+    urls = [f"https://site{i}.example/" for i in range(5)]
+    SlowPage.delays = dict(zip(urls, [0.2, 0.2, None, 5.0, 0.1]))
+
+    class DDGS:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def text(self, topic, max_results):
+            return [{"href": u} for u in urls]
+
+    monkeypatch.setitem(sys.modules, "ddgs", types.SimpleNamespace(DDGS=DDGS))
+    monkeypatch.setattr(asyncio, "sleep", _fast_settle(asyncio.sleep))
+    monkeypatch.setattr(settings, "RESEARCH_DEADLINE", 1.0)
+    monkeypatch.setattr(settings, "FETCH_HTTP_FIRST", False)
+
+    async def launch():
+        browser = FakeBrowser()
+        browser.new_context = lambda: _async(SlowContext(browser))
+        return browser
+
+    agent = DeepResearchAgent(browser_pool=BrowserPool(launcher=launch), frontier=frontier())
+
+    async def clean_html(html):
+        return html[18:-21]
+
+    agent.intel.clean_html = clean_html
+    started = time.perf_counter()
+    result = await agent.research("topic")
+    elapsed = time.perf_counter() - started
+
+    sources = [line for line in result.text.splitlines() if line.startswith("--- Source:")]
+    assert sources == [f"--- Source: {u} ---" for u in (urls[0], urls[1], urls[4])]
+    assert (result.urls, result.fetched, result.seen) == (5, 3, 0)
+    assert result.error == f"{urls[3]}: not done in 1s"  # the last one to fail
+    assert elapsed < 2.0  # deadline, not the 5 s straggler or the sum of page times
+
+    # The next sweep, after ingesting: every source is filtered as seen, yet
+    # the digest the scheduler hashes is unchanged.
+    agent.frontier.commit("topic")
+    agent.frontier.close()
+    agent.frontier = frontier()
+    again = await agent.research("topic")
+    assert (again.fetched, again.seen, again.text) == (3, 3, "🎯 topic\n")
+    assert again.digest == result.digest
+
+
+def _fast_settle(real_sleep):
+    async def sleep(delay, *args):
+        # The fixed post-load settle (3 s) is not what is being measured.
+        return await real_sleep(0 if delay == 3 else delay, *args)
+
+    return sleep
+
+
+async def _async(value):
+    return value
@@ -0,0 +1,158 @@
+import random
+
+import pytest
+from sqlalchemy import func, select, text
+from radar.config import settings
+from radar.core.ingest import IntelligenceAgent
+from radar.db import chunkstore, fts
+from radar.db.corpus import iter_signal_batches
+from radar.db.models import ContentChunk, Signal, with_body
+from radar.main import save_ingest_to_db
+
+
+def _report(seed=0, lines=300):
+    rng = random.Random(seed)
+    words = "river gauge aircraft grid sector nominal station drone relay county".split()
+    return "\n".join(
+        f"Line {i}: " + " ".join(rng.choice(words) for _ in range(12)) for i in range(lines)
+    )
+
+
+def test_chunk_spans_are_content_defined():
+    base = _report()
+    edited = base.replace("Line 150:", "Line 150 (amended):")
+    spans = chunkstore.chunk_spans(base)
+    assert spans[0][0] == 0 and spans[-1][1] == len(base)
+    assert all(a < b <= a + chunkstore.MAX_CHUNK for a, b in spans)
+    assert all(b2 == a1 for (_, b2), (a1, _) in zip(spans, spans[1:]))
+
+    before = {h for h, _ in chunkstore.split(base)}
+    after = {h for h, _ in chunkstore.split(edited)}
+    assert len(after - before) <= 2  # only the chunk(s) around the edit change
+    assert len(before) > 10
+
+
+@pytest.mark.asyncio
+async def test_signal_content_round_trips_through_chunk_store(temp_db, monkeypatch):
+    monkeypatch.setattr(settings, "DEDUP_ACTION", "off")
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+    first = _report()
+    second = first.replace("Line 42:", "Line 42 (update): drones spotted near the relay.")
+    for body in (first, second):
+        signal = Signal(title="Title: Master Tactical SITREP", content=body, source="test")
+        await save_ingest_to_db(signal, None, intel)
+        assert signal.content == body  # in-memory object keeps its text after flush
+
+    async with temp_db() as session:
+        raw = (await session.execute(text("SELECT content, chunk_refs FROM signal"))).all()
+        assert all(content == "" and refs for content, refs in raw)
+        chunks = (await session.execute(select(func.count()).select_from(ContentChunk))).scalar()
+        assert chunks < 1.3 * len(chunkstore.chunk_spans(first))
+
+    chunkstore._cache.clear()
+    async with temp_db() as session:
+        loaded = (await session.execute(select(Signal).options(with_body()).order_by(Signal.date))).scalars().all()
+        assert [s.content for s in loaded] == [first, second]
+        rows = [r async for batch in iter_signal_batches(session) for r in batch]
+        assert sorted(r[2] for r in rows) == sorted([first, second])
+
+    hits = await intel.search_hits("spotted", mode="keyword")
+    assert [h.signal.content for h in hits] == [second]
+
+    fts._ready.clear()
+    async with temp_db() as session:
+        assert await fts.rebuild_fts(session) == 2
+        await session.commit()
+    hits = await intel.search_hits("drones spotted", mode="fts")
+    assert hits[0].signal.content == second
+
+
+@pytest.mark.asyncio
+async def test_garbage_collection_keeps_only_referenced_chunks(temp_db, monkeypatch):
+    monkeypatch.setattr(settings, "DEDUP_ACTION", "off")
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+    kept, dropped = (
+        Signal(title="Title: SITREP", content=_report(seed), source="test") for seed in (1, 2)
+    )
+    for signal in (kept, dropped):
+        await save_ingest_to_db(signal, None, intel)
+
+    async with temp_db() as session:
+        await session.delete(await session.get(Signal, dropped.id))
+        await session.commit()
+        live = {h for h, _ in chunkstore.split(kept.content)}
+        stored = set((await session.execute(select(ContentChunk.hash))).scalars().all())
+        assert await chunkstore.collect_garbage(session) == len(stored - live)
+        await session.commit()
+
+    chunkstore._cache.clear()
+    async with temp_db() as session:
+        stored = set((await session.execute(select(ContentChunk.hash))).scalars().all())
+        assert stored == live
+        (body,) = [r[2] async for batch in iter_signal_batches(session) for r in batch]
+        assert body == kept.content
+
+
+@pytest.mark.asyncio
+async def test_short_bodies_stay_inline(temp_db):
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+    signal = Signal(title="Title: short", content="Gas: $3.45", source="test")
+    await save_ingest_to_db(signal, None, intel)
+    async with temp_db() as session:
+        row = (await session.execute(text("SELECT content, chunk_refs FROM signal"))).one()
+    assert row == ("Gas: $3.45", None)
+
+
+@pytest.mark.asyncio
+async def test_init_adds_missing_columns(tmp_path):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlmodel import SQLModel
+    from radar.db.init import _add_missing_columns
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "CREATE TABLE signal (id CHAR(32) PRIMARY KEY, title VARCHAR NOT NULL, "
+            "content VARCHAR NOT NULL, source VARCHAR NOT NULL, url VARCHAR, date DATETIME NOT NULL)"
+        )
+        await conn.run_sync(SQLModel.metadata.create_all)
+        assert "signal.chunk_refs" in await conn.run_sync(_add_missing_columns)
+        assert await conn.run_sync(_add_missing_columns) == []
+    await engine.dispose()
+
+
+@pytest.mark.parametrize("codec", ["zlib", "none", "zstd"])
+def test_chunk_codecs_round_trip(monkeypatch, codec):
+    monkeypatch.setattr(settings, "CONTENT_COMPRESSION", codec)
+    piece = _report(lines=40)
+    blob = chunkstore.encode_chunk(piece)
+    assert chunkstore.decode_chunk(blob) == piece
+    if codec != "none":  # zstd falls back to zlib when zstandard is missing
+        assert len(blob) < len(piece.encode()) / 2
+
+
+@pytest.mark.asyncio
+async def test_list_queries_defer_compressed_bodies(temp_db, monkeypatch):
+    monkeypatch.setattr(settings, "DEDUP_ACTION", "off")
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+    body = _report(seed=3)
+    await save_ingest_to_db(Signal(title="Title: report", content=body, source="t"), None, intel)
+
+    async with temp_db() as session:
+        stored = (await session.execute(select(func.sum(func.length(ContentChunk.data))))).scalar()
+        assert stored < len(body) / 2
+
+        listed = (await session.execute(select(Signal))).scalars().one()
+        assert "content" not in listed.__dict__ and listed.title == "Title: report"
+
+    chunkstore._cache.clear()
+    async with temp_db() as session:
+        opened = await session.get(Signal, listed.id, options=[with_body()])
+        assert opened.content == body
+
+    hits = await intel.search_hits("river gauge", mode="fts", body=False)
+    assert hits and "content" not in hits[0].signal.__dict__
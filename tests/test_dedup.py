@@ -0,0 +1,124 @@
+import pytest
+from sqlalchemy import func, select, text
+from radar.config import settings
+from radar.core import minhash
+from radar.core.ingest import IntelligenceAgent
+from radar.db.models import Signal, SignalMinHash, Statistic, with_body
+from radar.main import save_ingest_to_db
+
+SITREP = "Title: Master Tactical SITREP\n" + "\n".join(
+    f"Sector {i}: river gauge {i}.{i} ft, {i} aircraft tracked, grid nominal, "
+    f"gas $3.{i}5 at station {i}."
+    for i in range(1, 30)
+)
+
+
+def test_signature_similarity_tracks_jaccard():
+    a = minhash.signature(SITREP)
+    b = minhash.signature(SITREP.replace("Sector 7:", "Sector 7 (updated):"))
+    c = minhash.signature("Completely unrelated text about GMRS repeater spacing and AES keys.")
+    assert minhash.similarity(a, a) == 1.0
+    assert minhash.similarity(a, b) > 0.9
+    assert minhash.similarity(a, c) < 0.1
+    assert minhash.from_bytes(minhash.to_bytes(a)).tolist() == a.tolist()
+    assert len(set(minhash.band_keys(a)) & set(minhash.band_keys(b))) > 0
+
+
+async def _ingest_twice(temp_db):
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+    for text in (SITREP, SITREP.replace("gas $3.75", "gas $3.99")):
+        signal, kg = await intel.parse(text)
+        await save_ingest_to_db(signal, kg, intel)
+    async with temp_db() as session:
+        signals = (await session.execute(select(Signal).options(with_body()).order_by(Signal.date))).scalars().all()
+        stats = (await session.execute(select(func.count()).select_from(Statistic))).scalar()
+        links = (await session.execute(select(SignalMinHash))).scalars().all()
+    return intel, signals, stats, links
+
+
+@pytest.mark.asyncio
+async def test_link_promotes_newest_and_keeps_history(temp_db):
+    intel, signals, stats, links = await _ingest_twice(temp_db)
+    assert len(signals) == 2
+    old, new = signals
+    linked = {l.signal_id: l.duplicate_of for l in links}
+    assert linked[new.id] is None
+    assert linked[old.id] == new.id
+    # Both reports keep their stats: the older as history, the newer extracted.
+    assert stats == 2 * len(intel.extract_stats(SITREP))
+    for mode in ("fts", "bm25"):
+        hits = await intel.search_hits("river gauge", mode=mode, limit=5)
+        assert [h.signal.id for h in hits] == [new.id]
+
+    # A third report takes over the whole cluster.
+    signal, kg = await intel.parse(SITREP.replace("gas $3.75", "gas $4.05"))
+    await save_ingest_to_db(signal, kg, intel)
+    async with temp_db() as session:
+        links = (await session.execute(select(SignalMinHash))).scalars().all()
+    assert {l.signal_id: l.duplicate_of for l in links} == {
+        old.id: signal.id,
+        new.id: signal.id,
+        signal.id: None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_reindex_leaves_out_linked_duplicates(temp_db):
+    from radar.db import fts
+    from radar.db.corpus import iter_signal_batches
+
+    _, (_, new), _, _ = await _ingest_twice(temp_db)
+    async with temp_db() as session:
+        batches = iter_signal_batches(session, canonical_only=True)
+        assert [sid async for rows in batches for sid, _, _ in rows] == [new.id]
+        assert await fts.rebuild_fts(session) == 1
+
+
+@pytest.mark.asyncio
+async def test_reindex_command_rebuilds_each_index_once(temp_db, monkeypatch):
+    import asyncio
+
+    from typer.testing import CliRunner
+
+    from radar.core.bm25_index import get_bm25_index
+    from radar.db import fts
+    from radar.main import app
+
+    _, (_, new), _, _ = await _ingest_twice(temp_db)
+    fts._ready.clear()
+    async with temp_db() as session:
+        await session.execute(text("DROP TABLE signal_fts"))  # ensure_fts must recreate it
+        await session.commit()
+    rebuilds = []
+    rebuild_fts = fts.rebuild_fts
+
+    async def counting(session):
+        rebuilds.append(session)
+        return await rebuild_fts(session)
+
+    monkeypatch.setattr(fts, "rebuild_fts", counting)
+    result = await asyncio.to_thread(CliRunner().invoke, app, ["reindex"])
+    assert result.exit_code == 0, result.output
+    assert len(rebuilds) == 1
+    assert [sid for sid, _ in get_bm25_index().search("river gauge")] == [new.id.hex]
+
+@pytest.mark.asyncio
+async def test_skip_and_merge(temp_db, monkeypatch):
+    monkeypatch.setattr(settings, "DEDUP_ACTION", "merge")
+    intel, signals, stats, _ = await _ingest_twice(temp_db)
+    assert len(signals) == 1
+    assert "gas $3.99" in signals[0].content
+    # Stats were re-extracted from the merged text, not kept from the old one.
+    async with temp_db() as session:
+        values = (await session.execute(select(Statistic.value))).scalars().all()
+    assert stats == len(intel.extract_stats(SITREP))
+    assert 3.99 in values and 3.75 not in values
+
+    monkeypatch.setattr(settings, "DEDUP_ACTION", "skip")
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+    signal, kg = await intel.parse(SITREP)
+    await save_ingest_to_db(signal, kg, intel)
+    async with temp_db() as session:
+        assert (await session.execute(select(func.count()).select_from(Signal))).scalar() == 1
@@ -0,0 +1,32 @@
+import json
+from pathlib import Path
+
+from radar.bench import synthetic_report
+from radar.core.extract import extract_stats
+
+DATA = Path(__file__).parent / "data"
+
+
+def test_matches_golden_output():
+    text = (DATA / "extract_sample.txt").read_text()
+    golden = json.loads((DATA / "extract_golden.json").read_text())
+    assert extract_stats(text) == golden
+
+
+def test_overlapping_patterns_and_usd_dedup():
+    stats = extract_stats("Budget hit $5M. Gas: $3.45 and diesel $3.45, tolls $2, $2.")
+    usd = [(s["label"], s["value"]) for s in stats if s["unit"] == "USD"]
+    # "$5M" is both a scaled amount and a plain "$5"; repeated prices appear once.
+    assert usd == [
+        ("Budget Hit", 5_000_000.0),
+        ("Gas Price", 3.45),
+        ("Budget Hit", 5.0),
+        ("Tolls", 2.0),
+    ]
+
+
+def test_handles_megabyte_documents():
+    text = synthetic_report(1_000_000)
+    stats = extract_stats(text)
+    assert len(text) >= 1_000_000
+    assert stats and all(s["description"] for s in stats)
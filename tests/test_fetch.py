@@ -0,0 +1,93 @@
+import httpx
+import pytest
+
+from radar.config import settings
+from radar.core.fetch import AdaptiveFetcher, HostMemory, cached_get, extraction_quality
+from radar.core.http_cache import ResponseTooLarge
+
+ARTICLE = "<html><body><article>" + "<p>Static article text.</p>" * 200 + "</article></body></html>"
+SHELL = '<html><body><div id="root"></div><noscript>Please enable JavaScript</noscript></body></html>'
+
+
+def _fetcher(tmp_path, pages, requests=None):
+    def handler(request):
+        if requests is not None:
+            requests.append(str(request.url))
+        return httpx.Response(200, text=pages[request.url.host], headers={"content-type": "text/html"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def clean(html):
+        return html.replace("<p>", "").replace("</p>", "\n") if "article" in html else ""
+
+    return AdaptiveFetcher(clean, client=client, memory=HostMemory(str(tmp_path / "hosts.json")))
+
+
+def test_quality_penalizes_js_shells():
+    assert extraction_quality(ARTICLE, "x" * 2000) == 1.0
+    assert extraction_quality(SHELL, "") == 0.0
+    assert extraction_quality(SHELL, "x" * 500) < settings.FETCH_MIN_QUALITY
+    assert extraction_quality("<html></html>", "x" * 500) >= settings.FETCH_MIN_QUALITY
+
+
+@pytest.mark.asyncio
+async def test_static_pages_skip_the_browser(tmp_path):
+    fetcher = _fetcher(tmp_path, {"static.example": ARTICLE})
+    rendered = []
+
+    async def render(url):
+        rendered.append(url)
+        return "", ""
+
+    text = await fetcher.fetch("https://static.example/a", render)
+    assert "Static article text." in text
+    assert rendered == [] and fetcher.counts == {"http": 1, "browser": 0}
+
+
+@pytest.mark.asyncio
+async def test_js_hosts_escalate_and_are_remembered(tmp_path):
+    http_calls = []
+    fetcher = _fetcher(tmp_path, {"app.example": SHELL}, http_calls)
+
+    async def render(url):
+        return "<html>rendered</html>", "Rendered content " * 100
+
+    assert (await fetcher.fetch("https://app.example/1", render)).startswith("Rendered")
+    assert len(http_calls) == 1
+    for i in range(2, 12):
+        await fetcher.fetch(f"https://app.example/{i}", render)
+    assert len(http_calls) == 2  # only the periodic re-probe goes over HTTP again
+
+    fetcher.memory.save()
+    assert HostMemory(str(tmp_path / "hosts.json")).hosts["app.example"]["mode"] == "browser"
+
+
+@pytest.mark.asyncio
+async def test_oversized_bodies_are_abandoned(tmp_path):
+    def handler(request):
+        return httpx.Response(200, content=b"x" * 5000, headers={"content-type": "text/html"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with pytest.raises(ResponseTooLarge):
+        await cached_get("https://big.example/", client=client, limit=1000)
+    assert (await cached_get("https://big.example/", client=client, limit=10_000)).content == b"x" * 5000
+
+
+@pytest.mark.asyncio
+async def test_fetch_url_uses_the_shared_client(monkeypatch):
+    from radar.core import fetch
+    from radar.core.ingest import IntelligenceAgent
+
+    def handler(request):
+        return httpx.Response(200, text=ARTICLE, headers={"content-type": "text/html"})
+
+    monkeypatch.setattr(fetch, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    agent = IntelligenceAgent()
+
+    async def clean_html(html):
+        return agent._clean_html(html)
+
+    agent.clean_html = clean_html
+    text = await agent._fetch_url("https://static.example/a")
+    assert "Static article text." in text
+    assert await agent._fetch_url("https://static.example/a") == text  # same body hash, extraction reused
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+
+from radar.core.frontier import BloomFilter, SearchCache, SeenURLs, URLFrontier
+
+
+def test_bloom_filter_round_trip_and_error_rate():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"https://site.example/{i}")
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+    assert all(f"https://site.example/{i}" in restored for i in range(1000))
+    false_hits = sum(f"https://other.example/{i}" in restored for i in range(10000))
+    assert false_hits < 300
+
+
+def test_seen_urls_forget_after_the_window(tmp_path, monkeypatch):
+    path = str(tmp_path / "seen.bloom")
+    seen = SeenURLs(path, days=1)
+    seen.add("a")
+    seen.save()
+    assert "a" in SeenURLs(path, days=1)
+
+    later = time.time() + 0.6 * 86400
+    monkeypatch.setattr(time, "time", lambda: later)
+    rotated = SeenURLs(path, days=1)
+    assert "a" in rotated and len(rotated.generations) == 2
+    rotated.save()
+
+    monkeypatch.setattr(time, "time", lambda: later + 0.6 * 86400)
+    assert "a" not in SeenURLs(path, days=1)
+
+
+def test_search_cache_ttl(tmp_path):
+    path = str(tmp_path / "search.json")
+    cache = SearchCache(path, ttl=60)
+    cache.put("topic", ["https://a.example/"])
+    cache.save()
+    assert SearchCache(path, ttl=60).get("topic") == ["https://a.example/"]
+    assert SearchCache(path, ttl=0).get("topic") is None
+
+
+@pytest.mark.asyncio
+async def test_frontier_shares_fetches_and_skips_ingested_sources(tmp_path):
+    def frontier():
+        return URLFrontier(
+            SearchCache(str(tmp_path / "search.json")), SeenURLs(str(tmp_path / "seen.bloom"))
+        )
+
+    pages = {"https://a.example/": "page a", "https://b.example/": "page b"}
+    fetched = []
+
+    async def fetch(url):
+        fetched.append(url)
+        await asyncio.sleep(0.01)
+        return pages[url]
+
+    sweep = frontier()
+    results = await asyncio.gather(
+        sweep.fetch("https://a.example/", fetch), sweep.fetch("https://a.example/", fetch)
+    )
+    assert results == ["page a", "page a"] and fetched == ["https://a.example/"]
+    assert sweep.counts["shared"] == 1
+
+    # Both topics get the shared page in the same sweep.
+    assert sweep.accept("t1", "https://a.example/", "page a")
+    assert sweep.accept("t2", "https://a.example/", "page a")
+    sweep.commit("t1")
+    sweep.accept("t3", "https://b.example/", "page b")  # never committed
+    sweep.close()
+
+    nxt = frontier()
+    assert not nxt.accept("t1", "https://a.example/", "page a")
+    assert nxt.accept("t1", "https://a.example/", "page a, revised")
+    assert nxt.accept("t3", "https://b.example/", "page b")
+
+    searches = []
+    assert await nxt.search("topic", lambda q: searches.append(q) or ["u"]) == ["u"]
+    nxt.close()
+    assert await frontier().search("topic", lambda q: searches.append(q) or []) == ["u"]
+    assert searches == ["topic"]
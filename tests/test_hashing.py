@@ -0,0 +1,46 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pytest
+from radar.core.hashing import HashingVectorizer, djb2
+
+C_SOURCE = Path(__file__).parents[1] / "src" / "radar" / "tools" / "radar_embed.c"
+
+TEXTS = [
+    "Gas prices rose 4.5% in Tioga County!",
+    "GMRS repeaters use 12.5 kHz channel spacing.",
+    "Naïve café résumé",
+    "",
+]
+
+
+def test_djb2_matches_reference():
+    assert djb2(b"") == 5381
+    assert djb2(b"a") == 5381 * 33 + ord("a")
+
+
+def test_signed_batch_dense_and_sparse_agree():
+    hv = HashingVectorizer(n_features=256)
+    dense = hv.transform(TEXTS)
+    sparse = hv.transform(TEXTS, sparse=True)
+    assert dense.dtype == np.float32
+    assert dense.shape == (4, 256)
+    np.testing.assert_allclose(sparse.toarray(), dense)
+    np.testing.assert_allclose(np.linalg.norm(dense[:3], axis=1), 1.0, rtol=1e-5)
+    assert not dense[3].any()
+
+
+@pytest.mark.skipif(shutil.which("cc") is None, reason="needs a C compiler")
+def test_radar_embed_mode_matches_c_tool(tmp_path):
+    binary = tmp_path / "radar_embed"
+    subprocess.run(
+        ["cc", "-O2", "-o", str(binary), str(C_SOURCE), "-lm"],
+        check=True,
+    )
+    ours = HashingVectorizer(mode="radar_embed").transform(TEXTS)
+    for text, row in zip(TEXTS, ours):
+        out = subprocess.run([str(binary)], input=text.encode(), capture_output=True)
+        np.testing.assert_allclose(row, json.loads(out.stdout), atol=1e-5)
@@ -0,0 +1,48 @@
+import pytest
+
+from radar.core import htmltext
+from radar.core.htmltext import HTMLExtractor, html_to_text
+
+ARTICLE = (
+    "<html><head><title>Report</title></head><body><nav>Home | About</nav><article>"
+    + "".join(f"<p>Paragraph {i} of the county water report with enough words to count.</p>" for i in range(60))
+    + "</article><footer>Copyright</footer></body></html>"
+)
+
+
+def test_fast_mode_suffices_for_plain_articles(monkeypatch):
+    calls = []
+    real = htmltext._trafilatura
+
+    def spy(html, fast):
+        calls.append(fast)
+        return real(html, fast)
+
+    monkeypatch.setattr(htmltext, "_trafilatura", spy)
+    text = html_to_text(ARTICLE)
+    assert "Paragraph 59 of the county water report" in text
+    assert calls == [True]
+
+
+def test_poor_fast_results_fall_back_to_full_extraction(monkeypatch):
+    calls = []
+
+    def fake(html, fast):
+        calls.append(fast)
+        return "" if fast else "full text"
+
+    monkeypatch.setattr(htmltext, "_trafilatura", fake)
+    assert html_to_text(ARTICLE) == "full text"
+    assert calls == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_extractor_runs_on_the_pool_and_memoizes():
+    extractor = HTMLExtractor(workers=1)
+    try:
+        first = await extractor(ARTICLE)
+        second = await extractor(ARTICLE)
+    finally:
+        extractor.close()
+    assert first == second == html_to_text(ARTICLE)
+    assert extractor.counts == {"extracted": 1, "cached": 1}
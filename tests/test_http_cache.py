@@ -0,0 +1,114 @@
+import httpx
+import pytest
+
+from radar.core.fetch import AdaptiveFetcher, HostMemory
+from radar.core.http_cache import HTTPCache
+
+PAGE = "<html><body><article>" + "<p>Reference page text.</p>" * 100 + "</article></body></html>"
+
+
+def _server(pages, etags=True, cache_control=None):
+    """Mock origin that honours If-None-Match and records what it was asked."""
+    requests = []
+
+    def handler(request):
+        body = pages[request.url.path]
+        etag = f'"{hash(body)}"'
+        requests.append((request.url.path, request.headers.get("if-none-match")))
+        headers = {"content-type": "text/html"}
+        if etags:
+            headers["etag"] = etag
+        if cache_control:
+            headers["cache-control"] = cache_control
+        if etags and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, text=body, headers=headers)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+
+@pytest.mark.asyncio
+async def test_unchanged_pages_revalidate_with_304(tmp_path):
+    pages = {"/a": PAGE}
+    client, requests = _server(pages)
+    cache = HTTPCache(str(tmp_path / "cache"))
+
+    first = await cache.get(client, "https://ref.example/a")
+    second = await cache.get(client, "https://ref.example/a")
+    assert first.outcome == "miss" and second.outcome == "revalidated"
+    assert second.text == PAGE and second.body_hash == first.body_hash
+    assert requests[1][1] is not None  # sent If-None-Match
+
+    pages["/a"] = PAGE.replace("Reference", "Revised")
+    third = await cache.get(client, "https://ref.example/a")
+    assert third.outcome == "changed" and "Revised" in third.text
+
+    stats = cache.stats()
+    assert stats["lookups"] == 3 and stats["revalidated"] == 1
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+    assert stats["bytes_saved"] == len(PAGE)
+
+
+@pytest.mark.asyncio
+async def test_max_age_serves_without_a_request(tmp_path):
+    client, requests = _server({"/a": PAGE}, etags=False, cache_control="max-age=3600")
+    cache = HTTPCache(str(tmp_path / "cache"))
+    await cache.get(client, "https://ref.example/a")
+    fresh = await cache.get(client, "https://ref.example/a")
+    assert fresh.outcome == "fresh" and fresh.text == PAGE
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_keeps_recently_used(tmp_path):
+    pages = {f"/{i}": f"page {i} " * 100 for i in range(4)}
+    client, _ = _server(pages)
+    cache = HTTPCache(str(tmp_path / "cache"), max_bytes=2500)  # room for three bodies
+    for i in range(3):
+        await cache.get(client, f"https://ref.example/{i}")
+    await cache.get(client, "https://ref.example/0")  # 0 is now more recent than 1
+    await cache.get(client, "https://ref.example/3")
+
+    stats = cache.stats()
+    assert stats["entries"] == 3 and stats["evicted"] == 1 and stats["bytes"] <= 2500
+    assert (await cache.get(client, "https://ref.example/0")).outcome == "revalidated"
+    assert (await cache.get(client, "https://ref.example/1")).outcome == "miss"
+
+
+@pytest.mark.asyncio
+async def test_eviction_is_checked_per_fraction_of_the_budget(tmp_path):
+    pages = {f"/{i}": f"page {i} " * 100 for i in range(12)}  # ~800 bytes each
+    client, _ = _server(pages)
+    cache = HTTPCache(str(tmp_path / "cache"), max_bytes=100_000)
+    checks = []
+    evict = cache._evict
+    cache._evict = lambda: (checks.append(1), evict())
+    for i in range(12):
+        await cache.get(client, f"https://ref.example/{i}")
+    # Once on the first store, then after every 5 kB stored.
+    assert len(checks) == 2
+
+
+@pytest.mark.asyncio
+async def test_fetcher_reuses_extracted_text_for_unchanged_pages(tmp_path):
+    client, requests = _server({"/a": PAGE})
+    cleaned = []
+
+    async def clean(html):
+        cleaned.append(html)
+        return html.replace("<p>", "").replace("</p>", "\n")
+
+    fetcher = AdaptiveFetcher(
+        clean,
+        client=client,
+        memory=HostMemory(str(tmp_path / "hosts.json")),
+        cache=HTTPCache(str(tmp_path / "cache")),
+    )
+
+    async def render(url):
+        raise AssertionError("static page should not be rendered")
+
+    first = await fetcher.fetch("https://ref.example/a", render)
+    second = await fetcher.fetch("https://ref.example/a", render)
+    assert first == second and "Reference page text." in first
+    assert len(cleaned) == 1 and len(requests) == 2
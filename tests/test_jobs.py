@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from radar.config import settings
+from radar.db import jobs
+from radar.db.models import SweepJob, SweepTask
+from radar.main import run_sweep_tasks
+
+TASKS = [("topic", "Meshtastic"), ("topic", "GMRS"), ("topic", "Meshtastic"), ("news", "rss")]
+
+
+@pytest.mark.asyncio
+async def test_tasks_are_leased_once_and_completed_idempotently(temp_db):
+    async with temp_db() as session:
+        job = await jobs.create_job(session, "daily", TASKS)
+        topics = await jobs.runnable(session, job.id, "topic")
+        assert [t.key for t in topics] == ["Meshtastic", "GMRS"]
+
+        task = topics[0]
+        assert await jobs.acquire(session, task.id)
+        assert not await jobs.acquire(session, task.id)
+        assert [t.key for t in await jobs.runnable(session, job.id, "topic")] == ["GMRS"]
+
+        assert await jobs.complete(session, task.id)
+        assert not await jobs.complete(session, task.id)
+        assert not await jobs.acquire(session, task.id)
+        assert (await jobs.progress(session, job.id))["done"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_back_off_then_give_up(temp_db):
+    async with temp_db() as session:
+        job = await jobs.create_job(session, "daily", [("topic", "GMRS")])
+        (task,) = await jobs.runnable(session, job.id, "topic")
+        with patch("radar.db.jobs.settings.SWEEP_MAX_ATTEMPTS", 2):
+            await jobs.acquire(session, task.id)
+            assert await jobs.fail(session, task.id, "timeout") == "pending"
+            assert await jobs.runnable(session, job.id, "topic") == []
+            retry_at = await jobs.next_retry(session, job.id, "topic")
+            assert retry_at > datetime.now()
+
+            later = retry_at + timedelta(seconds=1)
+            assert len(await jobs.runnable(session, job.id, "topic", now=later)) == 1
+            await session.execute(SweepTask.__table__.update().values(not_before=None))
+            await jobs.acquire(session, task.id)
+            assert await jobs.fail(session, task.id, "timeout") == "failed"
+
+        assert await jobs.finish_if_done(session, job.id)
+        assert (await session.get(SweepJob, job.id)).status == "done"
+
+
+@pytest.mark.asyncio
+async def test_resume_releases_leases_of_a_dead_run(temp_db):
+    async with temp_db() as session:
+        old = await jobs.create_job(session, "daily", TASKS)
+        job = await jobs.create_job(session, "daily", TASKS)
+        assert (await session.get(SweepJob, old.id)).status == "abandoned"
+        assert (await jobs.latest_unfinished(session, "daily")).id == job.id
+
+        task = (await jobs.runnable(session, job.id, "topic"))[0]
+        await jobs.acquire(session, task.id)
+        assert not await jobs.finish_if_done(session, job.id)
+        assert await jobs.release_leases(session, job.id) == 0  # another sweep may hold it
+        assert len(await jobs.runnable(session, job.id, "topic")) == 1
+
+        expired = datetime.now() + timedelta(seconds=settings.SWEEP_LEASE_SECONDS + 1)
+        assert await jobs.release_leases(session, job.id, now=expired) == 1
+        assert len(await jobs.runnable(session, job.id, "topic")) == 2
+
+
+@pytest.mark.asyncio
+async def test_run_sweep_tasks_retries_and_skips_finished_work(temp_db):
+    async with temp_db() as session:
+        job = await jobs.create_job(session, "daily", TASKS)
+        done = (await jobs.runnable(session, job.id, "topic"))[0]
+        await jobs.acquire(session, done.id)
+        await jobs.complete(session, done.id)
+
+    calls = []
+
+    async def handler(key):
+        calls.append(key)
+        if calls.count(key) == 1:
+            raise RuntimeError("flaky")
+
+    with patch("radar.main.settings.SWEEP_RETRY_BACKOFF", 0):
+        assert await run_sweep_tasks(job.id, "topic", handler, concurrency=2) == 0
+
+    assert calls == ["GMRS", "GMRS"]
+    async with temp_db() as session:
+        counts = await jobs.progress(session, job.id)
+    assert counts == {"pending": 1, "leased": 0, "done": 2, "failed": 0}  # news not run
@@ -0,0 +1,72 @@
+import pytest
+from radar.core.ingest import IntelligenceAgent
+from radar.core.passages import Passage, split_passages, summarizer_context
+from radar.main import save_ingest_to_db
+
+
+def _deep_research(n_sources=5, paragraphs=8):
+    text = "🎯 GMRS Operations\n"
+    for s in range(n_sources):
+        body = "\n\n".join(
+            f"Source {s} paragraph {p} covers general background about radio clubs."
+            for p in range(paragraphs)
+        )
+        text += f"\n--- Source: https://example.com/{s} ---\n{body}"
+    return text
+
+
+def test_split_passages_offsets_cover_text_and_respect_sources():
+    text = _deep_research()
+    spans = split_passages(text, target_chars=200)
+    assert all(b - a <= 200 for a, b in spans)
+    assert all(text[a:b] == text[a:b].strip() and text[a:b] for a, b in spans)
+    # No passage straddles a source marker.
+    assert all(text[a:b].count("--- Source:") <= int(text[a:b].startswith("--- Source:")) for a, b in spans)
+    covered = "".join(text[a:b] for a, b in spans)
+    assert "".join(covered.split()) == "".join(text.split())
+
+
+def test_split_passages_breaks_long_paragraphs():
+    text = "A sentence about rivers. " * 200
+    spans = split_passages(text, target_chars=300)
+    assert len(spans) > 10
+    assert all(b - a <= 300 for a, b in spans)
+
+
+@pytest.mark.asyncio
+async def test_ask_retrieves_relevant_passages(temp_db):
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+    text = _deep_research().replace(
+        "Source 3 paragraph 5 covers general background about radio clubs.",
+        "Source 3 paragraph 5: GMRS repeaters use 12.5 kHz channel spacing.",
+    )
+    signal, kg = await intel.parse(f"Title: Deep Research - GMRS Operations\n{text}")
+    await save_ingest_to_db(signal, kg, intel)
+
+    hits = await intel.search_hits("repeater channel spacing", mode="hybrid")
+    passages = await intel.search_passages("repeater channel spacing", hits, limit=2)
+    assert "12.5 kHz" in passages[0].text
+    assert signal.content[passages[0].start : passages[0].end] == passages[0].text
+    assert passages[0].title == signal.title
+    assert sum(len(p.text) for p in passages) < len(signal.content) / 4
+
+
+def test_summarizer_context_fits_radar_summarize_limits():
+    text = _deep_research(n_sources=1, paragraphs=12)
+    spans = split_passages(text, target_chars=800)
+    passages = [
+        Passage(signal_id="a", ordinal=i, start=a, end=b, text=text[a:b], title="Title: Deep Research")
+        for i, (a, b) in enumerate(spans)
+    ]
+    lines = summarizer_context(passages).splitlines()
+
+    assert not any("--- Source:" in line for line in lines)
+    assert all(len(line) <= 240 for line in lines)
+    headers = [i for i, line in enumerate(lines) if line.startswith("Title:")]
+    assert lines[headers[0]] == "Title: Deep Research --- passage 0"
+    # Never more than three content lines under one header.
+    assert all(b - a <= 4 for a, b in zip(headers, headers[1:] + [len(lines)]))
+    content = " ".join(line for line in lines if not line.startswith("Title:"))
+    kept = [line for line in text.splitlines() if not line.startswith("--- Source:")]
+    assert content.split() == " ".join(kept).split()
@@ -0,0 +1,75 @@
+import os
+
+import httpx
+import pytest
+
+from radar.config import settings
+from radar.core.http_cache import HTTPCache
+from radar.core.pdf import PDFConverter, fetch_pdf_text
+
+PDF = b"%PDF-1.4 fake report body " * 4000
+
+# Stand-in for poppler's pdftotext: logs its arguments, echoes the input.
+FAKE_PDFTOTEXT = """#!/bin/sh
+echo "$@" >> "$PDFTOTEXT_LOG"
+eval src=\\${$(($# - 1))}
+if [ "$src" = "-" ]; then cat; else cat "$src"; fi | { head -c 40; cat > /dev/null; }
+"""
+
+
+@pytest.fixture
+def pdftotext(tmp_path, monkeypatch):
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    script = bindir / "pdftotext"
+    script.write_text(FAKE_PDFTOTEXT)
+    script.chmod(0o755)
+    log = tmp_path / "pdftotext.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bindir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("PDFTOTEXT_LOG", str(log))
+    return lambda: log.read_text().splitlines()
+
+
+def _client(requests):
+    def handler(request):
+        requests.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(200, content=PDF, headers={"etag": '"v1"', "content-type": "application/pdf"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_cached_pdfs_are_converted_once(tmp_path, pdftotext):
+    requests = []
+    client, cache = _client(requests), HTTPCache(str(tmp_path / "cache"))
+    converter = PDFConverter(workers=2, max_pages=7)
+
+    first = await fetch_pdf_text("https://gov.example/r.pdf", client, cache, converter)
+    second = await fetch_pdf_text("https://gov.example/r.pdf", client, cache, converter)
+    assert first == second == "%PDF-1.4 fake report body %PDF-1.4 fake"
+    assert requests == [None, '"v1"']
+    calls = pdftotext()
+    assert len(calls) == 1 and calls[0].startswith("-layout -l 7 ")
+    assert calls[0].split()[-2] != "-"  # read the cache file, no temp copy
+
+
+@pytest.mark.asyncio
+async def test_uncached_pdfs_stream_into_stdin(pdftotext, monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_CACHE_ENABLED", False)
+    text = await fetch_pdf_text(
+        "https://gov.example/r.pdf", _client([]), cache=None, converter=PDFConverter()
+    )
+    assert text.startswith("%PDF-1.4 fake report body")
+    assert pdftotext()[0].split()[-2:] == ["-", "-"]
+
+
+@pytest.mark.asyncio
+async def test_oversized_pdfs_are_abandoned(tmp_path, pdftotext, monkeypatch):
+    monkeypatch.setattr(settings, "PDF_MAX_BYTES", 1000)
+    cache = HTTPCache(str(tmp_path / "cache"))
+    assert await fetch_pdf_text("https://gov.example/r.pdf", _client([]), cache, PDFConverter()) == ""
+    assert pdftotext() == [] and cache.stats()["entries"] == 0
+    assert os.listdir(tmp_path / "cache" / "tmp") == []
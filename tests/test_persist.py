@@ -0,0 +1,67 @@
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from radar.db import persist
+from radar.db.models import Signal, SignalMinHash, Statistic
+
+
+@pytest.mark.asyncio
+async def test_save_signals_bulk_writes_stats(temp_db, sample_texts):
+    signals = [
+        Signal(title=t.splitlines()[0][7:], content=t, source="test") for t in sample_texts
+    ]
+    async with temp_db() as session:
+        result = await persist.save_signals(session, signals)
+    assert len(result.indexed) == 3 and result.stats > 0
+
+    async with temp_db() as session:
+        stats = (await session.execute(select(Statistic))).scalars().all()
+    assert len(stats) == result.stats
+    assert all(isinstance(s.id, uuid.UUID) for s in stats)
+    assert {s.source_signal_id for s in stats} <= {s.id for s in signals}
+    gas = [s for s in stats if s.label == "Gas Price"]
+    assert gas and gas[0].category == "FINANCE" and gas[0].value == 3.45
+
+
+@pytest.mark.asyncio
+async def test_save_signals_links_duplicates_within_a_batch(temp_db):
+    body = "Title: Convoy report\n" + " ".join(
+        f"Convoy {i} moved 40 troops past checkpoint {i}." for i in range(40)
+    )
+    signals = [Signal(title="Convoy report", content=body, source="test") for _ in range(2)]
+    async with temp_db() as session:
+        result = await persist.save_signals(session, signals, action="link")
+    # The later signal becomes canonical; the earlier one is linked to it.
+    assert [s.id for s in result.indexed] == [signals[1].id]
+    assert result.duplicates[0][1] == signals[0].id
+    assert result.superseded == [signals[0].id]
+
+    async with temp_db() as session:
+        sources = (
+            await session.execute(select(Statistic.source_signal_id).distinct())
+        ).scalars().all()
+        linked = await session.get(SignalMinHash, signals[0].id)
+        count = (await session.execute(select(func.count()).select_from(Signal))).scalar()
+    assert set(sources) == {s.id for s in signals}
+    assert linked.duplicate_of == signals[1].id
+    assert count == 2
+
+
+@pytest.mark.asyncio
+async def test_save_signals_never_dedups_unsignable_text(temp_db):
+    signals = [
+        Signal(title="Blank", content="", source="test"),
+        Signal(title="Dashes", content="-- !! --", source="test"),
+        Signal(title="Short", content="QRT now", source="test"),
+    ]
+    async with temp_db() as session:
+        result = await persist.save_signals(session, signals, action="skip")
+    assert result.duplicates == []
+    assert {s.id for s in result.indexed} == {s.id for s in signals}
+
+    async with temp_db() as session:
+        count = (await session.execute(select(func.count()).select_from(Signal))).scalar()
+        signed = (await session.execute(select(func.count()).select_from(SignalMinHash))).scalar()
+    assert (count, signed) == (3, 0)
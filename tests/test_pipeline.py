@@ -0,0 +1,133 @@
+import asyncio
+import io
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from radar.core.ingest import IntelligenceAgent
+from radar.core.pipeline import Record, iter_records, run_pipeline
+from radar.db.models import Signal, Statistic
+from radar.main import save_ingest_batch
+
+
+async def _collect(source, stdin=None):
+    return [r async for r in iter_records(source, stdin=stdin)]
+
+
+@pytest.mark.asyncio
+async def test_iter_records_sources(tmp_path):
+    (tmp_path / "a.txt").write_text("Title: A\n3 drones seen.")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_text("Title: B\n40 troops.")
+    (tmp_path / "empty.txt").write_text("   ")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR")
+    (tmp_path / "notes.bin").write_bytes("Title: Z\n".encode() + bytes(range(128, 256)))
+    (tmp_path / "feed.ndjson").write_text(
+        json.dumps({"title": "C", "text": "Gas: $3.45", "url": "http://x"})
+        + "\n\nnot json\n"
+        + json.dumps("Title: D\nplain string record")
+        + "\n"
+    )
+
+    records = await _collect(str(tmp_path))
+    assert [r.text.splitlines()[0] for r in records] == ["Title: A", "Gas: $3.45", "Title: D", "Title: B"]
+    assert records[1].title == "C" and records[1].url == "http://x"
+    assert [r.text for r in await _collect(str(tmp_path / "**" / "*.txt"))] == [
+        "Title: A\n3 drones seen.",
+        "Title: B\n40 troops.",
+    ]
+    stdin = io.StringIO(json.dumps({"content": "Title: E\nbody"}) + "\n")
+    assert [r.text for r in await _collect("-", stdin)] == ["Title: E\nbody"]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_records_with_wrong_field_types_are_skipped():
+    lines = [
+        {"title": 42, "text": "Title: bad\n3 drones"},
+        {"title": None, "text": "Title: ok\n3 drones", "date": "2026-10-01T08:00:00"},
+        {"text": ["not", "text"]},
+        {"text": "Title: bad date\n3 drones", "date": 20261001},
+    ]
+    stdin = io.StringIO("".join(json.dumps(line) + "\n" for line in lines))
+    records = await _collect("-", stdin)
+    assert [r.text for r in records] == ["Title: ok\n3 drones"]
+    assert records[0].title is None and records[0].date.day == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_applies_backpressure():
+    total, batch_size, queue_size = 200, 8, 4
+    in_flight = []
+    written = 0
+    read = 0
+
+    async def records():
+        nonlocal read
+        for i in range(total):
+            read += 1
+            in_flight.append(read - written)
+            yield Record(text=f"Title: r{i}\n{i} troops")
+
+    async def write(signals, stats):
+        nonlocal written
+        await asyncio.sleep(0.01)
+        written += len(signals)
+        assert all(len(stats[s.id]) == 1 for s in signals)
+        return len(signals), sum(len(v) for v in stats.values())
+
+    result = await run_pipeline(
+        records(),
+        IntelligenceAgent().parse,
+        write,
+        batch_size=batch_size,
+        workers=1,
+        queue_size=queue_size,
+    )
+    assert (result.records, result.signals, result.stats) == (total, total, total)
+    assert result.batches == total // batch_size
+    # parsed queue + the batch being assembled + two queued + one being written
+    assert max(in_flight) <= queue_size + 4 * batch_size + 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_persists_batches(temp_db, sample_texts):
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+
+    async def records():
+        for text in sample_texts:
+            yield Record(text=text)
+
+    async def write(signals, stats):
+        result = await save_ingest_batch(signals, intel, stats)
+        return len(result.indexed), result.stats
+
+    result = await run_pipeline(records(), intel.parse, write, batch_size=2, workers=1)
+    async with temp_db() as session:
+        signals = (await session.execute(select(func.count()).select_from(Signal))).scalar()
+        stats = (await session.execute(select(func.count()).select_from(Statistic))).scalar()
+    assert result.batches == 2
+    assert signals == 3 and stats == result.stats > 0
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_counted_and_the_run_goes_on(sample_texts):
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+
+    async def records():
+        for text in sample_texts:
+            yield Record(text=text)
+
+    written = []
+
+    async def write(signals, stats):
+        if not written:
+            written.append(None)
+            raise RuntimeError("database is locked")
+        written.extend(signals)
+        return len(signals), 0
+
+    result = await run_pipeline(records(), intel.parse, write, batch_size=2, workers=1)
+    assert (result.records, result.failed, result.batches, result.signals) == (3, 2, 1, 1)
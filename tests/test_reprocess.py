@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import delete, select, update
+
+from radar.core.ingest import IntelligenceAgent
+from radar.db import reprocess
+from radar.db.models import Signal, Statistic
+from radar.main import save_ingest_to_db
+
+
+async def _ingest(temp_db, texts):
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+    for text in texts:
+        signal, kg = await intel.parse(text)
+        await save_ingest_to_db(signal, kg, intel)
+    async with temp_db() as session:
+        ids = (await session.execute(select(Signal.id).order_by(Signal.id))).scalars().all()
+        stats = (await session.execute(select(Statistic))).scalars().all()
+    return ids, stats
+
+
+def _key(s):
+    return (s.source_signal_id, s.category, s.label, s.value, s.unit, s.description)
+
+
+@pytest.mark.asyncio
+async def test_reprocess_rebuilds_stats_and_keeps_timestamps(temp_db, sample_texts):
+    ids, original = await _ingest(temp_db, sample_texts)
+    stamps = {}
+    for s in original:
+        stamps[s.source_signal_id] = min(s.timestamp, stamps.get(s.source_signal_id, s.timestamp))
+    async with temp_db() as session:
+        await session.execute(delete(Statistic).where(Statistic.source_signal_id == ids[0]))
+        await session.execute(update(Statistic).values(label="stale"))
+        await session.commit()
+        signals, count = await reprocess.reprocess(session, workers=2, batch_size=1)
+        rebuilt = (await session.execute(select(Statistic))).scalars().all()
+        assert await reprocess.get_cursor(session) is None
+
+    assert signals == len(sample_texts)
+    assert count == len(original)
+    assert sorted(map(_key, rebuilt), key=str) == sorted(map(_key, original), key=str)
+    for s in rebuilt:
+        if s.source_signal_id != ids[0]:
+            assert s.timestamp == stamps[s.source_signal_id]
+
+
+@pytest.mark.asyncio
+async def test_reprocess_resumes_after_checkpoint(temp_db, sample_texts):
+    ids, _ = await _ingest(temp_db, sample_texts)
+    async with temp_db() as session:
+        await session.execute(delete(Statistic))
+        await reprocess.set_cursor(session, ids[0].hex)  # as if killed after batch one
+        await session.commit()
+        signals, _ = await reprocess.reprocess(session, workers=1, batch_size=1)
+        done = set(
+            (await session.execute(select(Statistic.source_signal_id))).scalars().all()
+        )
+
+    assert signals == len(ids) - 1
+    assert ids[0] not in done
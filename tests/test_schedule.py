@@ -0,0 +1,52 @@
+import time
+
+from radar.core.schedule import HOUR, SweepBudget, SweepScheduler, base_hours, load_frequencies
+
+JULY = time.mktime((2026, 7, 1, 8, 0, 0, 0, 0, -1))
+
+
+def test_base_hours_from_frequency_column():
+    assert base_hours("High", 7) == 12
+    assert base_hours("Daily (Work)", 7) == 24
+    assert base_hours("Low", 7) == 168
+    assert base_hours("Seasonal (Summer)", 7) == base_hours("Medium", 7) == 48
+    assert base_hours("Seasonal (Summer)", 1) > 168
+    assert base_hours(None, 7) == base_hours("Whenever", 7) == 48
+
+
+def test_frequencies_load_from_csv(tmp_path):
+    path = tmp_path / "interests.csv"
+    path.write_text("Category,Topic,Source/Context,Frequency\nRF,Meshtastic,LoRa,High\n")
+    assert load_frequencies(str(path)) == {"Meshtastic": "High"}
+    assert load_frequencies(str(tmp_path / "missing.csv")) == {}
+
+
+def test_only_due_topics_run_most_overdue_first(tmp_path):
+    scheduler = SweepScheduler(
+        str(tmp_path / "schedule.json"), {"fast": "High", "slow": "Low"}
+    )
+    assert scheduler.due(["slow", "fast", "other"], JULY) == ["fast", "other", "slow"]
+    for topic in ("fast", "slow", "other"):
+        scheduler.record(topic, "result", JULY)
+    assert scheduler.due(["fast", "slow", "other"], JULY + HOUR) == []
+    assert scheduler.due(["fast", "slow", "other"], JULY + 13 * HOUR) == ["fast"]
+    assert scheduler.due(["fast", "slow", "other"], JULY + 200 * HOUR) == ["fast", "other", "slow"]
+
+
+def test_change_rate_stretches_and_shrinks_intervals(tmp_path):
+    path = str(tmp_path / "schedule.json")
+    scheduler = SweepScheduler(path, {})
+    now = JULY
+    for i in range(8):
+        scheduler.record("stable", "same text", now)
+        scheduler.record("moving", f"text {i}", now)
+        now += 12 * HOUR
+    assert scheduler.interval("stable", now) > 48 * HOUR > scheduler.interval("moving", now)
+    scheduler.save()
+    assert SweepScheduler(path, {}).topics["stable"]["runs"] == 8
+
+
+def test_budget():
+    assert not SweepBudget(0).exhausted()
+    assert SweepBudget(1e-9).exhausted()
+    assert not SweepBudget(3600).exhausted()
@@ -0,0 +1,150 @@
+import uuid
+
+import pytest
+from sqlalchemy import text
+from radar.core.ingest import IntelligenceAgent
+from radar.db import fts
+from radar.db.models import RadarMeta, Signal
+from radar.main import save_ingest_to_db
+
+
+async def _ingest_all(intel, texts):
+    for t in texts:
+        signal, kg = await intel.parse(t)
+        await save_ingest_to_db(signal, kg, intel)
+
+
+@pytest.mark.asyncio
+async def test_fts_search_ranks_and_snippets(temp_db, sample_texts):
+    intel = IntelligenceAgent()
+    await _ingest_all(intel, sample_texts)
+
+    hits = await intel.search_hits("GMRS repeater spacing", limit=5, mode="fts")
+    assert hits
+    assert hits[0].signal.title.startswith("Title: Deep Research - GMRS")
+    assert "[" in hits[0].snippet
+
+    signals = await intel.search_signals("gas prices", mode="fts")
+    assert signals[0].title == "Title: Gas Prices in Tioga County"
+
+
+@pytest.mark.asyncio
+async def test_fts_backfills_existing_signals(temp_db, sample_texts):
+    intel = IntelligenceAgent()
+    async with temp_db() as session:
+        for t in sample_texts:
+            signal, _ = await intel.parse(t)
+            session.add(signal)
+        await session.commit()
+
+    fts._ready.clear()
+    async with temp_db() as session:
+        await session.execute(text("DROP TABLE IF EXISTS signal_fts"))
+        await session.commit()
+
+    hits = await intel.search_hits("drones river", mode="fts")
+    assert [h.signal.title for h in hits][0] == "Title: Master Tactical SITREP"
+
+
+@pytest.mark.asyncio
+async def test_keyword_mode_still_available(temp_db, sample_texts):
+    intel = IntelligenceAgent()
+    await _ingest_all(intel, sample_texts)
+    hits = await intel.search_hits("Wellsboro", mode="keyword")
+    assert len(hits) == 1
+
+
+def test_reciprocal_rank_fusion_merges_and_dedupes():
+    from radar.core.search import reciprocal_rank_fusion
+
+    fused = reciprocal_rank_fusion([[("a", 9.0), ("b", 5.0)], [("b", 0.9), ("c", 0.8)]], k=60)
+    assert [sid for sid, _ in fused] == ["b", "a", "c"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_fuses_rankers_with_timings(temp_db, sample_texts, fake_embedder):
+    intel = IntelligenceAgent()
+    intel.embedding_model = fake_embedder
+    await _ingest_all(intel, sample_texts)
+
+    timings = {}
+    hits = await intel.search_hits("drones river gauge", mode="hybrid", timings=timings)
+    assert hits[0].signal.title == "Title: Master Tactical SITREP"
+    assert len({h.signal.id for h in hits}) == len(hits)
+    assert {"lexical_ms", "vector_ms", "fusion_ms", "hydrate_ms", "total_ms"} <= set(timings)
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_degrades_to_lexical_without_embeddings(temp_db, sample_texts):
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+    await _ingest_all(intel, sample_texts)
+
+    hits = await intel.search_hits("gas prices", mode="hybrid")
+    assert hits[0].signal.title == "Title: Gas Prices in Tioga County"
+
+
+@pytest.mark.asyncio
+async def test_fts_is_contentless_and_replaces_merged_text(temp_db, monkeypatch):
+    from radar.config import settings
+
+    monkeypatch.setattr(settings, "DEDUP_ACTION", "merge")
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+    report = "Title: Convoy report\n" + "\n\n".join(
+        f"Convoy {i} passed checkpoint {i} near the river with {i} trucks." for i in range(40)
+    )
+    await _ingest_all(intel, [report + "\n\nLast seen in Wellsboro."])
+    await _ingest_all(intel, [report + "\n\nLast seen in Mansfield."])
+
+    async with temp_db() as session:
+        shadow = (
+            await session.execute(
+                text("SELECT name FROM sqlite_master WHERE name LIKE '%fts_content'")
+            )
+        ).scalars().all()
+        assert shadow == []  # no second copy of the bodies
+        assert await fts.search_fts(session, "Wellsboro") == []
+        # The old text is gone from the index itself, not just unmapped.
+        for table in ("signal_fts", "passage_fts"):
+            stale = f"SELECT count(*) FROM {table} WHERE {table} MATCH 'wellsboro'"
+            assert (await session.execute(text(stale))).scalar() == 0
+        (hit,) = await fts.search_fts(session, "Mansfield")
+        assert "[Mansfield.]" in hit.snippet
+        (passage,) = await fts.search_passages(session, "Mansfield")
+        assert passage.text.endswith("Last seen in Mansfield.")
+
+
+@pytest.mark.asyncio
+async def test_deleted_signals_leave_no_postings(temp_db, sample_texts):
+    intel = IntelligenceAgent()
+    intel.embeddings_unavailable = True
+    await _ingest_all(intel, sample_texts)
+    count = "SELECT count(*) FROM signal_fts WHERE signal_fts MATCH 'gas'"
+
+    async with temp_db() as session:
+        (hit,) = await fts.search_fts(session, "gas prices", limit=1)
+        assert (await session.execute(text(count))).scalar() == 1
+        await session.delete(await session.get(Signal, uuid.UUID(hit.signal_id)))
+        await session.commit()
+    async with temp_db() as session:
+        assert (await session.execute(text(count))).scalar() == 0
+        assert await fts.search_fts(session, "gas prices") == []
+
+    # A row deleted behind the ORM's back cannot be replayed: the postings stay
+    # mapped until the next ensure_fts rebuilds the indexes.
+    async with temp_db() as session:
+        (hit,) = await fts.search_fts(session, "drones", limit=1)
+        await session.execute(
+            Signal.__table__.delete().where(Signal.id == uuid.UUID(hit.signal_id))
+        )
+        await fts.remove_signals(session, [hit.signal_id])
+        await session.commit()
+        assert len(await fts.search_fts(session, "drones")) == 1
+        assert await session.get(RadarMeta, fts.STALE_KEY) is not None
+    fts._ready.clear()
+    async with temp_db() as session:
+        assert await fts.search_fts(session, "drones") == []
+        await session.commit()
+        assert await session.get(RadarMeta, fts.STALE_KEY) is None
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from radar.core.ingest import IntelligenceAgent
+from radar.core.vector_store import VectorStore, get_vector_store
+from radar.main import save_ingest_to_db
+
+
+def test_append_search_and_supersede(tmp_path):
+    store = VectorStore(str(tmp_path))
+    rng = np.random.default_rng(0)
+    vecs = rng.normal(size=(50, 16)).astype(np.float32)
+    store.append([f"id{i}" for i in range(50)], vecs)
+
+    hits = store.search(vecs[7], k=3)
+    assert hits[0][0] == "id7"
+    assert hits[0][1] == pytest.approx(1.0, abs=1e-5)
+
+    # Re-embedding id7 replaces its old row.
+    store.append(["id7"], vecs[8:9])
+    assert len(store) == 50
+    assert [sid for sid, _ in store.search(vecs[7], k=50)].count("id7") == 1
+
+    with pytest.raises(ValueError):
+        store.append(["bad"], np.ones((1, 8), dtype=np.float32))
+
+
+def test_rebuild_swaps_store(tmp_path):
+    store = VectorStore(str(tmp_path))
+    store.append(["old"], np.ones((1, 4), dtype=np.float32))
+    count = store.rebuild([(["a", "b"], np.eye(2, 8, dtype=np.float32))])
+    assert count == 2
+    assert len(store) == 2
+    assert store.search(np.eye(1, 8, dtype=np.float32)[0], k=1)[0][0] == "a"
+
+
+@pytest.mark.asyncio
+async def test_ingest_embeds_and_vector_mode(temp_db, sample_texts, fake_embedder):
+    intel = IntelligenceAgent()
+    intel.embedding_model = fake_embedder
+    for t in sample_texts:
+        signal, kg = await intel.parse(t)
+        await save_ingest_to_db(signal, kg, intel)
+
+    assert len(get_vector_store()) == 3
+    hits = await intel.search_hits("drones river gauge", mode="vector")
+    assert hits[0].signal.title == "Title: Master Tactical SITREP"
+
+
+@pytest.mark.asyncio
+async def test_dimension_mismatch_degrades_to_lexical(temp_db, sample_texts, fake_embedder):
+    get_vector_store().append(["other-backend"], np.ones((1, 3), dtype=np.float32))
+    intel = IntelligenceAgent()
+    intel.embedding_model = fake_embedder
+    signal, kg = await intel.parse(sample_texts[1])
+    await save_ingest_to_db(signal, kg, intel)  # must not raise after the commit
+
+    assert intel.embeddings_unavailable
+    assert await intel.search_hits("drones", mode="vector") == []
+    hits = await intel.search_hits("drones", mode="hybrid")
+    assert hits[0].signal.title == "Title: Master Tactical SITREP"